@@ -1,9 +1,12 @@
+import bisect
+import contextlib
 import copy
 import logging
 import socket
 import threading
 import uuid
 from time import (
+    monotonic,
     sleep,
     time,
 )
@@ -48,6 +51,8 @@ ACK_FORCE_NOACK_KEY = 'force_noack'
 DEFAULT_ACK_MANAGER_SLEEP = 15
 DEFAULT_REPUBLISH_TIME = 30
 MINIMUM_KOMBU_VERSION_PUBLISH_TIMEOUT = parse_version("5.2.0")
+# Upper bounds (in seconds) of the publish latency histogram buckets.
+PUBLISH_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 
 
 class PulsarExchange:
@@ -75,8 +80,17 @@ class PulsarExchange:
         consume_uuid_store=None,
         republish_time=DEFAULT_REPUBLISH_TIME,
         durable=True,
+        persistent_connection=False,
+        consumed_uuid_ttl=None,
     ):
         """
+        If ``persistent_connection`` is set, ``publish`` reuses a single
+        long-lived connection and channel (reconnecting once on recoverable
+        errors) rather than connecting for each message.
+
+        If ``consume_uuid_store`` supports ``expire`` (see
+        :class:`pulsar.client.util.IndexedMessageQueueUUIDStore`), consumed
+        UUIDs older than ``consumed_uuid_ttl`` seconds are removed from it.
         """
         if not kombu:
             raise Exception(KOMBU_UNAVAILABLE)
@@ -106,6 +120,7 @@ class PulsarExchange:
         )
         self.__timeout = timeout
         self.__republish_time = republish_time
+        self.__consumed_uuid_ttl = consumed_uuid_ttl
         # Be sure to log message publishing failures.
         if publish_kwds.get("retry", False):
             if "retry_policy" not in publish_kwds:
@@ -114,6 +129,8 @@ class PulsarExchange:
         self.publish_uuid_store = publish_uuid_store
         self.consume_uuid_store = consume_uuid_store
         self.publish_ack_lock = threading.Lock()
+        self.publish_latency = PublishLatencyHistogram()
+        self.__publisher = _PersistentPublisher(self) if persistent_connection else None
         # Ack manager should sleep before checking for
         # republishes, but if that changes, need to drain the
         # queue once before the ack manager starts doing its
@@ -157,6 +174,48 @@ class PulsarExchange:
                 raise
         log.info("Done consuming queue %s" % queue_name)
 
+    def consume_many(self, subscriptions, check=True, prefetch_counts=None, connection_kwargs={}):
+        """ Consume several queues over a single connection of this exchange.
+
+        ``subscriptions`` is a list of ``(exchange, queue_name, callback)``
+        tuples - the exchanges may belong to other managers of the same broker.
+        Each queue gets its own consumer and channel, so messages are dispatched
+        to the callback of the queue they were routed to and
+        ``prefetch_counts`` (a dictionary keyed by queue name) can limit the
+        unacknowledged messages of each queue independently.
+        """
+        prefetch_counts = prefetch_counts or {}
+        queue_names = [exchange.__queue_name(queue_name) for exchange, queue_name, _ in subscriptions]
+        log.debug("Consuming queues %s on one connection", queue_names)
+        while check:
+            heartbeat_thread = None
+            try:
+                with self.connection(self.__url, heartbeat=DEFAULT_HEARTBEAT, **connection_kwargs) as connection:
+                    with contextlib.ExitStack() as consumers:
+                        for exchange, queue_name, callback in subscriptions:
+                            callbacks = [exchange.__ack_callback]
+                            if callback is not None:
+                                callbacks.append(callback)
+                            consumers.enter_context(kombu.Consumer(
+                                connection.channel(),
+                                queues=[exchange.__queue(queue_name)],
+                                callbacks=callbacks,
+                                accept=['json'],
+                                prefetch_count=prefetch_counts.get(queue_name),
+                            ))
+                        heartbeat_thread = self.__start_heartbeat("multi", connection)
+                        while check and connection.connected:
+                            try:
+                                connection.drain_events(timeout=self.__timeout)
+                            except (socket.timeout, TimeoutError):
+                                pass
+            except self.recoverable_exceptions as exc:
+                self.__handle_io_error(exc, heartbeat_thread)
+            except BaseException:
+                log.exception("Problem consuming queues, consumer quitting in problematic fashion!")
+                raise
+        log.info("Done consuming queues %s" % queue_names)
+
     def __ack_callback(self, body, message):
         if ACK_UUID_KEY in body:
             # The consumer of a normal queue has received a message requiring
@@ -217,11 +276,65 @@ class PulsarExchange:
         log.debug('AMQP heartbeat thread exiting')
 
     def publish(self, name, payload):
+        start = monotonic()
+        if self.__publisher is not None:
+            # Request the acknowledgement once, reconnecting must not publish
+            # the message under a second UUID.
+            transaction_uuid = self.__request_ack(name, payload)
+            self.__publisher.publish(lambda producer: self.__send(producer, name, payload, transaction_uuid, declare=False))
+        else:
+            with self.connection(self.__url) as connection:
+                with pools.producers[connection].acquire(block=True) as producer:
+                    self.__publish(producer, name, payload)
+        self.publish_latency.observe(monotonic() - start)
+
+    def publish_metrics(self):
+        """ Return the publish latency histogram and the number of times the
+        persistent publisher connection has been (re)established.
+        """
+        return {
+            "latency": self.publish_latency.snapshot(),
+            "connects": self.__publisher.connects if self.__publisher is not None else None,
+        }
+
+    def close(self):
+        """ Release the persistent publisher connection, if any.
+        """
+        if self.__publisher is not None:
+            self.__publisher.close()
+
+    def publish_batch(self, name, payloads):
+        """ Publish ``payloads`` in order over a single connection and producer.
+
+        Each message is confirmed by the broker (publisher confirms) before the
+        next is sent. Returns the number of leading ``payloads`` published - if
+        this is less than ``len(payloads)`` the connection failed while
+        publishing the next one.
+        """
+        published = 0
+        try:
+            transport_options = {"confirm_publish": True}
+            with self.connection(self.__url, transport_options=transport_options) as connection:
+                with pools.producers[connection].acquire(block=True) as producer:
+                    for payload in payloads:
+                        start = monotonic()
+                        self.__publish(producer, name, payload)
+                        self.publish_latency.observe(monotonic() - start)
+                        published += 1
+        except self.recoverable_exceptions as exc:
+            log.warning("Published %d of %d messages to %s before failing: %r", published, len(payloads), name, exc)
+        return published
+
+    def __publish(self, producer, name, payload, declare=True):
+        self.__send(producer, name, payload, self.__request_ack(name, payload), declare)
+
+    def __request_ack(self, name, payload):
+        """ Generate the transaction UUID of a message, adding the keys
+        requesting its acknowledgement to ``payload`` and recording it in the
+        ``publish_uuid_store`` if acknowledgements are enabled.
+        """
         # Consider optionally disabling if throughput becomes main concern.
         transaction_uuid = uuid.uuid1()
-        key = self.__queue_name(name)
-        publish_log_prefix = self.__publish_log_prefex(transaction_uuid)
-        log.debug("%sBegin publishing to key %s", publish_log_prefix, key)
         if (self.acks_enabled and not name.endswith(ACK_QUEUE_SUFFIX) and
                 ACK_FORCE_NOACK_KEY not in payload):
             # Publishing a message on a normal queue and it's not a republish
@@ -233,19 +346,22 @@ class PulsarExchange:
             payload[ACK_SUBMIT_QUEUE_KEY] = name
             self.publish_uuid_store[ack_uuid] = payload
             log.debug('Requesting acknowledgement of UUID %s on queue %s', ack_uuid, ack_queue)
-        with self.connection(self.__url) as connection:
-            with pools.producers[connection].acquire(block=True) as producer:
-                log.debug("%sHave producer for publishing to key %s", publish_log_prefix, key)
-                publish_kwds = self.__prepare_publish_kwds(publish_log_prefix)
-                producer.publish(
-                    payload,
-                    serializer='json',
-                    exchange=self.__exchange,
-                    declare=[self.__exchange],
-                    routing_key=key,
-                    **publish_kwds
-                )
-                log.debug("%sPublished to key %s", publish_log_prefix, key)
+        return transaction_uuid
+
+    def __send(self, producer, name, payload, transaction_uuid, declare=True):
+        key = self.__queue_name(name)
+        publish_log_prefix = self.__publish_log_prefex(transaction_uuid)
+        log.debug("%sBegin publishing to key %s", publish_log_prefix, key)
+        publish_kwds = self.__prepare_publish_kwds(publish_log_prefix)
+        producer.publish(
+            payload,
+            serializer='json',
+            exchange=self.__exchange,
+            declare=[self.__exchange] if declare else [],
+            routing_key=key,
+            **publish_kwds
+        )
+        log.debug("%sPublished to key %s", publish_log_prefix, key)
 
     def ack_manager(self):
         log.debug('Acknowledgement manager thread alive')
@@ -254,27 +370,43 @@ class PulsarExchange:
             while True:
                 sleep(DEFAULT_ACK_MANAGER_SLEEP)
                 with self.publish_ack_lock:
-                    for unack_uuid in self.publish_uuid_store.keys():
-                        if self.publish_uuid_store.get_time(unack_uuid) < time() - self.__republish_time:
-                            payload = self.__get_payload(unack_uuid, failed)
-                            if payload is None:
-                                continue
-                            payload[ACK_FORCE_NOACK_KEY] = True
-                            resubmit_queue = payload[ACK_SUBMIT_QUEUE_KEY]
-                            log.debug('UUID %s has not been acknowledged, '
-                                      'republishing original message on queue %s',
-                                      unack_uuid, resubmit_queue)
-                            try:
-                                self.publish(resubmit_queue, payload)
-                                self.publish_uuid_store.set_time(unack_uuid)
-                            except self.recoverable_exceptions as e:
-                                self.__handle_io_error(e)
-                                continue
+                    for unack_uuid in self.__unacknowledged_uuids(time() - self.__republish_time):
+                        payload = self.__get_payload(unack_uuid, failed)
+                        if payload is None:
+                            continue
+                        payload[ACK_FORCE_NOACK_KEY] = True
+                        resubmit_queue = payload[ACK_SUBMIT_QUEUE_KEY]
+                        log.debug('UUID %s has not been acknowledged, '
+                                  'republishing original message on queue %s',
+                                  unack_uuid, resubmit_queue)
+                        try:
+                            self.publish(resubmit_queue, payload)
+                            self.publish_uuid_store.set_time(unack_uuid)
+                        except self.recoverable_exceptions as e:
+                            self.__handle_io_error(e)
+                            continue
+                self.__expire_consumed_uuids()
         except Exception:
             log.exception("Problem with acknowledgement manager, leaving ack_manager method in problematic state!")
             raise
         log.debug('Acknowledgement manager thread exiting')
 
+    def __unacknowledged_uuids(self, published_before):
+        if hasattr(self.publish_uuid_store, "due"):
+            # Indexed store, only visits the UUIDs that are due.
+            yield from self.publish_uuid_store.due(published_before)
+            return
+        for unack_uuid in self.publish_uuid_store.keys():
+            if self.publish_uuid_store.get_time(unack_uuid) < published_before:
+                yield unack_uuid
+
+    def __expire_consumed_uuids(self):
+        if self.__consumed_uuid_ttl is None or not hasattr(self.consume_uuid_store, "expire"):
+            return
+        expired = self.consume_uuid_store.expire(time() - self.__consumed_uuid_ttl)
+        if expired:
+            log.debug("Expired %d consumed message UUIDs", expired)
+
     def __get_payload(self, uuid, failed):
         """Retry reading a message from the publish_uuid_store once, delete on the second failure."""
         # Caller should have the publish_uuid_store lock
@@ -319,6 +451,10 @@ class PulsarExchange:
             prefix = "[publish:%s] " % str(transaction_uuid)
         return prefix
 
+    @property
+    def exchange(self):
+        return self.__exchange
+
     def connection(self, connection_string, **kwargs):
         if "ssl" not in kwargs:
             kwargs["ssl"] = self.__connect_ssl
@@ -362,3 +498,88 @@ class PulsarExchange:
             thread.daemon = True
             thread.start()
             return thread
+
+
+class _PersistentPublisher:
+    """ A long-lived connection and producer shared by all publishes of an
+    exchange. The exchange is declared once per connection and publishes are
+    serialized, as kombu channels are not thread-safe.
+    """
+
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.connects = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._producer = None
+
+    def publish(self, publish_fn):
+        """ Call ``publish_fn`` with the shared producer - connecting first if
+        needed and reconnecting once if the connection turns out to be broken.
+        """
+        with self._lock:
+            try:
+                publish_fn(self._get_producer())
+            except self.exchange.recoverable_exceptions as exc:
+                log.warning("Persistent publisher connection failed, reconnecting: %r", exc)
+                self._reset()
+                publish_fn(self._get_producer())
+
+    def close(self):
+        with self._lock:
+            self._reset()
+
+    def _get_producer(self):
+        # Caller must hold self._lock.
+        if self._producer is None:
+            connection = self.exchange.connection(self.exchange.url)
+            try:
+                # Declares the exchange once for this connection.
+                producer = kombu.Producer(connection.default_channel, exchange=self.exchange.exchange)
+            except BaseException:
+                connection.release()
+                raise
+            self._connection = connection
+            self._producer = producer
+            self.connects += 1
+        return self._producer
+
+    def _reset(self):
+        # Caller must hold self._lock.
+        connection = self._connection
+        self._connection = None
+        self._producer = None
+        if connection is not None:
+            try:
+                connection.release()
+            except Exception:
+                log.debug("Failed to release broken publisher connection", exc_info=True)
+
+
+class PublishLatencyHistogram:
+    """ Thread-safe histogram of publish latencies in seconds.
+    """
+
+    def __init__(self, buckets=PUBLISH_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # The final count is for latencies above the largest bucket.
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+
+    def observe(self, seconds):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._sum += seconds
+
+    def snapshot(self):
+        """ Return the count and sum of observed latencies and the count per
+        bucket (keyed by its upper bound, ``inf`` for the overflow bucket).
+        """
+        with self._lock:
+            bounds = [str(bound) for bound in self.buckets] + ["inf"]
+            return {
+                "count": sum(self._counts),
+                "sum": self._sum,
+                "buckets": dict(zip(bounds, self._counts)),
+            }
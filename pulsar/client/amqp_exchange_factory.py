@@ -1,9 +1,18 @@
 from .amqp_exchange import PulsarExchange
 from .util import (
     filter_destination_params,
+    IndexedMessageQueueUUIDStore,
     MessageQueueUUIDStore,
 )
 
+UUID_STORE_CLASSES = {
+    "directory": MessageQueueUUIDStore,
+    "sqlite": IndexedMessageQueueUUIDStore,
+}
+DEFAULT_UUID_STORE = "directory"
+# Consumed UUIDs are only needed to discard republished duplicates.
+DEFAULT_CONSUMED_UUID_TTL = 7 * 24 * 60 * 60
+
 
 def get_exchange(url, manager_name, params):
     connect_ssl = parse_amqp_connect_ssl_params(params)
@@ -21,6 +30,10 @@ def get_exchange(url, manager_name, params):
     if isinstance(durable_param, str):
         durable_param = durable_param.strip().lower() in ("true", "1", "yes", "on")
     exchange_kwds["durable"] = bool(durable_param)
+    persistent_param = params.get("amqp_persistent_connection", False)
+    if isinstance(persistent_param, str):
+        persistent_param = persistent_param.strip().lower() in ("true", "1", "yes", "on")
+    exchange_kwds["persistent_connection"] = bool(persistent_param)
     if params.get('amqp_acknowledge', False):
         exchange_kwds.update(parse_ack_kwds(params, manager_name))
     timeout = params.get('amqp_consumer_timeout', False)
@@ -75,9 +88,14 @@ def parse_ack_kwds(params, manager_name):
     ack_params = {}
     persistence_directory = params.get('persistence_directory', None)
     if persistence_directory:
+        store_type = params.get('amqp_ack_uuid_store', DEFAULT_UUID_STORE)
+        if store_type not in UUID_STORE_CLASSES:
+            raise Exception("Unknown amqp_ack_uuid_store [%s]" % store_type)
+        store_class = UUID_STORE_CLASSES[store_type]
         subdirs = ['amqp_ack-%s' % manager_name]
-        ack_params['publish_uuid_store'] = MessageQueueUUIDStore(persistence_directory, subdirs=subdirs + ['publish'])
-        ack_params['consume_uuid_store'] = MessageQueueUUIDStore(persistence_directory, subdirs=subdirs + ['consume'])
+        ack_params['publish_uuid_store'] = store_class(persistence_directory, subdirs=subdirs + ['publish'])
+        ack_params['consume_uuid_store'] = store_class(persistence_directory, subdirs=subdirs + ['consume'])
+        ack_params['consumed_uuid_ttl'] = float(params.get('amqp_ack_consumed_uuid_ttl', DEFAULT_CONSUMED_UUID_TTL))
     republish_time = params.get('amqp_ack_republish_time', None)
     if republish_time:
         ack_params['republish_time'] = int(republish_time)
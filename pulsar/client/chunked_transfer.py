@@ -0,0 +1,319 @@
+"""Parallel, chunked transfer of large files between the client and Pulsar.
+
+Files at least ``chunked_transfer_threshold`` bytes large are split into
+``chunked_transfer_chunk_size`` byte ranges, ``chunked_transfer_parallelism``
+of which are transferred at once (each on its own request) and written into
+place at their offset. Every chunk is verified against a SHA-256 checksum -
+computed by the client for uploads and sent by Pulsar after each chunk for
+downloads - and chunks completed so far are recorded in a manifest, so
+retrying an interrupted transfer only transfers the remaining chunks (chunks
+a resumed upload would skip are first checked against the copy on Pulsar).
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .util import BUFFER_SIZE
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+DEFAULT_PARALLELISM = 4
+DEFAULT_MAX_ATTEMPTS = 3
+# Length of the hex SHA-256 digest Pulsar sends after each downloaded chunk.
+CHECKSUM_LENGTH = 64
+
+
+class ChunkChecksumError(Exception):
+    """ A chunk's contents didn't match its checksum.
+    """
+
+
+def chunk_checksum(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def chunk_checksums(path, chunk_size, chunks=()):
+    """ Describe the file at ``path`` - its size, modification time and the
+    checksums of its ``chunk_size`` chunks with indices ``chunks`` (keyed by
+    index). The size is None if there is no such file.
+    """
+    if not os.path.isfile(path):
+        return {"size": None, "chunk_size": chunk_size, "checksums": {}}
+    stat = os.stat(path)
+    checksums = {}
+    with open(path, "rb") as f:
+        for index in chunks:
+            offset = index * chunk_size
+            f.seek(offset)
+            checksums[str(index)] = _read_checksum(f, min(chunk_size, max(0, stat.st_size - offset)))
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "chunk_size": chunk_size, "checksums": checksums}
+
+
+def _read_checksum(f, length):
+    checksum = hashlib.sha256()
+    while length:
+        data = f.read(min(BUFFER_SIZE, length))
+        if not data:
+            break
+        checksum.update(data)
+        length -= len(data)
+    return checksum.hexdigest()
+
+
+def write_chunk(path, input, offset, size, checksum):
+    """ Write the contents of file-like ``input`` into the file at ``path``
+    (``size`` bytes large once complete) at ``offset``, raising
+    ChunkChecksumError if they don't match ``checksum``.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        if os.fstat(fd).st_size != size:
+            os.ftruncate(fd, size)
+        digest = hashlib.sha256()
+        position = offset
+        while True:
+            data = input.read(BUFFER_SIZE)
+            if not data:
+                break
+            if position + len(data) > size:
+                raise ChunkChecksumError("Chunk at offset %d extends past the end of %s (%d bytes)" % (offset, path, size))
+            digest.update(data)
+            pwrite(fd, data, position)
+            position += len(data)
+    finally:
+        os.close(fd)
+    if digest.hexdigest() != checksum:
+        raise ChunkChecksumError("Checksum mismatch for chunk at offset %d of %s" % (offset, path))
+    return {"path": path, "offset": offset, "length": position - offset}
+
+
+_pwrite_lock = threading.Lock()
+
+
+def pwrite(fd, data, offset):
+    """ Write all of ``data`` to ``fd`` at ``offset``.
+    """
+    view = memoryview(data)
+    if hasattr(os, "pwrite"):
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+    else:
+        with _pwrite_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            while view:
+                view = view[os.write(fd, view):]
+
+
+class ChunkedTransfer:
+    """ Upload and download files through a PulsarInterface in parallel chunks.
+    """
+
+    @staticmethod
+    def from_destination_params(job_manager_interface, destination_params):
+        """ Build a ChunkedTransfer if ``chunked_transfer_threshold`` is set.
+        """
+        threshold = destination_params.get("chunked_transfer_threshold", None)
+        if threshold is None:
+            return None
+        return ChunkedTransfer(
+            job_manager_interface,
+            threshold=int(threshold),
+            chunk_size=int(destination_params.get("chunked_transfer_chunk_size", DEFAULT_CHUNK_SIZE)),
+            parallelism=int(destination_params.get("chunked_transfer_parallelism", DEFAULT_PARALLELISM)),
+            manifest_directory=destination_params.get("chunked_transfer_manifest_directory", None),
+        )
+
+    def __init__(self, job_manager_interface, threshold, chunk_size=DEFAULT_CHUNK_SIZE, parallelism=DEFAULT_PARALLELISM,
+                 manifest_directory=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.job_manager_interface = job_manager_interface
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self.parallelism = parallelism
+        self.manifest_directory = manifest_directory or os.path.join(tempfile.gettempdir(), "pulsar_chunked_transfers")
+        self.max_attempts = max_attempts
+
+    def should_upload(self, path):
+        return os.path.getsize(path) >= self.threshold
+
+    def upload(self, path, args):
+        """ Upload the file at ``path`` - ``args`` identify the remote file as
+        for the ``upload_file`` command.
+        """
+        stat = os.stat(path)
+        size = stat.st_size
+        manifest = _Manifest.load(
+            self._manifest_path([args, os.path.abspath(path), size, stat.st_mtime_ns, self.chunk_size]),
+            {"size": size, "chunk_size": self.chunk_size},
+        )
+        self._verify_uploaded(manifest, path, args, size)
+        responses = {}
+
+        def upload_chunk(index):
+            offset = index * self.chunk_size
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(self.chunk_size)
+            chunk_args = dict(args, offset=offset, size=size, checksum=chunk_checksum(data))
+            responses[index] = self._attempt(lambda: self.job_manager_interface.execute("upload_file_chunk", chunk_args, data=data))
+            manifest.complete(index)
+
+        self._transfer(manifest, _chunk_count(size, self.chunk_size), upload_chunk, "upload of %s" % path)
+        manifest.remove()
+        if responses:
+            response = _json(responses[max(responses)])
+        else:
+            # Every chunk was uploaded by an earlier attempt.
+            response = _json(self.job_manager_interface.execute("path", args))
+        return {"path": response["path"]}
+
+    def _verify_uploaded(self, manifest, path, args, size):
+        # The remote file may have been removed or replaced since an earlier
+        # attempt (e.g. the job was cleaned and set up again), so only skip the
+        # chunks it still holds.
+        if not manifest.done:
+            return
+        chunks = sorted(manifest.done)
+        remote = _json(self.job_manager_interface.execute(
+            "file_checksums", dict(args, chunk_size=self.chunk_size, chunks=",".join(map(str, chunks)))
+        ))
+        if remote["size"] != size:
+            log.info("Remote copy of %s doesn't match an earlier upload attempt, uploading all chunks", path)
+            manifest.done.clear()
+            return
+        with open(path, "rb") as f:
+            for index in chunks:
+                f.seek(index * self.chunk_size)
+                if _read_checksum(f, self.chunk_size) != remote["checksums"].get(str(index)):
+                    manifest.done.discard(index)
+        log.debug("Resuming upload of %s, %d of %d earlier chunks present remotely", path, len(manifest.done), len(chunks))
+
+    def download(self, args, output_path):
+        """ Download the remote file described by ``args`` (as for the
+        ``download_output`` command) to ``output_path`` if it is at least
+        ``threshold`` bytes large. Returns False otherwise.
+        """
+        description = _json(self.job_manager_interface.execute("file_checksums", dict(args, chunk_size=self.chunk_size)))
+        size = description["size"]
+        if size is None or size < self.threshold:
+            return False
+        manifest = _Manifest.load(
+            self._manifest_path([args, os.path.abspath(output_path), self.chunk_size]),
+            {"size": size, "mtime": description["mtime"], "chunk_size": self.chunk_size},
+        )
+        if not os.path.exists(output_path):
+            manifest.done.clear()
+        elif not manifest.done:
+            os.unlink(output_path)
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+        try:
+            os.ftruncate(fd, size)
+
+            def download_chunk(index):
+                offset = index * self.chunk_size
+                length = min(self.chunk_size, size - offset)
+                chunk_args = dict(args, offset=offset, length=length, checksum="true")
+
+                def fetch():
+                    response = self.job_manager_interface.execute("download_output_chunk", chunk_args)
+                    data, checksum = response[:-CHECKSUM_LENGTH], response[-CHECKSUM_LENGTH:].decode("ascii")
+                    if len(data) != length or chunk_checksum(data) != checksum:
+                        raise ChunkChecksumError("Checksum mismatch for chunk at offset %d of %s" % (offset, output_path))
+                    return data
+
+                pwrite(fd, self._attempt(fetch), offset)
+                manifest.complete(index)
+
+            self._transfer(manifest, _chunk_count(size, self.chunk_size), download_chunk, "download to %s" % output_path)
+        finally:
+            os.close(fd)
+        manifest.remove()
+        return True
+
+    def _manifest_path(self, key):
+        key = json.dumps(key, sort_keys=True)
+        return os.path.join(self.manifest_directory, "%s.json" % hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def _transfer(self, manifest, count, transfer_chunk, description):
+        pending = [index for index in range(count) if index not in manifest.done]
+        log.debug("Chunked %s: %d of %d chunks remaining", description, len(pending), count)
+        failed = threading.Event()
+
+        def run(index):
+            # Don't start further chunks after a failure, a retry resumes from the manifest.
+            if failed.is_set():
+                return
+            try:
+                transfer_chunk(index)
+            except BaseException:
+                failed.set()
+                raise
+
+        with ThreadPoolExecutor(max_workers=max(1, self.parallelism)) as executor:
+            # Consume results so the first failure is raised.
+            for _ in executor.map(run, pending):
+                pass
+
+    def _attempt(self, func):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return func()
+            except Exception:
+                if attempt == self.max_attempts:
+                    raise
+                log.warning("Chunk transfer failed (attempt %d of %d), retrying", attempt, self.max_attempts, exc_info=True)
+
+
+class _Manifest:
+    """ Record of the chunks of a transfer completed so far.
+    """
+
+    @staticmethod
+    def load(path, description):
+        done = set()
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+            if saved["description"] == description:
+                done = set(saved["done"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return _Manifest(path, description, done)
+
+    def __init__(self, path, description, done):
+        self.path = path
+        self.description = description
+        self.done = done
+        self._lock = threading.Lock()
+
+    def complete(self, index):
+        with self._lock:
+            self.done.add(index)
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            temp_path = "%s.tmp" % self.path
+            with open(temp_path, "w") as f:
+                json.dump({"description": self.description, "done": sorted(self.done)}, f)
+            os.replace(temp_path, self.path)
+
+    def remove(self):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def _chunk_count(size, chunk_size):
+    return max(1, (size + chunk_size - 1) // chunk_size)
+
+
+def _json(response):
+    if isinstance(response, bytes):
+        response = response.decode("utf-8")
+    return json.loads(response)
@@ -1,11 +1,13 @@
 import logging
 import os
+import tempfile
 from enum import Enum
 from typing import (
     Any,
     cast,
     Callable,
     Dict,
+    MutableMapping,
     Optional,
 )
 from typing_extensions import Protocol
@@ -55,11 +57,18 @@ from .action_mapper import (
     path_type,
 )
 from .amqp_exchange import ACK_FORCE_NOACK_KEY
+from .chunked_transfer import ChunkedTransfer
 from .decorators import (
     parseJson,
     retry,
 )
 from .destination import submit_params
+from .directory_archive import (
+    archive_compression,
+    DEFAULT_DIRECTORY_TRANSFER_MODE,
+    extract_archive,
+    write_archive,
+)
 from .job_directory import RemoteJobDirectory
 from .setup_handler import build as build_setup_handler
 from .util import (
@@ -182,6 +191,9 @@ class JobClient(BaseJobClient):
     def __init__(self, destination_params, job_id, job_manager_interface):
         super().__init__(destination_params, job_id)
         self.job_manager_interface = job_manager_interface
+        self.chunked_transfer = ChunkedTransfer.from_destination_params(job_manager_interface, self.destination_params)
+        self.directory_transfer_mode = self.destination_params.get("directory_transfer_mode", DEFAULT_DIRECTORY_TRANSFER_MODE)
+        self.archive_compression = archive_compression(self.directory_transfer_mode)
 
     def launch(self, command_line, dependencies_description=None, env=None, remote_staging=None, job_config=None,
                dynamic_file_sources=None, token_endpoint=None):
@@ -205,9 +217,14 @@ class JobClient(BaseJobClient):
             launch_params['env'] = json_dumps(env)
         if remote_staging:
             launch_params['remote_staging'] = json_dumps(remote_staging)
+        submit_extras = {}
         if job_config and 'touch_outputs' in job_config:
             # message clients pass the entire job config
-            launch_params['submit_extras'] = json_dumps({'touch_outputs': job_config['touch_outputs']})
+            submit_extras['touch_outputs'] = job_config['touch_outputs']
+        if self.destination_params.get("submitter"):
+            submit_extras['submitter'] = self.destination_params["submitter"]
+        if submit_extras:
+            launch_params['submit_extras'] = json_dumps(submit_extras)
         if token_endpoint is not None:
             launch_params["token_endpoint"] = json_dumps({'token_endpoint': token_endpoint})
 
@@ -275,6 +292,8 @@ class JobClient(BaseJobClient):
                 contents = contents.encode("utf-8")
             message = "Uploading path [%s] (action_type: [%s])"
             log.debug(message, path, action_type)
+            if input_path and self.chunked_transfer and self.chunked_transfer.should_upload(input_path):
+                return self.chunked_transfer.upload(input_path, args)
             return self._upload_file(args, contents, input_path)
         elif action_type == 'copy':
             path_response = self._raw_execute('path', args)
@@ -282,6 +301,47 @@ class JobClient(BaseJobClient):
             _copy(path, pulsar_path)
             return {'path': pulsar_path}
 
+    def put_archive(self, files, input_type):
+        """
+        Upload ``files`` - ``(path, name)`` tuples - as one tar stream if
+        ``directory_transfer_mode`` is ``tar`` or ``tar.gz``. Returns a
+        dictionary of names to remote paths, or None if not enabled.
+        """
+        if self.archive_compression is None:
+            return None
+        with tempfile.NamedTemporaryFile(prefix="pulsar_archive_", suffix=".tar") as archive:
+            write_archive(files, archive, self.archive_compression)
+            archive.flush()
+            log.debug("Uploading %d files of type [%s] as one archive", len(files), input_type)
+            args = {"job_id": self.job_id, "type": input_type, "compression": self.archive_compression}
+            response = self._raw_execute("upload_archive", args, input_path=archive.name)
+        return json_loads(response)["paths"]
+
+    def fetch_output_archive(self, files, output_type):
+        """
+        Download ``files`` - ``(path, name)`` tuples of local paths and remote
+        names - as one tar stream if ``directory_transfer_mode`` is ``tar`` or
+        ``tar.gz``. Returns the ``(name, path)`` tuples fetched.
+        """
+        if self.archive_compression is None or output_type not in ['output', 'output_workdir', 'output_metadata']:
+            return []
+        destinations = {name: path for path, name in files}
+
+        def destination_for(name):
+            path = destinations.get(name)
+            if path is not None:
+                ensure_directory(path)
+            return path
+
+        with tempfile.TemporaryDirectory(prefix="pulsar_archive_") as directory:
+            archive_path = os.path.join(directory, "outputs.tar")
+            args = {"job_id": self.job_id, "type": output_type, "compression": self.archive_compression}
+            data = json_dumps(list(destinations)).encode("utf-8")
+            self._raw_execute("download_output_archive", args, data=data, output_path=archive_path)
+            with open(archive_path, "rb") as archive:
+                extracted = extract_archive(archive, self.archive_compression, destination_for)
+        return list(extracted.items())
+
     def fetch_output(self, path, name, working_directory, action_type, output_type):
         """
         Fetch (transfer, copy, etc...) an output from the remote Pulsar server.
@@ -346,6 +406,8 @@ class JobClient(BaseJobClient):
             "job_id": self.job_id,
             "type": output_type
         }
+        if self.chunked_transfer and self.chunked_transfer.download(output_params, output_path):
+            return
         self._raw_execute("download_output", output_params, output_path=output_path)
 
     def job_ip(self):
@@ -385,6 +447,8 @@ class BaseRemoteConfiguredJobClient(BaseJobClient):
             launch_params['remote_staging']['ssh_key'] = self.ssh_key
         launch_params['dynamic_file_sources'] = dynamic_file_sources
         launch_params['token_endpoint'] = token_endpoint
+        if self.destination_params.get("submitter"):
+            launch_params['submitter'] = self.destination_params["submitter"]
 
         if job_config and self.setup_handler.local:
             # Setup not yet called, job properties were inferred from
@@ -483,14 +547,15 @@ class BaseRemoteConfiguredJobClient(BaseJobClient):
 
 
 class MessagingClientManagerProtocol(ClientManagerProtocol):
-    status_cache: Dict[str, Dict[str, Any]]
+    status_cache: MutableMapping[str, Dict[str, Any]]
 
 
 class BaseMessageJobClient(BaseRemoteConfiguredJobClient):
     client_manager: MessagingClientManagerProtocol
 
     def clean(self):
-        del self.client_manager.status_cache[self.job_id]
+        # The status may already have been evicted from the bounded cache.
+        self.client_manager.status_cache.pop(self.job_id, None)
 
     def full_status(self):
         job_id = self.job_id
@@ -0,0 +1,117 @@
+"""Transfer of many files of a directory as one tar stream.
+
+With the ``directory_transfer_mode`` destination parameter set to ``tar`` or
+``tar.gz``, files of a directory staged with the ``transfer`` action - e.g.
+tool directories and the extra files of inputs, and the working and metadata
+directory files collected after a job - are sent as one (optionally gzip
+compressed) tar stream per directory in a single request instead of one
+request per file. Archives are unpacked file by file into destinations chosen
+by the receiver, and members that aren't regular files or whose names are
+absolute or contain ``..`` are rejected.
+"""
+import ntpath
+import os
+import tarfile
+import zlib
+
+from .util import (
+    BUFFER_SIZE,
+    copy_to_path,
+)
+
+DEFAULT_DIRECTORY_TRANSFER_MODE = "files"
+# directory_transfer_mode -> compression of the tar stream (None for one
+# request per file).
+DIRECTORY_TRANSFER_MODES = {
+    "files": None,
+    "tar": "",
+    "tar.gz": "gz",
+}
+COMPRESSIONS = ["", "gz"]
+
+
+class UnsafeArchiveError(Exception):
+    """ An archive member would be extracted outside its destination, or isn't
+    a regular file.
+    """
+
+
+def archive_compression(directory_transfer_mode):
+    if directory_transfer_mode not in DIRECTORY_TRANSFER_MODES:
+        raise Exception("Unknown Pulsar directory_transfer_mode %s" % directory_transfer_mode)
+    return DIRECTORY_TRANSFER_MODES[directory_transfer_mode]
+
+
+def write_archive(files, fileobj, compression=""):
+    """ Write a tar stream of ``files`` - ``(path, name)`` tuples - to ``fileobj``.
+    """
+    for data in iter_archive(files, compression):
+        fileobj.write(data)
+
+
+def iter_archive(files, compression=""):
+    """ Yield a tar stream of ``files`` - ``(path, name)`` tuples - in blocks,
+    reading each file as it goes rather than building the archive in memory.
+    """
+    _check_compression(compression)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compression == "gz" else None
+
+    def output(data):
+        return compressor.compress(data) if compressor else data
+
+    for path, name in files:
+        _check_member_name(name)
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            info = tarfile.TarInfo(name)
+            info.size = stat.st_size
+            info.mtime = int(stat.st_mtime)
+            info.mode = 0o644
+            yield output(info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape"))
+            remaining = info.size
+            while remaining > 0:
+                data = f.read(min(BUFFER_SIZE, remaining))
+                if not data:
+                    raise Exception("File %s shrunk while being archived" % path)
+                remaining -= len(data)
+                yield output(data)
+            padding = -info.size % tarfile.BLOCKSIZE
+            if padding:
+                yield output(tarfile.NUL * padding)
+    yield output(tarfile.NUL * (2 * tarfile.BLOCKSIZE))
+    if compressor:
+        yield compressor.flush()
+
+
+def extract_archive(fileobj, compression, destination_for):
+    """ Extract the tar stream read from ``fileobj``, writing each member to
+    the path returned by ``destination_for(name)`` (members for which it
+    returns None are skipped). Returns a dictionary of extracted names to paths.
+    """
+    _check_compression(compression)
+    extracted = {}
+    with tarfile.open(fileobj=fileobj, mode="r|%s" % compression) as archive:
+        for member in archive:
+            if member.isdir():
+                continue
+            if not member.isfile():
+                raise UnsafeArchiveError("Refusing to extract archive member %s, not a regular file" % member.name)
+            _check_member_name(member.name)
+            path = destination_for(member.name)
+            if path is None:
+                continue
+            copy_to_path(archive.extractfile(member), path)
+            extracted[member.name] = path
+    return extracted
+
+
+def _check_member_name(name):
+    if not name or name.startswith(("/", "\\")) or ntpath.splitdrive(name)[0]:
+        raise UnsafeArchiveError("Refusing archive member with absolute name %s" % name)
+    if ".." in name.replace("\\", "/").split("/"):
+        raise UnsafeArchiveError("Refusing archive member with relative name %s" % name)
+
+
+def _check_compression(compression):
+    if compression not in COMPRESSIONS:
+        raise Exception("Unknown archive compression %s" % compression)
@@ -10,7 +10,10 @@ import os
 import threading
 from logging import getLogger
 from os import getenv
-from queue import Queue
+from queue import (
+    Empty,
+    Queue,
+)
 from typing import (
     Any,
     Callable,
@@ -45,6 +48,7 @@ from .server_interface import (
     LocalPulsarInterface,
     PulsarInterface,
 )
+from .status_cache import StatusCache
 from .transport import get_transport
 from .util import TransferEventManager
 
@@ -54,6 +58,8 @@ if TYPE_CHECKING:
 log = getLogger(__name__)
 
 DEFAULT_TRANSFER_THREADS = 2
+DEFAULT_RELAY_STATUS_BATCH_SIZE = 100
+DEFAULT_RELAY_STATUS_BUFFER_SIZE = 1000
 
 
 def _per_handler_cursor_path(
@@ -179,7 +185,7 @@ class BaseRemoteConfiguredJobClientManager(ClientManagerInterface):
 
 
 class MessageQueueClientManager(BaseRemoteConfiguredJobClientManager):
-    status_cache: Dict[str, Any]
+    status_cache: StatusCache
     ack_consumer_threads: Dict[str, threading.Thread]
 
     def __init__(self, amqp_url: str, **kwds: Any):
@@ -187,7 +193,7 @@ class MessageQueueClientManager(BaseRemoteConfiguredJobClientManager):
         self.url = amqp_url
         self.amqp_key_prefix = kwds.get("amqp_key_prefix", None)
         self.exchange = get_exchange(self.url, self.manager_name, kwds)
-        self.status_cache = {}
+        self.status_cache = StatusCache.from_kwds(kwds)
         self.callback_lock = threading.Lock()
         self.callback_thread = None
         self.ack_consumer_threads = {}
@@ -280,6 +286,7 @@ class MessageQueueClientManager(BaseRemoteConfiguredJobClientManager):
                 self.callback_thread.join()
             for v in self.ack_consumer_threads.values():
                 v.join()
+        self.exchange.close()
 
     def __nonzero__(self):
         return self.active
@@ -313,7 +320,7 @@ class RelayClientManager(BaseRemoteConfiguredJobClientManager):
     Pulsar through the relay, while posting control messages (setup, status
     requests, kill) to the relay for Pulsar to consume.
     """
-    status_cache: Dict[str, Any]
+    status_cache: StatusCache
 
     def __init__(
         self,
@@ -326,6 +333,8 @@ class RelayClientManager(BaseRemoteConfiguredJobClientManager):
         relay_credentials_file: Optional[str] = None,
         relay_refresh_token: Optional[str] = None,
         on_refresh_token_rotated: Optional[Callable[[Dict[str, Any]], None]] = None,
+        relay_status_batch_size: int = DEFAULT_RELAY_STATUS_BATCH_SIZE,
+        relay_status_buffer_size: int = DEFAULT_RELAY_STATUS_BUFFER_SIZE,
         **kwds: Any,
     ):
         # Imported lazily so pulsar still installs on Pythons that don't meet
@@ -381,9 +390,12 @@ class RelayClientManager(BaseRemoteConfiguredJobClientManager):
             auth_manager=auth_manager,
         )
         self.relay_topic_prefix = relay_topic_prefix
-        self.status_cache = {}
+        self.status_cache = StatusCache.from_kwds(kwds)
         self.callback_lock = threading.Lock()
         self.callback_thread = None
+        self.batch_callback_thread: Optional[threading.Thread] = None
+        self.status_batch_size = int(relay_status_batch_size)
+        self.status_buffer_size = int(relay_status_buffer_size)
         self.active = True
         self.shutdown_event = threading.Event()
 
@@ -424,6 +436,61 @@ class RelayClientManager(BaseRemoteConfiguredJobClientManager):
         except BaseException as e:
             log.exception("Failure processing job status update message - BaseException type %s" % type(e))
 
+    def batch_callback_wrapper(self, callback, messages):
+        """Process a batch of status update messages from the relay.
+
+        Unlike ``callback_wrapper`` this also runs after shutdown - the relay
+        cursor has moved past buffered messages, so they are still delivered.
+        If ``callback`` fails for the batch, the updates are retried one at a
+        time so one bad update doesn't lose the others.
+        """
+        payloads = _latest_status_updates([message.get('payload', {}) for message in messages])
+        try:
+            for payload in payloads:
+                if "job_id" in payload:
+                    self.status_cache[payload["job_id"]] = payload
+            log.debug("Handling %d asynchronous status updates from Pulsar via relay.", len(payloads))
+            callback(payloads)
+        except Exception:
+            if len(payloads) == 1:
+                log.exception("Failure processing job status update message.")
+                return
+            log.exception("Failure processing job status update messages, handling them one at a time.")
+            for payload in payloads:
+                try:
+                    callback([payload])
+                except Exception:
+                    log.exception("Failure processing job status update message for job_id %s.", payload.get("job_id", "unknown"))
+        except BaseException as e:
+            log.exception("Failure processing job status update messages - BaseException type %s" % type(e))
+
+    def status_batch_consumer(self, callback, updates: "Queue[Dict[str, Any]]"):
+        """Hand the messages buffered in ``updates`` to ``callback`` in batches.
+
+        After shutdown, keeps going until the polling thread has stopped and
+        every buffered message was delivered.
+        """
+        while self.active or not updates.empty() or self._polling():
+            try:
+                messages = [updates.get(timeout=1)]
+            except Empty:
+                continue
+            while len(messages) < self.status_batch_size:
+                try:
+                    messages.append(updates.get_nowait())
+                except Empty:
+                    break
+            self.batch_callback_wrapper(callback, messages)
+
+    def _polling(self):
+        thread = self.callback_thread
+        return thread is not None and thread.is_alive()
+
+    def _buffer_status_update(self, updates: "Queue[Dict[str, Any]]", message):
+        # Blocks polling while the buffer is full - also after shutdown, the
+        # batch consumer keeps draining it until polling has stopped.
+        updates.put(message)
+
     def status_consumer(self, callback_wrapper):
         """Long-poll the relay for status update messages."""
         manager_name = self.manager_name
@@ -471,6 +538,37 @@ class RelayClientManager(BaseRemoteConfiguredJobClientManager):
             thread.start()
             self.callback_thread = thread
 
+    def ensure_has_status_update_batch_callback(self, callback):
+        """Like ``ensure_has_status_update_callback``, but ``callback`` is
+        called with lists of status update payloads.
+
+        Polling the relay and invoking ``callback`` happen on separate threads,
+        with up to ``relay_status_buffer_size`` messages buffered between them.
+        Each call receives up to ``relay_status_batch_size`` of the buffered
+        messages, with only the newest update kept for each job.
+        """
+        with self.callback_lock:
+            if self.callback_thread is not None:
+                return
+
+            updates: "Queue[Dict[str, Any]]" = Queue(maxsize=self.status_buffer_size)
+            batch_thread = threading.Thread(
+                name="pulsar_client_%s_relay_status_callback" % self.manager_name,
+                target=functools.partial(self.status_batch_consumer, callback, updates),
+            )
+            batch_thread.daemon = True
+            batch_thread.start()
+            self.batch_callback_thread = batch_thread
+
+            run = functools.partial(self.status_consumer, functools.partial(self._buffer_status_update, updates))
+            thread = threading.Thread(
+                name="pulsar_client_%s_relay_status_consumer" % self.manager_name,
+                target=run
+            )
+            thread.daemon = True
+            thread.start()
+            self.callback_thread = thread
+
     def ensure_has_ack_consumers(self):
         """No-op for relay client manager, as acknowledgements are handled via HTTP."""
         pass
@@ -508,6 +606,8 @@ class RelayClientManager(BaseRemoteConfiguredJobClientManager):
         if ensure_cleanup:
             if self.callback_thread is not None:
                 self.callback_thread.join()
+            if self.batch_callback_thread is not None:
+                self.batch_callback_thread.join()
         # Close relay transport
         if hasattr(self, 'relay_transport'):
             self.relay_transport.close()
@@ -547,6 +647,19 @@ class PollingJobClientManager(BaseRemoteConfiguredJobClientManager):
         pass
 
 
+def _latest_status_updates(payloads):
+    """Drop all but the last of ``payloads`` for each job, keeping the order
+    in which the remaining updates were received.
+    """
+    latest: Dict[Any, Dict[str, Any]] = {}
+    for payload in payloads:
+        # Updates without a job_id are all kept.
+        key = payload.get("job_id", object())
+        latest.pop(key, None)
+        latest[key] = payload
+    return list(latest.values())
+
+
 def build_client_manager(
     job_manager: Optional["ManagerInterface"] = None,
     relay_url: Optional[str] = None,
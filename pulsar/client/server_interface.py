@@ -38,6 +38,11 @@ COMMAND_TO_PATH = {
     "path": Template("jobs/${job_id}/files/path"),
     "upload_file": Template("jobs/${job_id}/files"),
     "download_output": Template("jobs/${job_id}/files"),
+    "upload_file_chunk": Template("jobs/${job_id}/files/chunks"),
+    "download_output_chunk": Template("jobs/${job_id}/files/chunks"),
+    "file_checksums": Template("jobs/${job_id}/files/checksums"),
+    "upload_archive": Template("jobs/${job_id}/files/archive"),
+    "download_output_archive": Template("jobs/${job_id}/files/archive/download"),
 
     "setup": Template("jobs"),
     "clean": Template("jobs/${job_id}"),
@@ -64,6 +69,11 @@ COMMAND_TO_PATH = {
 COMMAND_TO_METHOD = {
     "upload_file": "POST",
     "download_output": "GET",
+    "upload_file_chunk": "PUT",
+    "download_output_chunk": "GET",
+    "file_checksums": "GET",
+    "upload_archive": "POST",
+    "download_output_archive": "POST",
 
     "setup": "POST",
     "submit": "POST",
@@ -145,7 +155,12 @@ class LocalPulsarInterface(PulsarInterface):
             args = {}
         # If data set, should be unicode (on Python 2) or str (on Python 3).
         from pulsar.web import routes
-        from pulsar.web.framework import build_func_args
+        from pulsar.web.framework import (
+            build_func_args,
+            FileRange,
+            FileStream,
+            iter_file_range,
+        )
         controller = getattr(routes, command)
         action = controller.func
         body_args = dict(body=self.__build_body(data, input_path))
@@ -153,6 +168,12 @@ class LocalPulsarInterface(PulsarInterface):
         result = action(**args)
         if controller.response_type != 'file':
             return controller.body(result)
+        elif isinstance(result, FileStream):
+            with open(output_path, 'wb') as output:
+                for data in result.app_iter:
+                    output.write(data)
+        elif isinstance(result, FileRange):
+            return b"".join(iter_file_range(result))
         else:
             with open(result, 'rb') as result_file:
                 copy_to_path(result_file, output_path)
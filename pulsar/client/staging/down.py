@@ -1,5 +1,6 @@
 """Code run on the client side for unstaging complete Pulsar jobs."""
 import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from json import loads
 from logging import getLogger
@@ -14,18 +15,24 @@ from ..transport.transient import http_status_code
 
 log = getLogger(__name__)
 
+DEFAULT_COLLECT_MAX_WORKERS = 1
+
 
 def finish_job(client, cleanup_job, job_completed_normally, client_outputs, pulsar_outputs):
     """Process for "un-staging" a complete Pulsar job.
 
     This function is responsible for downloading results from remote
-    server and cleaning up Pulsar staging directory (if needed.)
+    server and cleaning up Pulsar staging directory (if needed.) Outputs are
+    downloaded ``output_collection_max_workers`` (a destination parameter) at
+    a time.
     """
     collection_failure_exceptions = []
     if job_completed_normally:
         output_collector = ClientOutputCollector(client)
         action_mapper = FileActionMapper(client)
-        results_stager = ResultsCollector(output_collector, action_mapper, client_outputs, pulsar_outputs)
+        destination_params = getattr(client, "destination_params", None) or {}
+        max_workers = int(destination_params.get("output_collection_max_workers", DEFAULT_COLLECT_MAX_WORKERS))
+        results_stager = ResultsCollector(output_collector, action_mapper, client_outputs, pulsar_outputs, max_workers=max_workers)
         collection_failure_exceptions = results_stager.collect()
     _clean(collection_failure_exceptions, cleanup_job, client)
     return collection_failure_exceptions
@@ -51,10 +58,21 @@ class ClientOutputCollector:
         )
         return True
 
+    def collect_output_archive(self, output_type, files):
+        fetch_output_archive = getattr(self.client, "fetch_output_archive", None)
+        if fetch_output_archive is None:
+            return []
+        return fetch_output_archive(files, output_type)
+
 
 class ResultsCollector:
+    """ Collect the outputs of a job via ``output_collector``.
+
+    With ``max_workers`` greater than 1, outputs are collected concurrently on
+    a thread pool of that size - created for each call to ``collect``.
+    """
 
-    def __init__(self, output_collector, action_mapper, client_outputs, pulsar_outputs):
+    def __init__(self, output_collector, action_mapper, client_outputs, pulsar_outputs, max_workers=DEFAULT_COLLECT_MAX_WORKERS):
         self.output_collector = output_collector
         self.action_mapper = action_mapper
         self.client_outputs = client_outputs
@@ -65,15 +83,33 @@ class ResultsCollector:
         self.working_directory_contents = pulsar_outputs.working_directory_contents or []
         self.metadata_directory_contents = pulsar_outputs.metadata_directory_contents or []
         self.job_directory_contents = pulsar_outputs.job_directory_contents or []
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = []
 
     def collect(self):
+        if self.max_workers <= 1:
+            self.__collect()
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="collect-output") as executor:
+                self._executor = executor
+                try:
+                    self.__collect()
+                finally:
+                    self._wait_for_pending()
+                    self._executor = None
+        return self.exception_tracker.collection_failure_exceptions
+
+    def __collect(self):
         self.__collect_working_directory_outputs()
+        # Other working directory files are skipped if already collected as
+        # explicit outputs, so wait for those first.
+        self._wait_for_pending()
         self.__collect_outputs()
         self.__collect_version_file()
         self.__collect_other_working_directory_files()
         self.__collect_metadata_directory_files()
         self.__collect_job_directory_files()
-        return self.exception_tracker.collection_failure_exceptions
 
     def __collect_working_directory_outputs(self):
         working_directory = self.client_outputs.working_directory
@@ -92,8 +128,7 @@ class ResultsCollector:
                     relative_path_in_dir = relpath(remote_file_name, name)
                     local_output_path = join(output_file, relative_path_in_dir)
                     pulsar = self.pulsar_outputs.path_helper.remote_name(remote_file_name)
-                    if self._attempt_collect_output('output_workdir', path=local_output_path, name=pulsar):
-                        self.downloaded_working_directory_files.append((pulsar, local_output_path))
+                    self._attempt_collect_output('output_workdir', path=local_output_path, name=pulsar, downloaded=(pulsar, local_output_path))
             else:
                 if name not in self.working_directory_contents:
                     # Could be a glob
@@ -102,8 +137,7 @@ class ResultsCollector:
                         name = matching[0]
                         source_file = join(working_directory, name)
                 pulsar = self.pulsar_outputs.path_helper.remote_name(name)
-                if self._attempt_collect_output('output_workdir', path=output_file, name=pulsar):
-                    self.downloaded_working_directory_files.append((pulsar, output_file))
+                self._attempt_collect_output('output_workdir', path=output_file, name=pulsar, downloaded=(pulsar, output_file))
                 # Remove from full output_files list so don't try to download directly.
                 try:
                     self.output_files.remove(output_file)
@@ -192,6 +226,7 @@ class ResultsCollector:
         dynamic_file_source_references = self.__realized_dynamic_file_source_references()
 
         # Fetch remaining working directory outputs of interest.
+        to_collect = []
         for name in contents:
             collect = False
             if self.client_outputs.dynamic_match(name):
@@ -203,22 +238,66 @@ class ResultsCollector:
                 output_file = join(directory, self.pulsar_outputs.path_helper.local_name(name))
                 if (name, output_file) in self.downloaded_working_directory_files:
                     continue
-                log.debug("collecting dynamic {} file {}".format(output_type, name))
-                if self._attempt_collect_output(output_type=output_type, path=output_file, name=name):
-                    self.downloaded_working_directory_files.append((name, output_file))
+                to_collect.append((name, output_file))
+
+        archived = self.__collect_directory_archive(output_type, to_collect)
+        for name, output_file in to_collect:
+            if (name, output_file) in archived:
+                continue
+            log.debug("collecting dynamic {} file {}".format(output_type, name))
+            self._attempt_collect_output(output_type=output_type, path=output_file, name=name, downloaded=(name, output_file))
+
+    def __collect_directory_archive(self, output_type, to_collect):
+        """ Collect the files of ``to_collect`` the client transfers itself as
+        one archive if the output collector supports it, returning the
+        ``(name, path)`` tuples collected. Anything not collected this way
+        (e.g. because the Pulsar server is too old) is collected file by file.
+        """
+        collect_output_archive = getattr(self.output_collector, "collect_output_archive", None)
+        if collect_output_archive is None or len(to_collect) < 2:
+            return []
+        files = []
+        for name, output_file in to_collect:
+            action = self.action_mapper.action({"path": output_file}, output_type)
+            if action.staging_action_local and action.action_type == "transfer":
+                files.append((output_file, name))
+        if len(files) < 2:
+            return []
+        try:
+            collected = collect_output_archive(output_type, files)
+        except Exception:
+            log.warning("Failed to collect %s files as an archive, collecting them one at a time", output_type, exc_info=True)
+            return []
+        self.downloaded_working_directory_files.extend(collected)
+        return collected
 
-    def _attempt_collect_output(self, output_type, path, name=None):
+    def _attempt_collect_output(self, output_type, path, name=None, downloaded=None):
         # path is final path on galaxy server (client)
         # name is the 'name' of the file on the Pulsar server (possible a relative)
         # path.
+        # downloaded is recorded in downloaded_working_directory_files once
+        # collected. When collecting concurrently this returns None right away.
+        if self._executor is not None:
+            self._pending.append(self._executor.submit(self.__attempt_collect_output, output_type, path, name, downloaded))
+            return None
+        return self.__attempt_collect_output(output_type, path, name, downloaded)
+
+    def __attempt_collect_output(self, output_type, path, name, downloaded):
         collected = False
         with self.exception_tracker():
             action = self.action_mapper.action({"path": path}, output_type)
             if self._collect_output(output_type, action, name):
                 collected = True
 
+        if collected and downloaded is not None:
+            self.downloaded_working_directory_files.append(downloaded)
         return collected
 
+    def _wait_for_pending(self):
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
     def _collect_output(self, output_type, action, name):
         log.info("collecting output {} with action {}".format(name, action))
         try:
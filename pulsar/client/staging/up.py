@@ -6,7 +6,9 @@ from os.path import (
     basename,
     dirname,
     exists,
+    getsize,
     isdir,
+    isfile,
     join,
     relpath,
 )
@@ -508,6 +510,7 @@ class TransferTracker:
         else:
             assert action_source is None
 
+        directory_file_names = []
         for directory_file_name in directory_files(directory):
             directory_file_path = join(directory, directory_file_name)
             if not rel_path_to:
@@ -519,7 +522,40 @@ class TransferTracker:
             remote_name = self.path_helper.remote_name(
                 relpath(directory_file_path, rel_path_to)
             )
-            self.handle_transfer_path(directory_file_path, type, name=remote_name)
+            directory_file_names.append((directory_file_path, remote_name))
+
+        archived = self.__handle_transfer_archive(directory_file_names, type)
+        for directory_file_path, remote_name in directory_file_names:
+            if directory_file_path not in archived:
+                self.handle_transfer_path(directory_file_path, type, name=remote_name)
+
+    def __handle_transfer_archive(self, directory_file_names, type):
+        """ Upload the files of a directory the client transfers itself as one
+        archive (if its ``directory_transfer_mode`` allows), returning the paths
+        uploaded. Anything not uploaded this way (e.g. because the Pulsar server
+        is too old) is uploaded file by file.
+        """
+        if getattr(self.client, "archive_compression", None) is None or len(directory_file_names) < 2:
+            return set()
+        actions = {}
+        files = []
+        for path, name in directory_file_names:
+            action = self.__action_for_transfer({"path": path}, type, None)
+            if action.staging_needed and action.staging_action_local and action.action_type == "transfer":
+                actions[path] = action
+                files.append((path, name))
+        if len(files) < 2:
+            return set()
+        try:
+            remote_paths = self.client.put_archive(files, type)
+        except Exception:
+            log.warning("Failed to upload %s files as an archive, uploading them one at a time", type, exc_info=True)
+            return set()
+        for path, name in files:
+            register = self.rewrite_paths or type == 'tool'  # Even if inputs not rewritten, tool must be.
+            if register:
+                self.register_rewrite_action(actions[path], remote_paths[name], force=True)
+        return set(actions)
 
     def handle_transfer_source(self, source, type, name=None, contents=None):
         action = self.__action_for_transfer(source, type, contents)
@@ -566,6 +602,10 @@ class TransferTracker:
             type=type,
             action=action.to_dict(),
         )
+        path = getattr(action, "path", None)
+        if path and isfile(path):
+            # Lets Pulsar schedule staging of small jobs first.
+            input_dict["size"] = getsize(path)
         self.remote_staging_actions.append(input_dict)
 
     def __action_for_transfer(self, source, type, contents):
@@ -0,0 +1,180 @@
+"""Bounded cache of the latest status update received for each job.
+
+Message queue and relay client managers keep the last status update of every
+job so Galaxy can read the final status of a job (including its standard output
+and error and directory listings) once it finishes. A StatusCache keeps the
+latest update per job in memory within ``max_entries`` jobs and ``max_bytes``
+of (JSON encoded) updates, evicting the least recently used jobs first and
+forgetting updates older than ``ttl`` seconds. If ``spill_directory`` is set,
+evicted updates are written there instead of being dropped, read back from
+there when requested and picked up again by the next process using it.
+Without one, the final status of a finished job is never evicted (only
+expired), since Galaxy can't collect the job without it - these stay cached,
+even beyond the limits, until the job is cleaned.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from logging import getLogger
+
+from pulsar.managers.status import is_job_done
+
+log = getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class StatusCache(MutableMapping):
+    """ Dictionary-like mapping of job ids to their latest status update.
+    """
+
+    @staticmethod
+    def from_kwds(kwds):
+        ttl = kwds.get("status_cache_ttl", None)
+        return StatusCache(
+            max_entries=int(kwds.get("status_cache_max_entries", DEFAULT_MAX_ENTRIES)),
+            max_bytes=int(kwds.get("status_cache_max_bytes", DEFAULT_MAX_BYTES)),
+            ttl=float(ttl) if ttl is not None else None,
+            spill_directory=kwds.get("status_cache_spill_directory", None),
+        )
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, ttl=None, spill_directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.spill_directory = spill_directory
+        self._lock = threading.RLock()
+        # job_id -> (payload, size, stored), least recently used first.
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # job_ids of updates written to spill_directory.
+        self._spilled = set()
+        if spill_directory:
+            os.makedirs(spill_directory, exist_ok=True)
+            self._load_spill_directory()
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def __setitem__(self, job_id, payload):
+        size = len(json.dumps(payload))
+        with self._lock:
+            self._discard(job_id)
+            self._entries[job_id] = (payload, size, time.time())
+            self._bytes += size
+            self._evict()
+
+    def __getitem__(self, job_id):
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is not None:
+                if self._expired(entry[2]):
+                    self._discard(job_id)
+                    raise KeyError(job_id)
+                self._entries.move_to_end(job_id)
+                return entry[0]
+            if job_id in self._spilled:
+                return self._load_spilled(job_id)
+        raise KeyError(job_id)
+
+    def __delitem__(self, job_id):
+        with self._lock:
+            if job_id not in self._entries and job_id not in self._spilled:
+                raise KeyError(job_id)
+            self._discard(job_id)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._entries) + list(self._spilled))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries) + len(self._spilled)
+
+    def __contains__(self, job_id):
+        with self._lock:
+            return job_id in self._entries or job_id in self._spilled
+
+    def _expired(self, stored):
+        return self.ttl is not None and stored < time.time() - self.ttl
+
+    def _discard(self, job_id):
+        # Caller must hold self._lock.
+        entry = self._entries.pop(job_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+        if job_id in self._spilled:
+            self._spilled.discard(job_id)
+            try:
+                os.unlink(self._spill_path(job_id))
+            except OSError:
+                pass
+
+    def _evict(self):
+        # Caller must hold self._lock. The update just stored is never evicted.
+        for job_id in list(self._entries)[:-1]:
+            if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+                break
+            payload, size, stored = self._entries[job_id]
+            expired = self._expired(stored)
+            if not self.spill_directory and not expired and is_job_done(payload.get("status")):
+                # Only place the final status of this job is kept.
+                continue
+            del self._entries[job_id]
+            self._bytes -= size
+            if self.spill_directory and not expired:
+                self._spill(job_id, payload, stored)
+
+    def _spill(self, job_id, payload, stored):
+        path = self._spill_path(job_id)
+        try:
+            with open(path, "w") as fh:
+                json.dump({"job_id": job_id, "stored": stored, "payload": payload}, fh)
+        except (OSError, TypeError, ValueError):
+            log.exception("Failed to spill status of job %s to %s, dropping it" % (job_id, path))
+            return
+        self._spilled.add(job_id)
+
+    def _load_spilled(self, job_id):
+        try:
+            with open(self._spill_path(job_id)) as fh:
+                record = json.load(fh)
+        except (OSError, ValueError):
+            log.exception("Failed to read spilled status of job %s" % job_id)
+            self._spilled.discard(job_id)
+            raise KeyError(job_id)
+        if self._expired(record["stored"]):
+            self._discard(job_id)
+            raise KeyError(job_id)
+        return record["payload"]
+
+    def _load_spill_directory(self):
+        # Updates spilled by a previous process, dropping any since expired.
+        for name in os.listdir(self.spill_directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.spill_directory, name)
+            try:
+                with open(path) as fh:
+                    record = json.load(fh)
+                job_id, stored = record["job_id"], record["stored"]
+            except (OSError, ValueError, KeyError, TypeError):
+                log.exception("Failed to read spilled status %s, removing it" % path)
+                job_id, stored = None, None
+            if job_id is None or self._expired(stored) or path != self._spill_path(job_id):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                continue
+            self._spilled.add(job_id)
+
+    def _spill_path(self, job_id):
+        name = hashlib.sha1(str(job_id).encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_directory, "%s.json" % name)
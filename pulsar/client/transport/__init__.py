@@ -4,6 +4,7 @@ from .curl import (
     curl_available,
     PycurlTransport,
 )
+from .requests import RequestsTransport
 from .ssh import (
     rsync_get_file,
     rsync_post_file,
@@ -30,6 +31,8 @@ def get_transport(transport_type=None, os_module=os, transport_params=None):
         transport_params = {}
     if transport_type == 'urllib':
         transport = UrllibTransport(**transport_params)
+    elif transport_type == 'requests':
+        transport = RequestsTransport(**transport_params)
     else:
         transport = PycurlTransport(**transport_params)
     return transport
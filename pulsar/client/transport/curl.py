@@ -1,12 +1,17 @@
 import io
 import logging
 import os.path
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
 
 import requests
 try:
     import pycurl
     from pycurl import (
         Curl,
+        CurlShare,
         error,
         HTTP_CODE,
     )
@@ -15,6 +20,7 @@ except ImportError:
     curl_available = False
 
 from ..exceptions import PulsarClientTransportError
+from ..util import BUFFER_SIZE
 
 PYCURL_UNAVAILABLE_MESSAGE = \
     "You are attempting to use the Pycurl version of the Pulsar client but pycurl is unavailable."
@@ -23,24 +29,128 @@ NO_SUCH_FILE_MESSAGE = "Attempt to post file %s to URL %s, but file does not exi
 POST_FAILED_MESSAGE = "Failed to post_file properly for url %s, remote server returned status code of %s."
 GET_FAILED_MESSAGE = "Failed to get_file properly for url %s, remote server returned status code of %s."
 
+# Number of idle Curl handles (each holding its keep-alive connections) kept
+# per host and how many seconds they may stay idle, 0 disables pooling.
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_IDLE_TIMEOUT = 60
+# Largest receive buffer every supported libcurl version accepts.
+CURL_MAX_BUFFER_SIZE = 512 * 1024
+
 log = logging.getLogger(__name__)
 
 
+class CurlHandlePool:
+    """ Thread-safe pool of Curl handles, keyed by scheme and host.
+
+    Reusing a handle reuses its open connections, and all handles share DNS
+    lookups and TLS sessions, so a series of requests to the same Pulsar
+    server doesn't pay for a new TCP and TLS handshake each time.
+    """
+
+    def __init__(self, max_per_host=DEFAULT_POOL_SIZE, idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # (scheme, netloc) -> list of (curl, time released), most recent last.
+        self._idle = {}
+        self._share = None
+
+    @contextmanager
+    def handle(self, url):
+        """ Yield a Curl handle with its URL set to ``url``, returning it to
+        the pool afterwards unless the request raised.
+        """
+        key = _pool_key(url)
+        c = self._acquire(key)
+        try:
+            c.setopt(c.URL, url.encode('ascii'))
+            c.setopt(c.BUFFERSIZE, min(BUFFER_SIZE, CURL_MAX_BUFFER_SIZE))
+            yield c
+        except BaseException:
+            c.close()
+            raise
+        self._release(key, c)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for handles in idle.values():
+            for c, _ in handles:
+                c.close()
+
+    def _acquire(self, key):
+        now = time.monotonic()
+        c = None
+        expired = []
+        with self._lock:
+            handles = self._idle.get(key, [])
+            while handles:
+                candidate, released = handles.pop()
+                if now - released <= self.idle_timeout:
+                    c = candidate
+                    break
+                expired.append(candidate)
+        for candidate in expired:
+            candidate.close()
+        if c is None:
+            c = _new_curl_object()
+        c.setopt(c.SHARE, self._get_share())
+        return c
+
+    def _release(self, key, c):
+        if self.max_per_host <= 0:
+            c.close()
+            return
+        c.unsetopt(c.SHARE)
+        c.reset()
+        with self._lock:
+            handles = self._idle.setdefault(key, [])
+            if len(handles) < self.max_per_host:
+                handles.append((c, time.monotonic()))
+                return
+        c.close()
+
+    def _get_share(self):
+        with self._lock:
+            if self._share is None:
+                self._share = CurlShare()
+                self._share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+                self._share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+            return self._share
+
+
 class PycurlTransport:
 
-    def __init__(self, timeout=None, **kwrgs):
+    def __init__(self, timeout=None, pool_size=None, pool_idle_timeout=None, **kwrgs):
         self.timeout = timeout
+        if pool_size is None and pool_idle_timeout is None:
+            self.pool = _default_pool()
+        else:
+            self.pool = CurlHandlePool(
+                max_per_host=int(pool_size if pool_size is not None else DEFAULT_POOL_SIZE),
+                idle_timeout=float(pool_idle_timeout if pool_idle_timeout is not None else DEFAULT_POOL_IDLE_TIMEOUT),
+            )
 
     def execute(self, url, method=None, data=None, input_path=None, output_path=None):
         buf = _open_output(output_path)
         try:
-            c = _new_curl_object_for_url(url)
+            with self.pool.handle(url) as c:
+                self._perform(c, buf, method, data, input_path)
+            if not output_path:
+                return buf.getvalue()
+        finally:
+            buf.close()
+
+    def _perform(self, c, buf, method, data, input_path):
+        input = None
+        try:
             c.setopt(c.WRITEFUNCTION, buf.write)
             if method:
                 c.setopt(c.CUSTOMREQUEST, method)
             if input_path:
+                input = open(input_path, 'rb')
                 c.setopt(c.UPLOAD, 1)
-                c.setopt(c.READFUNCTION, open(input_path, 'rb').read)
+                c.setopt(c.READFUNCTION, input.read)
                 filesize = os.path.getsize(input_path)
                 c.setopt(c.INFILESIZE, filesize)
             if data:
@@ -57,10 +167,9 @@ class PycurlTransport:
                     _error_curl_to_pulsar(exc.args[0]),
                     transport_code=exc.args[0],
                     transport_message=exc.args[1])
-            if not output_path:
-                return buf.getvalue()
         finally:
-            buf.close()
+            if input is not None:
+                input.close()
 
 
 def post_file(url, path):
@@ -69,10 +178,10 @@ def post_file(url, path):
         # wrap it in a better one.
         message = NO_SUCH_FILE_MESSAGE % (path, url)
         raise Exception(message)
-    c = _new_curl_object_for_url(url)
-    c.setopt(c.HTTPPOST, [("file", (c.FORM_FILE, path.encode('ascii')))])
-    c.perform()
-    status_code = int(c.getinfo(HTTP_CODE))
+    with _default_pool().handle(url) as c:
+        c.setopt(c.HTTPPOST, [("file", (c.FORM_FILE, path.encode('ascii')))])
+        c.perform()
+        status_code = int(c.getinfo(HTTP_CODE))
     if status_code != 200:
         raise PulsarClientTransportError(
             transport_code=status_code,
@@ -113,13 +222,13 @@ def get_file(url, path: str):
         # definitely a new download
         buf = _open_output(path)
     try:
-        c = _new_curl_object_for_url(url)
-        c.setopt(c.WRITEFUNCTION, buf.write)
-        if size > 0:
-            log.info('transfer of %s will resume at %s bytes', url, size)
-            c.setopt(c.RESUME_FROM, size)
-        c.perform()
-        status_code = int(c.getinfo(HTTP_CODE))
+        with _default_pool().handle(url) as c:
+            c.setopt(c.WRITEFUNCTION, buf.write)
+            if size > 0:
+                log.info('transfer of %s will resume at %s bytes', url, size)
+                c.setopt(c.RESUME_FROM, size)
+            c.perform()
+            status_code = int(c.getinfo(HTTP_CODE))
         if status_code not in success_codes:
             raise PulsarClientTransportError(
                 transport_code=status_code,
@@ -133,10 +242,28 @@ def _open_output(output_path, mode='wb'):
     return open(output_path, mode) if output_path else io.BytesIO()
 
 
-def _new_curl_object_for_url(url):
-    c = _new_curl_object()
-    c.setopt(c.URL, url.encode('ascii'))
-    return c
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _default_pool():
+    """ Pool shared by module level functions and transports not configured
+    with their own, sized by ``PULSAR_CURL_POOL_SIZE`` and
+    ``PULSAR_CURL_POOL_IDLE_TIMEOUT``.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CurlHandlePool(
+                max_per_host=int(os.environ.get("PULSAR_CURL_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                idle_timeout=float(os.environ.get("PULSAR_CURL_POOL_IDLE_TIMEOUT", DEFAULT_POOL_IDLE_TIMEOUT)),
+            )
+        return _pool
+
+
+def _pool_key(url):
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc
 
 
 def _new_curl_object():
@@ -155,6 +282,7 @@ def _error_curl_to_pulsar(code):
 
 
 __all__ = [
+    'CurlHandlePool',
     'PycurlTransport',
     'post_file',
     'get_file'
@@ -1,6 +1,12 @@
+"""
+Pulsar HTTP Client layer based on requests, reusing connections through a
+``requests.Session`` per thread.
+"""
 import logging
+import threading
 
 import requests
+from requests.adapters import HTTPAdapter
 
 try:
     import requests_toolbelt
@@ -8,16 +14,115 @@ except ImportError:
     requests_toolbelt = None  # type: ignore
 
 
+from ..exceptions import PulsarClientTransportError
+from ..util import BUFFER_SIZE
+
+# Connections kept open per host by each thread's session.
+DEFAULT_POOL_SIZE = 4
+# Log connection reuse statistics every this many requests of a session.
+REUSE_LOG_INTERVAL = 100
+
 log = logging.getLogger(__name__)
 
 
+class SessionPool:
+    """ Hand out a ``requests.Session`` per thread, with connection pools of
+    ``pool_size`` connections per host.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        self.pool_size = pool_size
+        self._local = threading.local()
+
+    def session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+            self._local.requests = 0
+        self._local.requests += 1
+        if log.isEnabledFor(logging.DEBUG) and self._local.requests % REUSE_LOG_INTERVAL == 0:
+            requests_made, connections = connection_stats(session)
+            log.debug(
+                "requests session of thread %s opened %d connections for %d requests (%.0f%% reused)",
+                threading.current_thread().name, connections, requests_made,
+                100.0 * (requests_made - connections) / requests_made if requests_made else 0.0,
+            )
+        return session
+
+
+def connection_stats(session):
+    """ Return the number of requests made and connections opened by ``session``.
+    """
+    requests_made = 0
+    connections = 0
+    for adapter in set(session.adapters.values()):
+        for key in list(adapter.poolmanager.pools.keys()):
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is not None:
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+    return requests_made, connections
+
+
+_sessions = SessionPool()
+
+
+class RequestsTransport:
+    """ Transport executing requests through a per thread ``requests.Session``,
+    keeping connections to Pulsar alive between requests.
+    """
+
+    def __init__(self, timeout=None, pool_size=None, **kwrgs):
+        self.timeout = float(timeout) if timeout is not None else None
+        self.sessions = _sessions if pool_size is None else SessionPool(int(pool_size))
+
+    def execute(self, url, method=None, data=None, input_path=None, output_path=None):
+        input = None
+        try:
+            if input_path:
+                input = open(input_path, 'rb')
+                data = input
+            if not method:
+                method = "POST" if data is not None else "GET"
+            try:
+                response = self.sessions.session().request(
+                    method, url, data=data, timeout=self.timeout, stream=bool(output_path)
+                )
+            except requests.Timeout:
+                raise PulsarClientTransportError(code=PulsarClientTransportError.TIMEOUT)
+            except requests.ConnectionError as exc:
+                raise PulsarClientTransportError(
+                    code=PulsarClientTransportError.CONNECTION_REFUSED,
+                    transport_message=str(exc),
+                )
+        finally:
+            if input:
+                input.close()
+        if response.status_code >= 400:
+            raise PulsarClientTransportError(
+                transport_code=response.status_code,
+                transport_message=response.reason,
+            )
+        if output_path:
+            with open(output_path, 'wb') as output:
+                for chunk in response.iter_content(chunk_size=BUFFER_SIZE):
+                    output.write(chunk)
+            return response
+        else:
+            return response.content
+
+
 def post_file(url, path):
     if requests_toolbelt is not None:
         # Streaming multipart upload — avoids loading the whole file into memory.
         m = requests_toolbelt.MultipartEncoder(
             fields={'file': ('filename', open(path, 'rb'))}
         )
-        response = requests.post(url, data=m, headers={'Content-Type': m.content_type})
+        response = _sessions.session().post(url, data=m, headers={'Content-Type': m.content_type})
     else:
         log.warning(
             "Posting %s without requests_toolbelt: the entire file will be loaded into memory. "
@@ -25,15 +130,14 @@ def post_file(url, path):
             path,
         )
         with open(path, 'rb') as f:
-            response = requests.post(url, files={'file': f})
+            response = _sessions.session().post(url, files={'file': f})
     response.raise_for_status()
 
 
 def get_file(url, path):
-    r = requests.get(url, stream=True)
+    r = _sessions.session().get(url, stream=True)
     r.raise_for_status()
     with open(path, 'wb') as f:
-        for chunk in r.iter_content(chunk_size=1024):
+        for chunk in r.iter_content(chunk_size=BUFFER_SIZE):
             if chunk:
                 f.write(chunk)
-                f.flush()
@@ -16,6 +16,7 @@ from urllib.request import (
 )
 
 from ..exceptions import PulsarClientTransportError
+from ..util import copy_stream
 
 
 class UrllibTransport:
@@ -58,11 +59,7 @@ class UrllibTransport:
                 input.close()
         if output_path:
             with open(output_path, 'wb') as output:
-                while True:
-                    buffer = response.read(1024)
-                    if not buffer:
-                        break
-                    output.write(buffer)
+                copy_stream(response, output)
             return response
         else:
             return response.read()
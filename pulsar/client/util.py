@@ -1,7 +1,10 @@
 import hashlib
+import heapq
 import json
 import os.path
 import shutil
+import sqlite3
+import time
 from base64 import (
     b64decode as _b64decode,
     b64encode as _b64encode,
@@ -16,6 +19,7 @@ from os import (
     curdir,
     listdir,
     makedirs,
+    rmdir,
     unlink,
     walk,
 )
@@ -31,9 +35,10 @@ from threading import (
 )
 from weakref import WeakValueDictionary
 
-# TODO: move to galaxy.util so it doesn't have to be duplicated
-# twice in pulsar.
-BUFFER_SIZE = 4096
+# Size of the blocks files are read, written and streamed over HTTP in by
+# copy_to_path, the client transports and Pulsar's file downloads.
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+BUFFER_SIZE = int(os.getenv('PULSAR_BUFFER_SIZE', DEFAULT_BUFFER_SIZE))
 
 
 def copy_to_path(object, path):
@@ -46,15 +51,37 @@ def copy_to_path(object, path):
 
 def _copy_and_close(object, output):
     try:
-        while True:
-            buffer = object.read(BUFFER_SIZE)
-            if not buffer:
-                break
-            output.write(buffer)
+        copy_stream(object, output)
     finally:
         output.close()
 
 
+def copy_stream(input, output, buffer_size=None):
+    """
+    Copy file-like object ``input`` to ``output`` in ``buffer_size`` blocks,
+    reading into a single reused buffer if ``input`` supports ``readinto``.
+    Returns the number of bytes copied.
+    """
+    buffer_size = buffer_size or BUFFER_SIZE
+    copied = 0
+    readinto = getattr(input, "readinto", None)
+    if readinto is None:
+        while True:
+            data = input.read(buffer_size)
+            if not data:
+                return copied
+            output.write(data)
+            copied += len(data)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    while True:
+        read = readinto(buffer)
+        if not read:
+            return copied
+        output.write(view[:read])
+        copied += read
+
+
 # Variant of base64 compat layer inspired by BSD code from Bcfg2
 # https://github.com/Bcfg2/bcfg2/blob/maint/src/lib/Bcfg2/Compat.py
 @wraps(_b64encode)
@@ -316,6 +343,131 @@ class MessageQueueUUIDStore:
             raise
 
 
+class IndexedMessageQueueUUIDStore:
+    """Drop-in alternative to :class:`MessageQueueUUIDStore` keeping all UUIDs
+    in a single SQLite file (``<subdirs>.sqlite``) with their times indexed in
+    memory - so ``due`` and ``expire`` only visit UUIDs older than the given
+    cutoff instead of listing and stat'ing every stored UUID.
+
+    UUIDs left in the directory of a MessageQueueUUIDStore with the same
+    ``subdirs`` are imported on startup.
+    """
+
+    def __init__(self, persistence_directory, subdirs=None):
+        if subdirs is None:
+            subdirs = ['acknowledge_uuids']
+        directory = abspath(join(persistence_directory, *subdirs))
+        # Creates the parent directory, the SQLite file is a sibling of the
+        # directory used by MessageQueueUUIDStore.
+        ensure_directory(directory)
+        self.path = directory + ".sqlite"
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS uuids (uuid TEXT PRIMARY KEY, value TEXT NOT NULL, time REAL NOT NULL)")
+        self.__import_directory(directory)
+        self.__times = dict(self.__connection.execute("SELECT uuid, time FROM uuids"))
+        # (time, uuid) - entries whose time has since changed are skipped and
+        # dropped lazily.
+        self.__heap = [(t, key) for key, t in self.__times.items()]
+        heapq.heapify(self.__heap)
+
+    def __contains__(self, item):
+        return item in self.__times
+
+    def __setitem__(self, key, value):
+        with self.__lock:
+            now = time.time()
+            self.__connection.execute("INSERT OR REPLACE INTO uuids (uuid, value, time) VALUES (?, ?, ?)", (key, json.dumps(value), now))
+            self.__set_time(key, now)
+
+    def __getitem__(self, key):
+        with self.__lock:
+            row = self.__connection.execute("SELECT value FROM uuids WHERE uuid = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __delitem__(self, key):
+        with self.__lock:
+            if key not in self.__times:
+                raise KeyError(key)
+            self.__connection.execute("DELETE FROM uuids WHERE uuid = ?", (key,))
+            del self.__times[key]
+
+    def keys(self):
+        return iter(list(self.__times))
+
+    def get_time(self, key):
+        return self.__times[key]
+
+    def set_time(self, key):
+        with self.__lock:
+            if key not in self.__times:
+                raise KeyError(key)
+            now = time.time()
+            self.__connection.execute("UPDATE uuids SET time = ? WHERE uuid = ?", (now, key))
+            self.__set_time(key, now)
+
+    def due(self, before):
+        """Return the UUIDs last set before ``before``, oldest first."""
+        with self.__lock:
+            due = list(self.__pop_before(before))
+            for entry in due:
+                heapq.heappush(self.__heap, entry)
+        return [key for _, key in due]
+
+    def expire(self, before):
+        """Delete the UUIDs last set before ``before``, returning how many."""
+        with self.__lock:
+            expired = [key for _, key in self.__pop_before(before)]
+            for key in expired:
+                del self.__times[key]
+            self.__connection.executemany("DELETE FROM uuids WHERE uuid = ?", [(key,) for key in expired])
+        return len(expired)
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def __pop_before(self, before):
+        # Caller must hold self.__lock.
+        while self.__heap and self.__heap[0][0] < before:
+            t, key = heapq.heappop(self.__heap)
+            if self.__times.get(key) == t:
+                yield t, key
+
+    def __set_time(self, key, now):
+        # Caller must hold self.__lock.
+        self.__times[key] = now
+        heapq.heappush(self.__heap, (now, key))
+        if len(self.__heap) > 2 * len(self.__times) + 64:
+            self.__heap = [(t, key) for key, t in self.__times.items()]
+            heapq.heapify(self.__heap)
+
+    def __import_directory(self, directory):
+        if not exists(directory):
+            return
+        rows = []
+        for key in listdir(directory):
+            path = join(directory, key)
+            try:
+                with open(path) as fh:
+                    value = fh.read()
+                rows.append((key, value, os.stat(path).st_mtime))
+            except OSError:
+                continue
+        if rows:
+            self.__connection.executemany("INSERT OR IGNORE INTO uuids (uuid, value, time) VALUES (?, ?, ?)", rows)
+            for key, _, _ in rows:
+                unlink(join(directory, key))
+        try:
+            rmdir(directory)
+        except OSError:
+            pass
+
+
 class ExternalId:
     external_id: str
 
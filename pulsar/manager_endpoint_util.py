@@ -2,6 +2,7 @@
 and message queue.
 """
 
+import json
 import logging
 import os
 
@@ -13,11 +14,15 @@ from pulsar.managers import (
     PULSAR_UNKNOWN_RETURN_CODE,
     status,
 )
+from pulsar.managers.base import JOB_FILE_FINAL_STATUS_PAYLOAD
 from pulsar.managers.staging import realized_dynamic_file_sources
 from pulsar.managers.stateful import ACTIVE_STATUS_PREPROCESSING
 
 log = logging.getLogger(__name__)
 
+# Final statuses whose payload can't change until the job is cleaned.
+CACHED_PAYLOAD_STATUSES = [status.COMPLETE, status.FAILED, status.CANCELLED]
+
 
 def status_dict(manager, job_id):
     job_status = manager.get_status(job_id)
@@ -25,13 +30,38 @@ def status_dict(manager, job_id):
 
 
 def full_status(manager, job_status, job_id):
-    if status.is_job_done(job_status):
+    if job_status in CACHED_PAYLOAD_STATUSES:
+        full_status = __cached_job_complete_dict(job_status, manager, job_id)
+    elif status.is_job_done(job_status):
         full_status = __job_complete_dict(job_status, manager, job_id)
     else:
         full_status = {"complete": "false", "status": job_status, "job_id": job_id}
     return full_status
 
 
+def __cached_job_complete_dict(complete_status, manager, job_id):
+    """ Build the final dictionary of a finished job once and serve it from
+    its job directory afterwards - avoiding rereading the job's standard output
+    and error and walking its directories every time its status is requested.
+    """
+    job_directory = manager.job_directory(job_id)
+    contents = job_directory.read_file(JOB_FILE_FINAL_STATUS_PAYLOAD, default=b"")
+    if contents:
+        try:
+            as_dict = json.loads(contents.decode("utf-8"))
+        except ValueError:
+            log.warning("Ignoring unreadable final status payload of job %s" % job_id)
+        else:
+            if as_dict.get("status") == complete_status:
+                return as_dict
+    as_dict = __job_complete_dict(complete_status, manager, job_id)
+    try:
+        job_directory.write_file(JOB_FILE_FINAL_STATUS_PAYLOAD, json.dumps(as_dict))
+    except (OSError, TypeError, ValueError):
+        log.exception("Failed to store final status payload of job %s" % job_id)
+    return as_dict
+
+
 def __job_complete_dict(complete_status, manager, job_id):
     """ Build final dictionary describing completed job for consumption by
     Pulsar client.
@@ -92,6 +122,7 @@ def submit_job(manager, job_config):
         touch_outputs = job_config.get('touch_outputs', [])
         dynamic_file_sources = job_config.get("dynamic_file_sources", None)
         token_endpoint = job_config.get("token_endpoint", None)
+        submitter = job_config.get("submitter", None)
 
         job_config = None
         if setup_params or force_setup:
@@ -121,6 +152,7 @@ def submit_job(manager, job_config):
             "setup_params": setup_params,
             "dynamic_file_sources": dynamic_file_sources,
             "token_endpoint": token_endpoint,
+            "submitter": submitter,
         }
         manager.preprocess_and_launch(job_id, launch_config)
     except Exception:
@@ -7,6 +7,8 @@ import json
 import logging
 import os
 import platform
+import threading
+from collections import OrderedDict
 from os import (
     curdir,
     getenv,
@@ -31,6 +33,8 @@ from pulsar.client.job_directory import (
     RemoteJobDirectory,
 )
 from pulsar.managers import ManagerInterface
+from pulsar.managers.executors import ManagerExecutors
+from pulsar.managers.job_state_db import JobStateDatabase
 
 JOB_DIRECTORY_INPUTS = "inputs"
 JOB_DIRECTORY_OUTPUTS = "outputs"
@@ -41,6 +45,30 @@ JOB_DIRECTORY_TOOL_FILES = "tool_files"
 
 DEFAULT_ID_ASSIGNER = "galaxy"
 
+DEFAULT_METADATA_BACKEND = "files"
+# Number of jobs whose metadata the consolidated backend caches.
+DEFAULT_METADATA_CACHE_SIZE = 1000
+# Status payload of a finished job, see manager_endpoint_util.full_status.
+JOB_FILE_FINAL_STATUS_PAYLOAD = "final_status_payload.json"
+JOB_FILE_METADATA = "job_metadata.json"
+# Metadata written by Pulsar's managers as individual files, these are
+# imported into the consolidated file the first time a job written before
+# switching backends is updated.
+LEGACY_METADATA_NAMES = [
+    "launch_config",
+    "preprocessed",
+    "preprocessing_failed",
+    "running",
+    "final_status",
+    "postprocessed",
+    "submitted",
+    "pid",
+    "external_id",
+    "cancelled",
+    "tool_id",
+    "tool_version",
+]
+
 ID_ASSIGNER = {
     # Generate a random id, needed if multiple
     # Galaxy instances submitting to same Pulsar.
@@ -68,6 +96,12 @@ class BaseManager(ManagerInterface):
         staging_directory = kwds.get("staging_directory", app.staging_directory)
         self._setup_staging_directory(staging_directory)
         self.id_assigner = get_id_assigner(kwds.get("assign_ids", None))
+        self.metadata_store = build_metadata_store(
+            kwds.get("metadata_backend", DEFAULT_METADATA_BACKEND),
+            int(kwds.get("metadata_cache_size", DEFAULT_METADATA_CACHE_SIZE)),
+        )
+        self.job_state_db = JobStateDatabase.from_manager_options(name, self.persistence_directory, **kwds)
+        self.executors = ManagerExecutors.from_manager_options(name, **kwds)
         self.maximum_stream_size = kwds.get("maximum_stream_size", -1)
         self.__init_galaxy_system_properties(kwds)
         self.tmp_dir = kwds.get("tmp_dir", None)
@@ -85,20 +119,27 @@ class BaseManager(ManagerInterface):
         return platform.system().lower() == "windows"
 
     def clean(self, job_id):
+        job_directory = self._job_directory(job_id)
         if self.debug:
-            # In debug mode skip cleaning job directories.
+            # In debug mode skip cleaning job directories, but don't serve
+            # a stale payload if the job is rerun.
+            job_directory.remove_file(JOB_FILE_FINAL_STATUS_PAYLOAD)
             return
 
-        job_directory = self._job_directory(job_id)
         if job_directory.exists():
             try:
                 job_directory.delete()
             except Exception:
                 pass
+        if self.job_state_db:
+            self.job_state_db.delete_job(job_id)
 
     def system_properties(self):
         return self.__system_properties
 
+    def shutdown(self, timeout=None):
+        self.executors.shutdown(timeout)
+
     def __init_galaxy_system_properties(self, kwds):
         self.galaxy_home = kwds.get('galaxy_home', None)
         self.galaxy_virtual_env = kwds.get('galaxy_virtual_env', None)
@@ -157,6 +198,7 @@ class BaseManager(ManagerInterface):
             job_id,
             self.lock_manager,
             self._directory_maker,
+            self.metadata_store,
         )
 
     job_directory = _job_directory
@@ -234,10 +276,12 @@ class JobDirectory(RemoteJobDirectory):
         staging_directory,
         job_id,
         lock_manager=None,
-        directory_maker=None
+        directory_maker=None,
+        metadata_store=None,
     ):
         super().__init__(staging_directory, remote_id=job_id, remote_sep=sep)
         self._directory_maker = directory_maker or DirectoryMaker()
+        self._metadata_store = metadata_store or FileMetadataStore()
         self.lock_manager = lock_manager
         # Assert this job id isn't hacking path somehow.
         assert job_id == basename(job_id)
@@ -298,6 +342,7 @@ class JobDirectory(RemoteJobDirectory):
         return os.path.exists(self.path)
 
     def delete(self):
+        self._metadata_store.forget(self)
         return rmtree(self.path)
 
     def setup(self):
@@ -356,21 +401,155 @@ class JobDirectory(RemoteJobDirectory):
 
     # Following abstractions store metadata related to jobs.
     def store_metadata(self, metadata_name, metadata_value):
-        self.write_file(metadata_name, json.dumps(metadata_value))
+        self._metadata_store.store(self, metadata_name, metadata_value)
 
     def load_metadata(self, metadata_name, default=None):
+        return self._metadata_store.load(self, metadata_name, default)
+
+    def has_metadata(self, metadata_name):
+        return self._metadata_store.has(self, metadata_name)
+
+    def remove_metadata(self, metadata_name):
+        self._metadata_store.remove(self, metadata_name)
+
+
+def build_metadata_store(metadata_backend, cache_size=DEFAULT_METADATA_CACHE_SIZE):
+    if metadata_backend == "files":
+        return FileMetadataStore()
+    elif metadata_backend == "consolidated":
+        return ConsolidatedMetadataStore(cache_size)
+    else:
+        raise Exception("Unknown metadata_backend [%s]" % metadata_backend)
+
+
+class FileMetadataStore:
+    """ Store each piece of job metadata as JSON in its own file of the job
+    directory.
+    """
+
+    def store(self, job_directory, metadata_name, metadata_value):
+        job_directory.write_file(metadata_name, json.dumps(metadata_value))
+
+    def load(self, job_directory, metadata_name, default=None):
         DEFAULT_RAW = object()
-        contents = self.read_file(metadata_name, default=DEFAULT_RAW)
+        contents = job_directory.read_file(metadata_name, default=DEFAULT_RAW)
         if contents is DEFAULT_RAW:
             return default
         else:
             return json.loads(contents.decode())
 
-    def has_metadata(self, metadata_name):
-        return self.contains_file(metadata_name)
-
-    def remove_metadata(self, metadata_name):
-        self.remove_file(metadata_name)
+    def has(self, job_directory, metadata_name):
+        return job_directory.contains_file(metadata_name)
+
+    def remove(self, job_directory, metadata_name):
+        job_directory.remove_file(metadata_name)
+
+    def forget(self, job_directory):
+        pass
+
+
+class ConsolidatedMetadataStore(FileMetadataStore):
+    """ Store all metadata for a job in a single JSON file of the job
+    directory and cache its parsed contents in memory.
+
+    The cache is revalidated with a single stat of that file, so one status
+    check costs at most one stat and one read. It holds the metadata of the
+    ``cache_size`` most recently used jobs - jobs whose directories are kept
+    or removed behind the manager's back are eventually evicted. Jobs without
+    this file (i.e. created before switching backends) are read from the
+    per-key files, and imported on their first metadata update.
+    """
+
+    def __init__(self, cache_size=DEFAULT_METADATA_CACHE_SIZE):
+        self._lock = threading.RLock()
+        self.cache_size = cache_size
+        # path -> ((inode, mtime, size), metadata), least recently used first.
+        self._cache = OrderedDict()
+
+    def store(self, job_directory, metadata_name, metadata_value):
+        with self._lock:
+            metadata = self._read(job_directory)
+            if metadata is None:
+                metadata = self._import_legacy(job_directory)
+            metadata = dict(metadata)
+            metadata[metadata_name] = metadata_value
+            self._write(job_directory, metadata)
+
+    def load(self, job_directory, metadata_name, default=None):
+        metadata = self._read(job_directory)
+        if metadata is None:
+            return super().load(job_directory, metadata_name, default)
+        return metadata.get(metadata_name, default)
+
+    def has(self, job_directory, metadata_name):
+        metadata = self._read(job_directory)
+        if metadata is None:
+            return super().has(job_directory, metadata_name)
+        return metadata_name in metadata
+
+    def remove(self, job_directory, metadata_name):
+        with self._lock:
+            metadata = self._read(job_directory)
+            if metadata is None:
+                super().remove(job_directory, metadata_name)
+            elif metadata_name in metadata:
+                metadata = dict(metadata)
+                del metadata[metadata_name]
+                self._write(job_directory, metadata)
+
+    def forget(self, job_directory):
+        with self._lock:
+            self._cache.pop(self._path(job_directory), None)
+
+    def _path(self, job_directory):
+        return job_directory._job_file(JOB_FILE_METADATA)
+
+    def _read(self, job_directory):
+        # Returns None if the job has no consolidated metadata file, callers
+        # must not modify the returned dictionary.
+        path = self._path(job_directory)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.forget(job_directory)
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == key:
+                self._cache.move_to_end(path)
+                return cached[1]
+        with open(path) as f:
+            metadata = json.load(f)
+        self._cache_metadata(path, key, metadata)
+        return metadata
+
+    def _write(self, job_directory, metadata):
+        path = self._path(job_directory)
+        tmp_path = "%s.tmp" % path
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(tmp_path, path)
+        stat = os.stat(path)
+        self._cache_metadata(path, (stat.st_ino, stat.st_mtime_ns, stat.st_size), metadata)
+
+    def _cache_metadata(self, path, key, metadata):
+        with self._lock:
+            self._cache[path] = (key, metadata)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _import_legacy(self, job_directory):
+        metadata = {}
+        for metadata_name in LEGACY_METADATA_NAMES:
+            if super().has(job_directory, metadata_name):
+                try:
+                    metadata[metadata_name] = super().load(job_directory, metadata_name)
+                except ValueError:
+                    # Marker files such as postprocessed were written empty.
+                    metadata[metadata_name] = True
+        return metadata
 
 
 class DirectoryMaker:
@@ -108,6 +108,8 @@ class DirectoryBaseManager(BaseManager):
         return_code_str = self._read_job_file(job_id, JOB_FILE_RETURN_CODE, default=PULSAR_UNKNOWN_RETURN_CODE)
         if return_code_str == PULSAR_UNKNOWN_RETURN_CODE:
             self._write_job_file(job_id, JOB_FILE_RETURN_CODE, str(return_code))
+            if self.job_state_db:
+                self.job_state_db.record_return_code(job_id, int(return_code))
 
     def _write_tool_info(self, job_id, tool_id, tool_version):
         job_directory = self._job_directory(job_id)
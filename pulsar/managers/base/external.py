@@ -1,4 +1,6 @@
 import logging
+import threading
+from contextlib import contextmanager
 from string import Template
 
 from pulsar.managers import status
@@ -19,6 +21,8 @@ class ExternalBaseManager(DirectoryBaseManager):
     def __init__(self, name, app, **kwds):
         super().__init__(name, app, **kwds)
         self._external_ids = {}
+        self._status_sweep_lock = threading.Lock()
+        self._status_sweep_statuses = None
         self.job_name_template = kwds.get('job_name_template', DEFAULT_JOB_NAME_TEMPLATE)
 
     def clean(self, job_id):
@@ -40,13 +44,54 @@ class ExternalBaseManager(DirectoryBaseManager):
         if not external_id:
             log.warning("Failed to find external id for job_id %s", job_id)
             return status.LOST
+        swept_status = self._swept_status(external_id)
+        if swept_status is not None:
+            return swept_status
         return self._get_status_external(external_id)
 
+    @contextmanager
+    def status_sweep(self, job_ids):
+        """ Answer ``get_status`` for the supplied jobs from a single bulk
+        query of the external resource manager for the duration of the block.
+
+        Jobs missing from the bulk result (e.g. because they already left the
+        queue) fall back to the per-job status query.
+        """
+        external_ids = [self._external_id(job_id) for job_id in job_ids]
+        external_ids = [external_id for external_id in external_ids if external_id]
+        statuses = None
+        if external_ids:
+            try:
+                statuses = self._get_status_external_bulk(external_ids)
+            except Exception:
+                log.exception("Failed to query status of %d jobs in bulk, falling back to per-job queries", len(external_ids))
+        with self._status_sweep_lock:
+            self._status_sweep_statuses = statuses
+        try:
+            yield
+        finally:
+            with self._status_sweep_lock:
+                self._status_sweep_statuses = None
+
+    def _get_status_external_bulk(self, external_ids):
+        """ Return a dictionary of external id to status for the supplied
+        external ids, or None if this manager cannot query them in bulk.
+        """
+        return None
+
+    def _swept_status(self, external_id):
+        with self._status_sweep_lock:
+            if self._status_sweep_statuses is None:
+                return None
+            return self._status_sweep_statuses.get(external_id)
+
     def _register_external_id(self, job_id, external_id):
         if isinstance(external_id, bytes):
             external_id = external_id.decode("utf-8")
         self._job_directory(job_id).store_metadata(JOB_FILE_EXTERNAL_ID, external_id)
         self._external_ids[job_id] = external_id
+        if self.job_state_db:
+            self.job_state_db.record_external_id(job_id, external_id)
         return external_id
 
     def _external_id(self, job_id):
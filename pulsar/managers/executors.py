@@ -0,0 +1,154 @@
+"""Named, bounded thread pools shared by all jobs of a manager.
+
+Rather than starting a thread per job for each preprocessing and
+postprocessing task, managers submit these tasks to one of a few named pools - sized with the ``<pool>_pool_size`` manager options. Work
+beyond a pool's size waits in that pool's queue, the depth of which is
+reported by ``metrics()``.
+
+The ``preprocess_staging`` pool runs the individual staging actions of jobs
+being preprocessed (when larger than ``1``), so tasks of the ``preprocess``
+pool wait on it rather than on their own pool.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    wait,
+)
+
+log = logging.getLogger(__name__)
+
+POOL_PREPROCESS = "preprocess"
+POOL_POSTPROCESS = "postprocess"
+POOL_PREPROCESS_STAGING = "preprocess_staging"
+
+DEFAULT_POOL_SIZES = {
+    POOL_PREPROCESS: 10,
+    POOL_POSTPROCESS: 10,
+    # By default each job's staging actions run one after another on its
+    # preprocess thread.
+    POOL_PREPROCESS_STAGING: 1,
+}
+
+
+class ManagerExecutors:
+    """ Lazily created thread pools, one per name in ``pool_sizes``.
+    """
+
+    @staticmethod
+    def from_manager_options(manager_name, **manager_options):
+        pool_sizes = {}
+        for pool, default_size in DEFAULT_POOL_SIZES.items():
+            pool_sizes[pool] = int(manager_options.get("%s_pool_size" % pool, default_size))
+        return ManagerExecutors(manager_name, pool_sizes)
+
+    def __init__(self, manager_name, pool_sizes):
+        self.manager_name = manager_name
+        self.pool_sizes = pool_sizes
+        self._lock = threading.Lock()
+        self._executors = {}
+        self._queued = dict.fromkeys(pool_sizes, 0)
+        self._running = dict.fromkeys(pool_sizes, 0)
+        self._futures = set()
+        self._shutdown = False
+        # Set on threads running tasks, which may still submit (nested) work
+        # while shutdown drains the pools.
+        self._task_thread = threading.local()
+
+    def submit(self, pool, target, *args, **kwds):
+        """ Run ``target`` on ``pool`` once a thread is free, returning a Future.
+
+        Exceptions raised by ``target`` are logged.
+        """
+        def run():
+            with self._lock:
+                self._queued[pool] -= 1
+                self._running[pool] += 1
+            self._task_thread.running = True
+            try:
+                return target(*args, **kwds)
+            except Exception:
+                log.exception("Uncaught exception in %s task of manager %s" % (pool, self.manager_name))
+                raise
+            finally:
+                self._task_thread.running = False
+                with self._lock:
+                    self._running[pool] -= 1
+
+        with self._lock:
+            if self._shutdown and not getattr(self._task_thread, "running", False):
+                raise Exception("Cannot submit %s task, manager %s is shutting down" % (pool, self.manager_name))
+            future = self._executor(pool).submit(run)
+            self._queued[pool] += 1
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def metrics(self):
+        """ Return a dictionary describing each pool - its size and the number
+        of tasks queued (waiting for a thread) and running.
+        """
+        with self._lock:
+            return {
+                pool: {
+                    "size": size,
+                    "queue_depth": self._queued[pool],
+                    "running": self._running[pool],
+                }
+                for pool, size in self.pool_sizes.items()
+            }
+
+    def executor(self, pool):
+        """ Return an object submitting tasks to ``pool`` - usable in place of
+        a ``concurrent.futures`` executor.
+        """
+        return _PoolExecutor(self, pool)
+
+    def shutdown(self, timeout=None):
+        """ Stop accepting tasks and wait up to ``timeout`` seconds for queued
+        and running tasks (and any tasks they submit) to finish.
+        """
+        with self._lock:
+            self._shutdown = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                futures = list(self._futures)
+            if not futures:
+                break
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            _, not_done = wait(futures, timeout=remaining)
+            if not_done and remaining is not None and time.monotonic() >= deadline:
+                # Leave the pools running so these tasks can still finish.
+                log.warn("Failed to drain %d tasks of manager %s before shutdown" % (len(not_done), self.manager_name))
+                return
+        with self._lock:
+            executors = list(self._executors.values())
+        for executor in executors:
+            executor.shutdown(wait=False)
+
+    def _executor(self, pool):
+        # Caller must hold self._lock.
+        executor = self._executors.get(pool)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=self.pool_sizes[pool],
+                thread_name_prefix="[manager={}]-[pool={}]".format(self.manager_name, pool),
+            )
+            self._executors[pool] = executor
+        return executor
+
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+
+class _PoolExecutor:
+
+    def __init__(self, executors, pool):
+        self.executors = executors
+        self.pool = pool
+
+    def submit(self, target, *args, **kwds):
+        return self.executors.submit(self.pool, target, *args, **kwds)
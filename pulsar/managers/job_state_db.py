@@ -0,0 +1,197 @@
+"""Optional per-manager SQLite database tracking the state of Pulsar jobs.
+
+Enabled with the ``job_state_database`` manager option, the database lives in
+the persistence directory as ``<manager>-jobs.sqlite``. It records the current
+status of every job (indexed by status and the time it last changed), a
+timestamp for every status transition, the external id and the return code -
+so questions like "how many jobs are postprocessing on this manager" are
+answered by an indexed query rather than by walking the staging directory.
+Operators may query the file directly (it uses SQLite's WAL journal so readers
+don't block Pulsar).
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from galaxy.util import asbool
+
+from pulsar.managers import status
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    external_id TEXT,
+    return_code INTEGER,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_updated ON jobs (status, updated);
+CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated);
+CREATE TABLE IF NOT EXISTS job_transitions (
+    job_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_transitions_job_id ON job_transitions (job_id, time);
+CREATE TABLE IF NOT EXISTS active_jobs (
+    job_id TEXT NOT NULL,
+    active_status TEXT NOT NULL,
+    PRIMARY KEY (active_status, job_id)
+);
+"""
+
+
+class JobStateDatabase:
+    """ Record job states, transitions, external ids and return codes in SQLite.
+
+    All methods are thread safe, write failures are logged rather than raised
+    so the database never interferes with running jobs.
+    """
+
+    @staticmethod
+    def from_manager_options(manager_name, persistence_directory, **manager_options):
+        if not asbool(manager_options.get("job_state_database", False)):
+            return None
+        if not persistence_directory:
+            log.warning("job_state_database requires a persistence_directory, disabling it for manager %s" % manager_name)
+            return None
+        return JobStateDatabase(os.path.join(persistence_directory, "%s-jobs.sqlite" % manager_name))
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        # Last recorded status per job, avoids a query for every status check.
+        self._statuses = dict(self._query("SELECT job_id, status FROM jobs"))
+
+    def record_status(self, job_id, job_status):
+        """ Record ``job_status`` for ``job_id`` if it changed since last recorded.
+        """
+        with self._lock:
+            if self._statuses.get(job_id) == job_status:
+                return
+            now = time.time()
+            try:
+                self._connection.execute("BEGIN")
+                self._connection.execute(
+                    "INSERT INTO jobs (job_id, status, created, updated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (job_id) DO UPDATE SET status = excluded.status, updated = excluded.updated",
+                    (job_id, job_status, now, now),
+                )
+                self._connection.execute(
+                    "INSERT INTO job_transitions (job_id, status, time) VALUES (?, ?, ?)",
+                    (job_id, job_status, now),
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._rollback()
+                log.exception("Failed to record status %s of job %s in %s" % (job_status, job_id, self.path))
+                return
+            self._statuses[job_id] = job_status
+
+    def record_external_id(self, job_id, external_id):
+        self._update_column(job_id, "external_id", external_id)
+
+    def record_return_code(self, job_id, return_code):
+        self._update_column(job_id, "return_code", return_code)
+
+    def delete_job(self, job_id):
+        """ Forget ``job_id`` - its state and transitions - once it is cleaned.
+        """
+        with self._lock:
+            try:
+                self._connection.execute("BEGIN")
+                self._connection.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+                self._connection.execute("DELETE FROM job_transitions WHERE job_id = ?", (job_id,))
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._rollback()
+                log.exception("Failed to delete job %s from %s" % (job_id, self.path))
+            self._statuses.pop(job_id, None)
+
+    def status(self, job_id):
+        with self._lock:
+            return self._statuses.get(job_id)
+
+    def job(self, job_id):
+        """ Return the recorded state of ``job_id`` as a dictionary (or None).
+        """
+        rows = self._query(
+            "SELECT job_id, status, external_id, return_code, created, updated FROM jobs WHERE job_id = ?",
+            (job_id,),
+        )
+        if not rows:
+            return None
+        return dict(zip(["job_id", "status", "external_id", "return_code", "created", "updated"], rows[0]))
+
+    def job_ids(self, job_status, updated_before=None):
+        """ Return ids of jobs in ``job_status`` - least recently updated first.
+        """
+        if updated_before is None:
+            rows = self._query("SELECT job_id FROM jobs WHERE status = ? ORDER BY updated", (job_status,))
+        else:
+            rows = self._query(
+                "SELECT job_id FROM jobs WHERE status = ? AND updated < ? ORDER BY updated",
+                (job_status, updated_before),
+            )
+        return [row[0] for row in rows]
+
+    def status_counts(self):
+        """ Return a dictionary mapping each status to its number of jobs.
+        """
+        return dict(self._query("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    def transitions(self, job_id):
+        """ Return ``(status, time)`` pairs for each status ``job_id`` went through.
+        """
+        return self._query("SELECT status, time FROM job_transitions WHERE job_id = ? ORDER BY time", (job_id,))
+
+    def active_job_ids(self, active_status):
+        return [row[0] for row in self._query("SELECT job_id FROM active_jobs WHERE active_status = ?", (active_status,))]
+
+    def activate_job(self, job_id, active_status):
+        self._execute("INSERT OR IGNORE INTO active_jobs (job_id, active_status) VALUES (?, ?)", (job_id, active_status))
+
+    def deactivate_job(self, job_id, active_status):
+        self._execute("DELETE FROM active_jobs WHERE job_id = ? AND active_status = ?", (job_id, active_status))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _update_column(self, job_id, column, value):
+        # No status may have been recorded for the job yet (e.g. the external
+        # id is registered at launch before the first status is), so insert
+        # its row as queued if needed - without caching that status, so the
+        # next record_status() still records its transition.
+        now = time.time()
+        try:
+            self._execute(
+                "INSERT INTO jobs (job_id, status, %s, created, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET %s = excluded.%s" % (column, column, column),
+                (job_id, status.QUEUED, value, now, now),
+            )
+        except Exception:
+            log.exception("Failed to record %s of job %s in %s" % (column, job_id, self.path))
+
+    def _execute(self, sql, parameters=()):
+        with self._lock:
+            self._connection.execute(sql, parameters)
+
+    def _query(self, sql, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def _rollback(self):
+        try:
+            self._connection.execute("ROLLBACK")
+        except Exception:
+            pass
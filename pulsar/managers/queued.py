@@ -74,6 +74,7 @@ class QueueManager(Manager):
             worker.join(timeout)
             if worker.is_alive():
                 log.warn("Failed to stop worker thread [%s]" % worker)
+        super().shutdown(timeout)
 
     def run_next(self):
         """
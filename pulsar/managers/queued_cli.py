@@ -86,3 +86,15 @@ class CliQueueManager(ExternalBaseManager):
         cmd_out = shell.execute(status_command)
         state = job_interface.parse_single_status(cmd_out.stdout, external_id)
         return _CLI_STATE_TO_STATUS.get(state, state)
+
+    def _get_status_external_bulk(self, external_ids):
+        shell, job_interface = self.__get_cli_plugins()
+        status_command = job_interface.get_status(external_ids)
+        cmd_out = shell.execute(status_command)
+        if cmd_out.returncode != 0:
+            log.warning("Failed to query job statuses in bulk - command was:\n%s" % status_command)
+            return None
+        states = job_interface.parse_status(cmd_out.stdout, external_ids)
+        if states is None:
+            return None
+        return {external_id: _CLI_STATE_TO_STATUS.get(state, state) for external_id, state in states.items()}
@@ -0,0 +1,182 @@
+"""Prioritized admission of staging work to a manager's thread pools.
+
+Preprocessing and postprocessing tasks are held by a StagingScheduler and
+only handed to the manager's executors (see :mod:`pulsar.managers.executors`)
+once their pool has a free thread. Whenever a thread frees up, the pending
+task with the lowest score is started, where the score of a task is::
+
+    phase_weight (preprocessing only)
+    + size_weight * declared input size in GiB (preprocessing only)
+    - age_weight * minutes spent waiting
+    + share_weight * running tasks of the submitter / submitter's weight
+
+So postprocessing (which frees cluster resources and reports results) goes
+before new preprocessing, small jobs before large ones, tasks waiting longer
+before recent ones, and submitters with fewer running tasks (relative to their
+weight) before others.
+"""
+import logging
+import threading
+import time
+
+from pulsar.managers.executors import (
+    POOL_POSTPROCESS,
+    POOL_PREPROCESS,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PHASE_WEIGHT = 100.0
+DEFAULT_SIZE_WEIGHT = 1.0
+DEFAULT_AGE_WEIGHT = 1.0
+DEFAULT_SHARE_WEIGHT = 10.0
+DEFAULT_SUBMITTER = "default"
+
+GIB = 1024.0 ** 3
+
+
+def declared_input_size(launch_config):
+    """ Return the total ``size`` declared by the setup actions of ``launch_config``.
+    """
+    remote_staging = launch_config.get("remote_staging") or {}
+    size = 0
+    for setup_action in remote_staging.get("setup") or []:
+        try:
+            size += int(setup_action.get("size") or 0)
+        except (TypeError, ValueError):
+            pass
+    return size
+
+
+class StagingScheduler:
+    """ Order preprocessing and postprocessing tasks before they reach the
+    manager's executors.
+    """
+
+    @staticmethod
+    def from_manager_options(executors, **manager_options):
+        max_concurrency = manager_options.get("staging_max_concurrency", None)
+        return StagingScheduler(
+            executors,
+            phase_weight=float(manager_options.get("staging_priority_phase_weight", DEFAULT_PHASE_WEIGHT)),
+            size_weight=float(manager_options.get("staging_priority_size_weight", DEFAULT_SIZE_WEIGHT)),
+            age_weight=float(manager_options.get("staging_priority_age_weight", DEFAULT_AGE_WEIGHT)),
+            share_weight=float(manager_options.get("staging_priority_share_weight", DEFAULT_SHARE_WEIGHT)),
+            submitter_weights=manager_options.get("staging_submitter_weights", None),
+            max_concurrency=int(max_concurrency) if max_concurrency is not None else None,
+        )
+
+    def __init__(
+        self,
+        executors,
+        phase_weight=DEFAULT_PHASE_WEIGHT,
+        size_weight=DEFAULT_SIZE_WEIGHT,
+        age_weight=DEFAULT_AGE_WEIGHT,
+        share_weight=DEFAULT_SHARE_WEIGHT,
+        submitter_weights=None,
+        max_concurrency=None,
+    ):
+        self.executors = executors
+        self.phase_weight = phase_weight
+        self.size_weight = size_weight
+        self.age_weight = age_weight
+        self.share_weight = share_weight
+        self.submitter_weights = dict(submitter_weights or {})
+        # Limit on running tasks across phases, beyond the pool sizes.
+        self.max_concurrency = max_concurrency
+        self._condition = threading.Condition()
+        self._pending = []
+        self._running = {POOL_PREPROCESS: 0, POOL_POSTPROCESS: 0}
+        self._running_by_submitter = {}
+        self._active = True
+
+    def submit(self, phase, job_id, target, input_size=0, submitter=None):
+        """ Queue ``target`` to run on the ``phase`` pool once it is the
+        highest priority task with a free thread.
+        """
+        task = _StagingTask(phase, job_id, target, input_size, submitter or DEFAULT_SUBMITTER)
+        with self._condition:
+            if not self._active:
+                raise Exception("Cannot schedule %s of job %s, manager is shutting down" % (phase, job_id))
+            self._pending.append(task)
+            self._dispatch()
+
+    def score(self, task, now=None):
+        """ Return the priority score of ``task`` - lower scores run first.
+        """
+        now = time.monotonic() if now is None else now
+        score = 0.0
+        if task.phase == POOL_PREPROCESS:
+            score += self.phase_weight + self.size_weight * task.input_size / GIB
+        score -= self.age_weight * (now - task.submitted) / 60.0
+        running = self._running_by_submitter.get(task.submitter, 0)
+        score += self.share_weight * running / float(self.submitter_weights.get(task.submitter, 1.0))
+        return score
+
+    def metrics(self):
+        """ Return the number of pending and running tasks per phase.
+        """
+        with self._condition:
+            return {
+                phase: {
+                    "pending": sum(1 for task in self._pending if task.phase == phase),
+                    "running": running,
+                }
+                for phase, running in self._running.items()
+            }
+
+    def shutdown(self, timeout=None):
+        """ Stop accepting tasks and wait up to ``timeout`` seconds for pending
+        tasks to be started.
+        """
+        with self._condition:
+            self._active = False
+            if not self._condition.wait_for(lambda: not self._pending, timeout):
+                log.warn("Dropping %d staging tasks not started before shutdown" % len(self._pending))
+                self._pending = []
+
+    def _dispatch(self):
+        # Caller must hold self._condition.
+        now = time.monotonic()
+        while self._pending:
+            if self.max_concurrency is not None and sum(self._running.values()) >= self.max_concurrency:
+                break
+            admissible = [task for task in self._pending if self._running[task.phase] < self.executors.pool_sizes[task.phase]]
+            if not admissible:
+                break
+            task = min(admissible, key=lambda task: self.score(task, now))
+            self._pending.remove(task)
+            self._running[task.phase] += 1
+            self._running_by_submitter[task.submitter] = self._running_by_submitter.get(task.submitter, 0) + 1
+            try:
+                self.executors.submit(task.phase, self._run, task)
+            except Exception:
+                log.exception("Failed to start %s of job %s" % (task.phase, task.job_id))
+                self._finished(task)
+        self._condition.notify_all()
+
+    def _run(self, task):
+        try:
+            task.target()
+        finally:
+            with self._condition:
+                self._finished(task)
+                self._dispatch()
+
+    def _finished(self, task):
+        # Caller must hold self._condition.
+        self._running[task.phase] -= 1
+        self._running_by_submitter[task.submitter] -= 1
+        if not self._running_by_submitter[task.submitter]:
+            del self._running_by_submitter[task.submitter]
+
+
+class _StagingTask:
+
+    def __init__(self, phase, job_id, target, input_size, submitter):
+        self.phase = phase
+        self.job_id = job_id
+        self.target = target
+        self.input_size = input_size
+        self.submitter = submitter
+        self.submitted = time.monotonic()
@@ -13,28 +13,28 @@ from pulsar.client.staging.down import ResultsCollector
 log = logging.getLogger(__name__)
 
 
-def postprocess(job_directory, action_executor, was_cancelled):
-    # Returns True if outputs were collected.
+def postprocess(job_directory, action_executor, was_cancelled, max_workers=1):
+    # Returns True if outputs were collected, up to max_workers at a time.
     try:
         if job_directory.has_metadata("launch_config"):
             staging_config = job_directory.load_metadata("launch_config").get("remote_staging", None)
         else:
             staging_config = None
-        collected = __collect_outputs(job_directory, staging_config, action_executor, was_cancelled)
+        collected = __collect_outputs(job_directory, staging_config, action_executor, was_cancelled, max_workers)
         return collected
     finally:
-        job_directory.write_file("postprocessed", "")
+        job_directory.store_metadata("postprocessed", True)
     return False
 
 
-def __collect_outputs(job_directory, staging_config, action_executor, was_cancelled):
+def __collect_outputs(job_directory, staging_config, action_executor, was_cancelled, max_workers):
     collected = True
     if "action_mapper" in staging_config:
         file_action_mapper = action_mapper.FileActionMapper(config=staging_config["action_mapper"])
         client_outputs = staging.ClientOutputs.from_dict(staging_config["client_outputs"])
         pulsar_outputs = __pulsar_outputs(job_directory)
         output_collector = PulsarServerOutputCollector(job_directory, action_executor, was_cancelled)
-        results_collector = ResultsCollector(output_collector, file_action_mapper, client_outputs, pulsar_outputs)
+        results_collector = ResultsCollector(output_collector, file_action_mapper, client_outputs, pulsar_outputs, max_workers=max_workers)
         collection_failure_exceptions = results_collector.collect()
         if collection_failure_exceptions:
             log.warn("Failures collecting results %s" % collection_failure_exceptions)
@@ -1,26 +1,77 @@
 """
 """
 import logging
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    wait,
+)
 
 from pulsar.client.action_mapper import from_dict
 
 log = logging.getLogger(__name__)
 
 
-def preprocess(job_directory, setup_actions, action_executor, was_cancelled, object_store=None):
-    for setup_action in setup_actions:
-        if was_cancelled():
-            log.info("Exiting preprocessing, job is cancelled")
-            return
-        name = setup_action["name"]
-        input_type = setup_action["type"]
-        action = from_dict(setup_action["action"])
-        if getattr(action, "inject_object_store", False):
-            action.object_store = object_store
-        path = job_directory.calculate_path(name, input_type)
-        description = "Staging {} '{}' via {} to {}".format(input_type, name, action, path)
-        log.debug(description)
-        action_executor.execute(lambda: action.write_to_path(path), "action[%s]" % description)
+def preprocess(job_directory, setup_actions, action_executor, was_cancelled, object_store=None, executor=None, max_concurrency=1):
+    """ Stage each of ``setup_actions`` into ``job_directory``.
+
+    If ``executor`` is given, up to ``max_concurrency`` actions of this job are
+    run at once on it - each still retried by ``action_executor``. The first
+    failure stops further actions from being started and is raised once the
+    actions already running have finished.
+    """
+    if executor is None or max_concurrency <= 1:
+        for setup_action in setup_actions:
+            if was_cancelled():
+                log.info("Exiting preprocessing, job is cancelled")
+                return
+            _execute_setup_action(job_directory, setup_action, action_executor, object_store)
+        return
+
+    pending = set()
+    failure = None
+    setup_actions = iter(setup_actions)
+    submitting = True
+    while submitting or pending:
+        while submitting and len(pending) < max_concurrency:
+            if was_cancelled():
+                log.info("Exiting preprocessing, job is cancelled")
+                submitting = False
+                break
+            setup_action = next(setup_actions, None)
+            if setup_action is None:
+                submitting = False
+                break
+            pending.add(executor.submit(
+                _execute_setup_action_if_not_cancelled, job_directory, setup_action, action_executor, was_cancelled, object_store
+            ))
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None and failure is None:
+                failure = future.exception()
+                submitting = False
+    if failure is not None:
+        raise failure
+
+
+def _execute_setup_action_if_not_cancelled(job_directory, setup_action, action_executor, was_cancelled, object_store):
+    if was_cancelled():
+        log.info("Skipped staging '%s', job is cancelled" % setup_action["name"])
+        return
+    _execute_setup_action(job_directory, setup_action, action_executor, object_store)
+
+
+def _execute_setup_action(job_directory, setup_action, action_executor, object_store):
+    name = setup_action["name"]
+    input_type = setup_action["type"]
+    action = from_dict(setup_action["action"])
+    if getattr(action, "inject_object_store", False):
+        action.object_store = object_store
+    path = job_directory.calculate_path(name, input_type)
+    description = "Staging {} '{}' via {} to {}".format(input_type, name, action, path)
+    log.debug(description)
+    action_executor.execute(lambda: action.write_to_path(path), "action[%s]" % description)
 
 
 __all__ = ('preprocess',)
@@ -1,5 +1,8 @@
 import contextlib
 import datetime
+import heapq
+import itertools
+import json
 import os
 import threading
 import time
@@ -20,6 +23,15 @@ from pulsar.managers import (
     ManagerProxy,
     status,
 )
+from pulsar.managers.executors import (
+    POOL_POSTPROCESS,
+    POOL_PREPROCESS,
+    POOL_PREPROCESS_STAGING,
+)
+from pulsar.managers.scheduling import (
+    declared_input_size,
+    StagingScheduler,
+)
 from pulsar.managers.util.retry import RetryActionExecutor
 from .staging import (
     postprocess,
@@ -43,6 +55,19 @@ ACTIVE_STATUS_PREPROCESSING = "preprocessing"
 ACTIVE_STATUS_LAUNCHED = "launched"
 
 DEFAULT_MIN_POLLING_INTERVAL = 0.5
+DEFAULT_MAX_POLLING_INTERVAL = 10.0
+DEFAULT_POLLING_BACKOFF = 1.5
+DEFAULT_MONITOR_RESYNC_INTERVAL = 60.0
+
+DEFAULT_POSTPROCESS_MAX_WORKERS = 1
+
+DEFAULT_ACTIVE_JOBS_BACKEND = "directory"
+DEFAULT_ACTIVE_JOBS_FSYNC_INTERVAL = 1.0
+DEFAULT_ACTIVE_JOBS_COMPACT_THRESHOLD = 10000
+
+# Jobs seen in these states back off towards max_polling_interval until their
+# state changes, others are polled every min_polling_interval.
+BACKOFF_POLLING_STATUSES = [status.QUEUED]
 
 
 class StatefulManagerProxy(ManagerProxy):
@@ -59,7 +84,19 @@ class StatefulManagerProxy(ManagerProxy):
         self.__preprocess_action_executor = RetryActionExecutor(**preprocess_retry_action_kwds)
         self.__postprocess_action_executor = RetryActionExecutor(**postprocess_retry_action_kwds)
         self.min_polling_interval = datetime.timedelta(0, min_polling_interval)
-        self.active_jobs = ActiveJobs.from_manager(manager)
+        max_polling_interval = float(manager_options.get("max_polling_interval", DEFAULT_MAX_POLLING_INTERVAL))
+        self.max_polling_interval = datetime.timedelta(0, max(min_polling_interval, max_polling_interval))
+        self.polling_backoff = float(manager_options.get("polling_backoff", DEFAULT_POLLING_BACKOFF))
+        self.monitor_resync_interval = float(manager_options.get("monitor_resync_interval", DEFAULT_MONITOR_RESYNC_INTERVAL))
+        self.job_state_db = getattr(manager, "job_state_db", None)
+        preprocess_staging_pool_size = manager.executors.pool_sizes[POOL_PREPROCESS_STAGING]
+        self.preprocess_staging_max_per_job = int(manager_options.get("preprocess_staging_max_per_job", preprocess_staging_pool_size))
+        self.__preprocess_staging_executor = None
+        if preprocess_staging_pool_size > 1:
+            self.__preprocess_staging_executor = manager.executors.executor(POOL_PREPROCESS_STAGING)
+        self.staging_scheduler = StagingScheduler.from_manager_options(manager.executors, **manager_options)
+        self.postprocess_max_workers = int(manager_options.get("postprocess_max_workers", DEFAULT_POSTPROCESS_MAX_WORKERS))
+        self.active_jobs = ActiveJobs.from_manager(manager, **manager_options)
         self.__state_change_callback = self._default_status_change_callback
         self.__monitor = None
 
@@ -67,6 +104,28 @@ class StatefulManagerProxy(ManagerProxy):
         self.__state_change_callback = state_change_callback
         self.__monitor = ManagerMonitor(self)
 
+    def monitor_metrics(self):
+        """ Return poll queue metrics of the job monitor (empty if not monitoring).
+        """
+        if self.__monitor is None:
+            return {}
+        return self.__monitor.metrics()
+
+    def _record_status(self, job_id, job_status):
+        if self.job_state_db:
+            self.job_state_db.record_status(job_id, job_status)
+
+    def executor_metrics(self):
+        """ Return size, queue depth and running task count of each of the
+        manager's thread pools.
+        """
+        return self._proxied_manager.executors.metrics()
+
+    def staging_metrics(self):
+        """ Return pending and running preprocessing and postprocessing task counts.
+        """
+        return self.staging_scheduler.metrics()
+
     def _default_status_change_callback(self, status, job_id):
         log.info("Status of job [{}] changed to [{}]. No callbacks enabled.".format(job_id, status))
 
@@ -97,6 +156,7 @@ class StatefulManagerProxy(ManagerProxy):
         self._persist_launch_config(job_id, launch_config)
         requires_preprocessing = launch_config.get("remote_staging") and launch_config["remote_staging"].get("setup")
         if requires_preprocessing:
+            self._record_status(job_id, status.PREPROCESSING)
             self.active_jobs.activate_job(job_id, active_status=ACTIVE_STATUS_PREPROCESSING)
             self._launch_prepreprocessing_thread(job_id, launch_config)
         else:
@@ -116,10 +176,24 @@ class StatefulManagerProxy(ManagerProxy):
                     for action in staging_config['setup']:
                         action['action'].update(ssh_key=staging_config['action_mapper']['ssh_key'])
                 setup_config = staging_config.get("setup", [])
-                preprocess(job_directory, setup_config, self.__preprocess_action_executor, was_cancelled, object_store=self.object_store)
+                preprocess(
+                    job_directory,
+                    setup_config,
+                    self.__preprocess_action_executor,
+                    was_cancelled,
+                    object_store=self.object_store,
+                    executor=self.__preprocess_staging_executor,
+                    max_concurrency=self.preprocess_staging_max_per_job,
+                )
                 self.active_jobs.deactivate_job(job_id, active_status=ACTIVE_STATUS_PREPROCESSING)
 
-        new_thread_for_job(self, "preprocess", job_id, do_preprocess, daemon=False)
+        self.staging_scheduler.submit(
+            POOL_PREPROCESS,
+            job_id,
+            do_preprocess,
+            input_size=declared_input_size(launch_config),
+            submitter=launch_config.get("submitter"),
+        )
 
     @contextlib.contextmanager
     def _handling_of_preprocessing_state(self, job_id, launch_config):
@@ -145,15 +219,19 @@ class StatefulManagerProxy(ManagerProxy):
             with job_directory.lock("status"):
                 job_directory.store_metadata(JOB_FILE_PREPROCESSED, True)
             self.active_jobs.activate_job(job_id)
+            if self.__monitor:
+                self.__monitor.schedule_job(job_id)
         except Exception as e:
             with job_directory.lock("status"):
                 job_directory.store_metadata(JOB_FILE_PREPROCESSING_FAILED, True)
-                job_directory.store_metadata("return_code", 1)
+                job_directory.write_file("return_code", "1")
                 job_directory.write_file("stderr", str(e))
+            self._record_status(job_id, status.FAILED)
             self.__state_change_callback(status.FAILED, job_id)
             log.exception("Failed job preprocessing for job %s:", job_id)
 
     def handle_failure_before_launch(self, job_id):
+        self._record_status(job_id, status.FAILED)
         self.__state_change_callback(status.FAILED, job_id)
 
     def get_status(self, job_id):
@@ -167,12 +245,24 @@ class StatefulManagerProxy(ManagerProxy):
         with job_directory.lock("status"):
             proxy_status, state_change = self.__proxy_status(job_directory, job_id)
 
+        job_status = self.__status(job_directory, proxy_status)
+        self._record_status(job_id, job_status)
+
         if state_change == "to_complete":
             self.__deactivate(job_id, proxy_status)
         elif state_change == "to_running":
             self.__state_change_callback(status.RUNNING, job_id)
 
-        return self.__status(job_directory, proxy_status)
+        return job_status
+
+    def status_sweep(self, job_ids):
+        """ Context manager letting the proxied manager answer ``get_status``
+        for ``job_ids`` from a single bulk query, if it supports that.
+        """
+        status_sweep_method = getattr(self._proxied_manager, "status_sweep", None)
+        if status_sweep_method is None:
+            return contextlib.nullcontext()
+        return status_sweep_method(job_ids)
 
     def __proxy_status(self, job_directory, job_id):
         """ Determine state with proxied job manager and if this job needs
@@ -214,12 +304,21 @@ class StatefulManagerProxy(ManagerProxy):
 
     def __deactivate(self, job_id, proxy_status):
         self.active_jobs.deactivate_job(job_id)
+        if self.__monitor:
+            self.__monitor.unschedule_job(job_id)
         deactivate_method = getattr(self._proxied_manager, "_deactivate_job", None)
         if deactivate_method:
             try:
                 deactivate_method(job_id)
             except Exception:
                 log.exception("Failed to deactivate via proxied manager job %s" % job_id)
+        if self.job_state_db:
+            try:
+                return_code = self._proxied_manager.return_code(job_id)
+                if isinstance(return_code, int):
+                    self.job_state_db.record_return_code(job_id, return_code)
+            except Exception:
+                log.exception("Failed to record return code of job %s" % job_id)
         if proxy_status == status.COMPLETE:
             self.__handle_postprocessing(job_id)
 
@@ -229,14 +328,20 @@ class StatefulManagerProxy(ManagerProxy):
             job_directory = self._proxied_manager.job_directory(job_id)
             was_cancelled = partial(self._proxied_manager._was_cancelled, job_id)
             try:
-                postprocess_success = postprocess(job_directory, self.__postprocess_action_executor, was_cancelled)
+                postprocess_success = postprocess(
+                    job_directory, self.__postprocess_action_executor, was_cancelled, max_workers=self.postprocess_max_workers
+                )
             except Exception:
                 log.exception("Failed to postprocess results for job id %s" % job_id)
             final_status = status.COMPLETE if postprocess_success else status.FAILED
             if job_directory.has_metadata(JOB_FILE_PREPROCESSING_FAILED):
                 final_status = status.FAILED
+            self._record_status(job_id, final_status)
             self.__state_change_callback(final_status, job_id)
-        new_thread_for_job(self, "postprocess", job_id, do_postprocess, daemon=False)
+        job_directory = self._proxied_manager.job_directory(job_id)
+        launch_config = job_directory.load_metadata("launch_config") if job_directory.has_metadata("launch_config") else None
+        submitter = (launch_config or {}).get("submitter")
+        self.staging_scheduler.submit(POOL_POSTPROCESS, job_id, do_postprocess, submitter=submitter)
 
     def shutdown(self, timeout=None):
         if self.__monitor:
@@ -244,7 +349,21 @@ class StatefulManagerProxy(ManagerProxy):
                 self.__monitor.shutdown(timeout)
             except Exception:
                 log.exception("Failed to shutdown job monitor for manager %s" % self.name)
+        # Drains preprocessing and postprocessing, which update active jobs.
+        try:
+            self.staging_scheduler.shutdown(timeout)
+        except Exception:
+            log.exception("Failed to shutdown staging scheduler for manager %s" % self.name)
         super().shutdown(timeout)
+        try:
+            self.active_jobs.close()
+        except Exception:
+            log.exception("Failed to close active jobs for manager %s" % self.name)
+        if self.job_state_db:
+            try:
+                self.job_state_db.close()
+            except Exception:
+                log.exception("Failed to close job state database for manager %s" % self.name)
 
     def recover_active_jobs(self):
         unqueue_preprocessing_ids = []
@@ -280,22 +399,38 @@ class StatefulManagerProxy(ManagerProxy):
     def __handle_recovery_problem(self, job_id):
         # Make sure we tell the client we have lost this job.
         self.active_jobs.deactivate_job(job_id)
+        if self.__monitor:
+            self.__monitor.unschedule_job(job_id)
+        self._record_status(job_id, status.LOST)
         self.__state_change_callback(status.LOST, job_id)
 
 
 class ActiveJobs:
     """ Keeps track of active jobs (those that are not yet "complete").
-    Current implementation is file based, but could easily be made
-    database-based instead.
-
-    TODO: Keep jobs in memory after initial load so don't need to repeatedly
-    hit disk to recover this information.
+    This implementation is file based - one empty file per active job - see
+    JournaledActiveJobs for a variant that keeps jobs in memory and
+    DatabaseActiveJobs for one backed by the manager's job state database.
     """
 
     @staticmethod
-    def from_manager(manager):
+    def from_manager(manager, **manager_options):
         persistence_directory = manager.persistence_directory
         manager_name = manager.name
+        backend = manager_options.get("active_jobs_backend", DEFAULT_ACTIVE_JOBS_BACKEND)
+        if backend == "journal":
+            return JournaledActiveJobs(
+                manager_name,
+                persistence_directory,
+                fsync_interval=float(manager_options.get("active_jobs_fsync_interval", DEFAULT_ACTIVE_JOBS_FSYNC_INTERVAL)),
+                compact_threshold=int(manager_options.get("active_jobs_compact_threshold", DEFAULT_ACTIVE_JOBS_COMPACT_THRESHOLD)),
+            )
+        elif backend == "database":
+            job_state_db = getattr(manager, "job_state_db", None)
+            if job_state_db is None:
+                raise Exception("active_jobs_backend [database] requires job_state_database to be enabled")
+            return DatabaseActiveJobs(job_state_db, manager_name, persistence_directory)
+        elif backend != "directory":
+            raise Exception("Unknown active_jobs_backend [%s]" % backend)
         return ActiveJobs(manager_name, persistence_directory)
 
     def __init__(self, manager_name, persistence_directory):
@@ -348,29 +483,328 @@ class ActiveJobs:
     def _active_job_file(self, job_id, active_status=ACTIVE_STATUS_LAUNCHED):
         return os.path.join(self._active_job_directory(active_status), job_id)
 
+    def close(self):
+        """ Optional. """
+
+
+class JournaledActiveJobs:
+    """ Keeps track of active jobs in memory, persisted via an append-only journal.
+
+    Each activation and deactivation appends a JSON record to
+    ``<manager>-active-jobs.journal`` in the persistence directory. The journal
+    is replayed once at startup, fsync'ed in batches by a background thread and
+    rewritten to contain only the active jobs once it grows past
+    ``compact_threshold`` records. Jobs tracked by the directory based
+    ActiveJobs are imported the first time the journal is created.
+    """
+
+    def __init__(
+        self,
+        manager_name,
+        persistence_directory,
+        fsync_interval=DEFAULT_ACTIVE_JOBS_FSYNC_INTERVAL,
+        compact_threshold=DEFAULT_ACTIVE_JOBS_COMPACT_THRESHOLD,
+    ):
+        self._lock = threading.Lock()
+        # Dictionaries rather than sets to keep activation order.
+        self._jobs = {
+            ACTIVE_STATUS_LAUNCHED: {},
+            ACTIVE_STATUS_PREPROCESSING: {},
+        }
+        self._fsync_interval = fsync_interval
+        self._compact_threshold = compact_threshold
+        self._journal = None
+        self._journal_records = 0
+        self._dirty = False
+        self._closed = threading.Event()
+        self._thread = None
+        if persistence_directory:
+            self.journal_path = os.path.join(persistence_directory, "%s-active-jobs.journal" % manager_name)
+            self._legacy_directories = {
+                ACTIVE_STATUS_LAUNCHED: os.path.join(persistence_directory, "%s-active-jobs" % manager_name),
+                ACTIVE_STATUS_PREPROCESSING: os.path.join(persistence_directory, "%s-preprocessing-jobs" % manager_name),
+            }
+            self._load()
+            self._thread = threading.Thread(name="active-jobs-journal-%s" % manager_name, target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+        else:
+            self.journal_path = None
+
+    def active_job_ids(self, active_status=ACTIVE_STATUS_LAUNCHED):
+        jobs = self._jobs_for_status(active_status)
+        with self._lock:
+            return list(jobs.keys())
+
+    def activate_job(self, job_id, active_status=ACTIVE_STATUS_LAUNCHED):
+        jobs = self._jobs_for_status(active_status)
+        with self._lock:
+            if job_id in jobs:
+                return
+            jobs[job_id] = True
+            try:
+                self._append("activate", active_status, job_id)
+            except Exception:
+                log.warn(ACTIVATE_FAILED_MESSAGE % job_id)
+
+    def deactivate_job(self, job_id, active_status=ACTIVE_STATUS_LAUNCHED):
+        jobs = self._jobs_for_status(active_status)
+        with self._lock:
+            if jobs.pop(job_id, None) is None:
+                return
+            try:
+                self._append("deactivate", active_status, job_id)
+            except Exception:
+                log.warn(DECACTIVATE_FAILED_MESSAGE % job_id)
+
+    def sync(self):
+        """ Flush journal records appended since the last sync to disk.
+        """
+        with self._lock:
+            if self._journal is not None and self._dirty:
+                os.fsync(self._journal.fileno())
+                self._dirty = False
+
+    def compact(self):
+        """ Rewrite the journal so it only records the currently active jobs.
+        """
+        with self._lock:
+            if self.journal_path:
+                self._compact()
+
+    def close(self):
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.sync()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _jobs_for_status(self, active_status):
+        try:
+            return self._jobs[active_status]
+        except KeyError:
+            raise Exception("Unknown active state encountered [%s]" % active_status)
+
+    def _load(self):
+        imported_files = []
+        if os.path.exists(self.journal_path):
+            self._replay()
+        else:
+            imported_files = self._import_legacy_directories()
+        self._compact()
+        # Only drop the legacy files once their jobs are durably journaled.
+        for path in imported_files:
+            try:
+                os.remove(path)
+            except OSError:
+                log.warn("Failed to remove migrated active job file %s" % path)
+
+    def _replay(self):
+        with open(self.journal_path) as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                    op, active_status, job_id = record["op"], record["status"], record["job_id"]
+                    jobs = self._jobs[active_status]
+                except (ValueError, KeyError, TypeError):
+                    # Most likely a record truncated by a crash mid-write.
+                    log.warning("Skipping unreadable active jobs journal record in %s: %r", self.journal_path, line)
+                    continue
+                if op == "activate":
+                    jobs[job_id] = True
+                elif op == "deactivate":
+                    jobs.pop(job_id, None)
+
+    def _import_legacy_directories(self):
+        imported_files = []
+        for active_status, directory in self._legacy_directories.items():
+            if not os.path.isdir(directory):
+                continue
+            for job_id in os.listdir(directory):
+                self._jobs[active_status][job_id] = True
+                imported_files.append(os.path.join(directory, job_id))
+        if imported_files:
+            log.info("Imported %d active jobs into journal %s", len(imported_files), self.journal_path)
+        return imported_files
+
+    def _append(self, op, active_status, job_id):
+        # Caller must hold self._lock.
+        if self._journal is None:
+            return
+        record = {"op": op, "status": active_status, "job_id": job_id}
+        self._journal.write(json.dumps(record) + "\n")
+        self._journal.flush()
+        self._journal_records += 1
+        self._dirty = True
+
+    def _compact(self):
+        # Caller must hold self._lock (or be the constructor).
+        tmp_path = self.journal_path + ".tmp"
+        records = 0
+        with open(tmp_path, "w") as journal:
+            for active_status, jobs in self._jobs.items():
+                for job_id in jobs:
+                    journal.write(json.dumps({"op": "activate", "status": active_status, "job_id": job_id}) + "\n")
+                    records += 1
+            journal.flush()
+            os.fsync(journal.fileno())
+        if self._journal is not None:
+            self._journal.close()
+        os.replace(tmp_path, self.journal_path)
+        self._journal = open(self.journal_path, "a")
+        self._journal_records = records
+        self._dirty = False
+
+    def _needs_compaction(self):
+        with self._lock:
+            active_count = sum(len(jobs) for jobs in self._jobs.values())
+            return self._journal_records > max(self._compact_threshold, 2 * active_count)
+
+    def _run(self):
+        while not self._closed.wait(self._fsync_interval):
+            try:
+                self.sync()
+                if self._needs_compaction():
+                    self.compact()
+            except Exception:
+                log.exception("Failed to sync active jobs journal %s" % self.journal_path)
+
+
+class DatabaseActiveJobs:
+    """ Keeps track of active jobs in the ``active_jobs`` table of a
+    JobStateDatabase. Jobs tracked by the directory based ActiveJobs are
+    imported (and their files removed) on startup.
+    """
+
+    def __init__(self, job_state_db, manager_name, persistence_directory):
+        self.job_state_db = job_state_db
+        self._import_legacy_directories({
+            ACTIVE_STATUS_LAUNCHED: os.path.join(persistence_directory, "%s-active-jobs" % manager_name),
+            ACTIVE_STATUS_PREPROCESSING: os.path.join(persistence_directory, "%s-preprocessing-jobs" % manager_name),
+        })
+
+    def active_job_ids(self, active_status=ACTIVE_STATUS_LAUNCHED):
+        self._check_active_status(active_status)
+        return self.job_state_db.active_job_ids(active_status)
+
+    def activate_job(self, job_id, active_status=ACTIVE_STATUS_LAUNCHED):
+        self._check_active_status(active_status)
+        try:
+            self.job_state_db.activate_job(job_id, active_status)
+        except Exception:
+            log.warn(ACTIVATE_FAILED_MESSAGE % job_id)
+
+    def deactivate_job(self, job_id, active_status=ACTIVE_STATUS_LAUNCHED):
+        self._check_active_status(active_status)
+        try:
+            self.job_state_db.deactivate_job(job_id, active_status)
+        except Exception:
+            log.warn(DECACTIVATE_FAILED_MESSAGE % job_id)
+
+    def close(self):
+        """ Database is closed by the StatefulManagerProxy. """
+
+    def _check_active_status(self, active_status):
+        if active_status not in [ACTIVE_STATUS_LAUNCHED, ACTIVE_STATUS_PREPROCESSING]:
+            raise Exception("Unknown active state encountered [%s]" % active_status)
+
+    def _import_legacy_directories(self, directories):
+        for active_status, directory in directories.items():
+            if not os.path.isdir(directory):
+                continue
+            for job_id in os.listdir(directory):
+                self.job_state_db.activate_job(job_id, active_status)
+                try:
+                    os.remove(os.path.join(directory, job_id))
+                except OSError:
+                    log.warn("Failed to remove migrated active job file %s" % job_id)
+
 
 class ManagerMonitor:
     """ Monitors active jobs of a StatefulManagerProxy.
+
+    Rather than sweeping every active job each ``min_polling_interval``, jobs
+    are kept in a priority queue keyed on the time of their next check. Each
+    job's interval adapts to the state it was last seen in - it backs off
+    geometrically (up to ``max_polling_interval``) while the job is queued and
+    stays at ``min_polling_interval`` otherwise, resetting whenever the state
+    changes.
+
+    ``clock`` (``time.monotonic`` by default) is the source of those times,
+    and ``start=False`` leaves the monitor without a thread, so (in tests) it
+    is only stepped by calling ``_monitor_active_jobs``.
     """
 
-    def __init__(self, stateful_manager):
+    def __init__(self, stateful_manager, clock=time.monotonic, start=True):
         self.stateful_manager = stateful_manager
         self.active = True
-        thread = new_thread_for_manager(self.stateful_manager, "[action=monitor]", self._run, True)
-        self.thread = thread
+        self._clock = clock
+        self._condition = threading.Condition()
+        # Heap of (next check time, sequence, job_id) - entries whose sequence
+        # no longer matches the job's schedule are stale and skipped.
+        self._queue = []
+        self._sequence = itertools.count()
+        self._schedules = {}
+        self._next_resync = 0
+        self._checks = 0
+        self._last_lateness = 0.0
+        self._max_lateness = 0.0
+        self.thread = None
+        if start:
+            self.thread = new_thread_for_manager(self.stateful_manager, "[action=monitor]", self._run, True)
 
     def shutdown(self, timeout=None):
         self.active = False
+        with self._condition:
+            self._condition.notify_all()
+        if self.thread is None:
+            return
         self.thread.join(timeout)
         if self.thread.is_alive():
             log.warn("Failed to join monitor thread [%s]" % self.thread)
 
+    def schedule_job(self, job_id):
+        """ Start tracking job (or check it again right away if already tracked).
+        """
+        with self._condition:
+            schedule = self._schedules.get(job_id)
+            if schedule is None:
+                schedule = _JobPollSchedule(self._min_interval())
+                self._schedules[job_id] = schedule
+            self._push(job_id, schedule, self._clock())
+            self._condition.notify_all()
+
+    def unschedule_job(self, job_id):
+        with self._condition:
+            self._schedules.pop(job_id, None)
+
+    def metrics(self):
+        """ Return a dictionary describing the poll queue.
+
+        ``lateness`` values are the number of seconds between when a job was
+        due to be checked and when it was actually checked.
+        """
+        now = self._clock()
+        with self._condition:
+            due = sum(1 for (when, sequence, job_id) in self._queue if when <= now and self._is_current(job_id, sequence))
+            return {
+                "queue_depth": len(self._schedules),
+                "due": due,
+                "checks": self._checks,
+                "last_lateness": self._last_lateness,
+                "max_lateness": self._max_lateness,
+            }
+
     def _run(self):
         """ Main loop, repeatedly checking active jobs of stateful manager.
         """
         while self.active:
             try:
                 self._monitor_active_jobs()
+                self._wait_for_next_job()
             except Exception:
                 log.exception("Failure in stateful manager monitor step.")
                 # This should hopefully be a rare event.
@@ -378,30 +812,117 @@ class ManagerMonitor:
                 time.sleep(1)
 
     def _monitor_active_jobs(self):
-        active_job_ids = self.stateful_manager.active_jobs.active_job_ids()
-        iteration_start = datetime.datetime.now()
-        for active_job_id in active_job_ids:
-            try:
-                self._check_active_job_status(active_job_id)
-            except Exception:
-                log.exception("Failed checking active job status for job_id %s" % active_job_id)
-        iteration_end = datetime.datetime.now()
-        iteration_length = iteration_end - iteration_start
-        if iteration_length < self.stateful_manager.min_polling_interval:
-            to_sleep = (self.stateful_manager.min_polling_interval - iteration_length)
-            microseconds = to_sleep.microseconds + (to_sleep.seconds + to_sleep.days * 24 * 3600) * (10 ** 6)
-            total_seconds = microseconds / (10 ** 6)
-            time.sleep(total_seconds)
+        now = self._clock()
+        if now >= self._next_resync:
+            self._resync_active_jobs()
+            self._next_resync = now + self.stateful_manager.monitor_resync_interval
+        lateness = 0.0
+        due_jobs = self._pop_due_jobs(now)
+        if due_jobs:
+            with self.stateful_manager.status_sweep([job_id for job_id, _ in due_jobs]):
+                for active_job_id, due in due_jobs:
+                    lateness = max(lateness, self._clock() - due)
+                    job_status = None
+                    try:
+                        job_status = self._check_active_job_status(active_job_id)
+                    except Exception:
+                        log.exception("Failed checking active job status for job_id %s" % active_job_id)
+                    self._checks += 1
+                    self._reschedule(active_job_id, job_status)
+        self._record_lateness(lateness)
 
     def _check_active_job_status(self, active_job_id):
         # Manager itself will handle state transitions when status changes,
         # just need to poll get_status
-        self.stateful_manager.get_status(active_job_id)
+        return self.stateful_manager.get_status(active_job_id)
+
+    def _resync_active_jobs(self):
+        """ Reconcile tracked jobs against the persisted set of active jobs.
+
+        Activation and deactivation through the proxy update the schedule
+        directly, this only catches jobs recovered or removed behind its back.
+        """
+        active_job_ids = set(self.stateful_manager.active_jobs.active_job_ids())
+        now = self._clock()
+        with self._condition:
+            for job_id in list(self._schedules.keys()):
+                if job_id not in active_job_ids:
+                    del self._schedules[job_id]
+            for job_id in active_job_ids:
+                if job_id not in self._schedules:
+                    schedule = _JobPollSchedule(self._min_interval())
+                    self._schedules[job_id] = schedule
+                    self._push(job_id, schedule, now)
+
+    def _pop_due_jobs(self, now):
+        due_jobs = []
+        with self._condition:
+            while self._queue and self._queue[0][0] <= now:
+                when, sequence, job_id = heapq.heappop(self._queue)
+                if self._is_current(job_id, sequence):
+                    due_jobs.append((job_id, when))
+        return due_jobs
+
+    def _reschedule(self, job_id, job_status):
+        with self._condition:
+            schedule = self._schedules.get(job_id)
+            if schedule is None:
+                # Deactivated while being checked.
+                return
+            schedule.interval = self._next_interval(schedule, job_status)
+            if job_status is not None:
+                schedule.status = job_status
+            self._push(job_id, schedule, self._clock() + schedule.interval)
+
+    def _next_interval(self, schedule, job_status):
+        min_interval = self._min_interval()
+        if job_status is None:
+            return schedule.interval
+        if job_status != schedule.status or job_status not in BACKOFF_POLLING_STATUSES:
+            return min_interval
+        max_interval = self.stateful_manager.max_polling_interval.total_seconds()
+        return max(min_interval, min(schedule.interval * self.stateful_manager.polling_backoff, max_interval))
+
+    def _record_lateness(self, lateness):
+        with self._condition:
+            self._last_lateness = lateness
+            self._max_lateness = max(self._max_lateness, lateness)
+        if lateness > self.stateful_manager.max_polling_interval.total_seconds():
+            log.warning(
+                "Job monitor for manager %s is falling behind, checks ran %.1f seconds late (%d jobs tracked).",
+                self.stateful_manager.name, lateness, len(self._schedules),
+            )
+
+    def _wait_for_next_job(self):
+        with self._condition:
+            if not self.active:
+                return
+            now = self._clock()
+            wait_until = self._next_resync
+            if self._queue:
+                wait_until = min(wait_until, self._queue[0][0])
+            if wait_until > now:
+                self._condition.wait(wait_until - now)
+
+    def _push(self, job_id, schedule, when):
+        # Caller must hold self._condition.
+        schedule.sequence = next(self._sequence)
+        heapq.heappush(self._queue, (when, schedule.sequence, job_id))
+
+    def _is_current(self, job_id, sequence):
+        schedule = self._schedules.get(job_id)
+        return schedule is not None and schedule.sequence == sequence
+
+    def _min_interval(self):
+        return self.stateful_manager.min_polling_interval.total_seconds()
+
 
+class _JobPollSchedule:
 
-def new_thread_for_job(manager, action, job_id, target, daemon):
-    name = "[action={}]-[job={}]".format(action, job_id)
-    return new_thread_for_manager(manager, name, target, daemon)
+    def __init__(self, interval):
+        self.interval = interval
+        self.status = None
+        self.sequence = None
 
 
 def new_thread_for_manager(manager, name, target, daemon):
@@ -1,7 +1,7 @@
-import _thread as thread
 import os
 import platform
 import tempfile
+import threading
 import time
 from logging import getLogger
 from subprocess import Popen
@@ -80,7 +80,11 @@ class BaseUnqueuedManager(DirectoryBaseManager):
     def _start_monitor(self, *args, **kwd):
         monitor = kwd.get("monitor", MonitorStyle.BACKGROUND)
         if monitor == MonitorStyle.BACKGROUND:
-            thread.start_new_thread(self._monitor_execution, args)
+            # A thread per job rather than one of the manager's bounded pools -
+            # the process is already running and must be waited on however
+            # many others are.
+            thread_name = "[manager={}]-[action=monitor]-[job={}]".format(self.name, args[0])
+            threading.Thread(name=thread_name, target=self._monitor_execution, args=args, daemon=True).start()
         elif monitor == MonitorStyle.FOREGROUND:
             self._monitor_execution(*args)
         else:
@@ -42,6 +42,7 @@ def bind_app(app, queue_id, conf=None):
         queue_state = QueueState()
         for manager in app.managers.values():
             bind_amqp.bind_manager_to_queue(manager, queue_state, connection_string, conf)
+        bind_amqp.start_shared_consumer(queue_state, conf)
         return queue_state
 
 
@@ -53,6 +54,9 @@ class QueueState:
         self.active = True
         self.threads = []
         self.outboxes = []
+        self.exchanges = []
+        # (exchange, queue name, callback) of managers consumed on a shared connection.
+        self.subscriptions = []
 
     def deactivate(self):
         self.active = False
@@ -61,6 +65,8 @@ class QueueState:
                 outbox.stop(timeout=2.0)
             except OSError:
                 log.exception("Failed to stop status update outbox")
+        for exchange in self.exchanges:
+            exchange.close()
 
     def __nonzero__(self):
         return self.active
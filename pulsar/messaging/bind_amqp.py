@@ -9,16 +9,23 @@ from galaxy.util import (
 
 from pulsar import manager_endpoint_util
 from pulsar.client import amqp_exchange_factory
+from pulsar.client.util import filter_destination_params
 
 from .outbox import build_status_outbox
+from .status_requests import StatusRequestCoalescer
 
 log = logging.getLogger(__name__)
 
+CONSUMER_CONNECTIONS_PER_QUEUE = "per_queue"
+CONSUMER_CONNECTIONS_PER_MANAGER = "per_manager"
+CONSUMER_CONNECTIONS_SHARED = "shared"
+DEFAULT_CONSUMER_CONNECTIONS = CONSUMER_CONNECTIONS_PER_QUEUE
 
 TYPED_PARAMS = {
     "amqp_consumer_timeout": lambda val: None if str(val) == "None" else float(val),
     "amqp_publish_timeout": lambda val: None if str(val) == "None" else float(val),
     "amqp_publish_retry": asbool,
+    "amqp_persistent_connection": asbool,
     "amqp_publish_retry_max_retries": int,
     "amqp_publish_retry_interval_start": int,
     "amqp_publish_retry_interval_step": int,
@@ -46,16 +53,29 @@ def bind_manager_to_queue(manager, queue_state, connection_string, conf):
     manager_name = manager.name
     log.info("bind_manager_to_queue called for [{}] and manager [{}]".format(mask_password_from_url(connection_string), manager_name))
     pulsar_exchange = get_exchange(connection_string, manager_name, conf)
+    if hasattr(queue_state, "exchanges"):
+        queue_state.exchanges.append(pulsar_exchange)
 
     process_setup_messages = functools.partial(__process_setup_message, manager)
     process_kill_messages = functools.partial(__process_kill_message, manager)
-    process_status_messages = functools.partial(__process_status_message, manager)
+    status_requests = StatusRequestCoalescer.from_conf(manager, conf)
+    process_status_messages = functools.partial(__process_status_message, status_requests)
 
     def drain(callback, name):
         __drain(name, queue_state, pulsar_exchange, callback)
         log.info("Finished consuming %s queue - no more messages will be processed." % (name))
 
-    if conf.get("message_queue_consume", True):
+    consumer_connections = conf.get("amqp_consumer_connections", DEFAULT_CONSUMER_CONNECTIONS)
+    if conf.get("message_queue_consume", True) and consumer_connections != CONSUMER_CONNECTIONS_PER_QUEUE:
+        subscriptions = [
+            (pulsar_exchange, "setup", process_setup_messages),
+            (pulsar_exchange, "kill", process_kill_messages),
+            (pulsar_exchange, "status", process_status_messages),
+        ]
+        if conf.get("amqp_acknowledge", False):
+            subscriptions.append((pulsar_exchange, "status_update_ack", None))
+        __bind_consolidated_consumer(pulsar_exchange, subscriptions, queue_state, conf, consumer_connections)
+    elif conf.get("message_queue_consume", True):
         setup_thread = start_setup_consumer(pulsar_exchange, functools.partial(drain, process_setup_messages, "setup"))
         kill_thread = start_kill_consumer(pulsar_exchange, functools.partial(drain, process_kill_messages, "kill"))
         status_thread = start_status_consumer(pulsar_exchange, functools.partial(drain, process_status_messages, "status"))
@@ -70,6 +90,7 @@ def bind_manager_to_queue(manager, queue_state, connection_string, conf):
             manager,
             conf,
             publish_fn=lambda payload: pulsar_exchange.publish("status_update", payload),
+            publish_batch_fn=lambda payloads: pulsar_exchange.publish_batch("status_update", payloads),
         )
         if outbox is not None:
             queue_state.outboxes.append(outbox)
@@ -80,7 +101,7 @@ def bind_manager_to_queue(manager, queue_state, connection_string, conf):
                 "Publishing Pulsar state change with status %s for job_id %s",
                 new_status, job_id,
             )
-            payload = manager_endpoint_util.full_status(manager, new_status, job_id)
+            payload = status_requests.full_status(new_status, job_id)
             if outbox is not None:
                 outbox.enqueue(payload)
                 return
@@ -95,6 +116,17 @@ def bind_manager_to_queue(manager, queue_state, connection_string, conf):
         manager.set_state_change_callback(bind_on_status_change)
 
 
+def __bind_consolidated_consumer(pulsar_exchange, subscriptions, queue_state, conf, consumer_connections):
+    if consumer_connections == CONSUMER_CONNECTIONS_PER_MANAGER:
+        thread = start_multi_queue_consumer(pulsar_exchange, subscriptions, queue_state, conf)
+        getattr(queue_state, 'threads', []).append(thread)
+    elif consumer_connections == CONSUMER_CONNECTIONS_SHARED:
+        # Started once every manager is bound, see start_shared_consumer.
+        queue_state.subscriptions.extend(subscriptions)
+    else:
+        raise Exception("Unknown amqp_consumer_connections [%s]" % consumer_connections)
+
+
 def __start_consumer(name, exchange, target):
     exchange_url = mask_password_from_url(exchange.url)
     thread_name = "consume-{}-{}".format(name, exchange_url)
@@ -112,6 +144,37 @@ start_status_consumer = functools.partial(__start_consumer, "status")
 start_status_update_ack_consumer = functools.partial(__start_consumer, "status_update_ack")
 
 
+def start_shared_consumer(queue_state, conf):
+    """ Consume the queues of all managers bound with
+    ``amqp_consumer_connections: shared`` on one connection per broker URL.
+    """
+    subscriptions_by_url = {}
+    for subscription in queue_state.subscriptions:
+        subscriptions_by_url.setdefault(subscription[0].url, []).append(subscription)
+    for subscriptions in subscriptions_by_url.values():
+        thread = start_multi_queue_consumer(subscriptions[0][0], subscriptions, queue_state, conf)
+        queue_state.threads.append(thread)
+
+
+def start_multi_queue_consumer(pulsar_exchange, subscriptions, queue_state, conf):
+    prefetch_counts = parse_consumer_prefetch_counts(conf)
+
+    def drain():
+        pulsar_exchange.consume_many(subscriptions, check=queue_state, prefetch_counts=prefetch_counts)
+        log.info("Finished consuming queues - no more messages will be processed.")
+
+    return __start_consumer("multi", pulsar_exchange, drain)
+
+
+def parse_consumer_prefetch_counts(conf):
+    """ Map queue names to the ``amqp_consumer_prefetch_<queue>`` limits.
+    """
+    return {
+        queue_name: int(count)
+        for queue_name, count in filter_destination_params(conf, "amqp_consumer_prefetch_").items()
+    }
+
+
 def __drain(name, queue_state, pulsar_exchange, callback):
     pulsar_exchange.consume(name, callback=callback, check=queue_state)
 
@@ -148,8 +211,8 @@ def __process_setup_message(manager, body, job_id):
 
 
 @__processes_message
-def __process_status_message(manager, body, job_id):
-    manager.trigger_state_change_callback(job_id)
+def __process_status_message(status_requests, body, job_id):
+    status_requests.trigger_state_change_callback(job_id)
 
 
 def __client_job_id_from_body(body):
@@ -17,11 +17,17 @@ import requests
 from pulsar import manager_endpoint_util
 from pulsar.capabilities import collect_capabilities
 from .outbox import build_status_outbox
+from .relay_dispatch import (
+    DEFAULT_MAX_PENDING,
+    RelayMessageDispatcher,
+)
+from .status_requests import StatusRequestCoalescer
 from .relay_state import RelayState
 
 log = logging.getLogger(__name__)
 
 DEFAULT_RELAY_LONG_POLL_TIMEOUT = 30.0
+DEFAULT_RELAY_CONSUMER_WORKERS = 1
 
 
 def _server_cursor_path(manager) -> Optional[str]:
@@ -88,7 +94,8 @@ def bind_manager_to_relay(manager, relay_state: RelayState, relay_url, conf, rel
     # Define message handlers
     process_setup_messages = functools.partial(__process_setup_message, manager)
     process_kill_messages = functools.partial(__process_kill_message, manager)
-    process_status_messages = functools.partial(__process_status_message, manager)
+    status_requests = StatusRequestCoalescer.from_conf(manager, conf)
+    process_status_messages = functools.partial(__process_status_message, status_requests)
 
     # Determine topics based on manager name and optional prefix
     setup_topic = __make_topic_name(relay_topic_prefix, "job_setup", manager_name)
@@ -112,6 +119,9 @@ def bind_manager_to_relay(manager, relay_state: RelayState, relay_url, conf, rel
                 kill_topic: process_kill_messages,
             },
             long_poll_timeout=long_poll_timeout,
+            workers=int(conf.get("relay_consumer_workers", DEFAULT_RELAY_CONSUMER_WORKERS)),
+            priority_topics=[kill_topic],
+            max_pending=int(conf.get("relay_consumer_max_pending", DEFAULT_MAX_PENDING)),
         )
 
         relay_state.threads.append(consumer_thread)
@@ -135,7 +145,7 @@ def bind_manager_to_relay(manager, relay_state: RelayState, relay_url, conf, rel
                 "Publishing Pulsar state change with status %s for job_id %s via relay",
                 new_status, job_id,
             )
-            payload = manager_endpoint_util.full_status(manager, new_status, job_id)
+            payload = status_requests.full_status(new_status, job_id)
             if outbox is not None:
                 outbox.enqueue(payload)
                 return
@@ -157,6 +167,9 @@ def start_consumer(
     topics,
     handlers,
     long_poll_timeout=DEFAULT_RELAY_LONG_POLL_TIMEOUT,
+    workers=DEFAULT_RELAY_CONSUMER_WORKERS,
+    priority_topics=(),
+    max_pending=DEFAULT_MAX_PENDING,
 ):
     """Start a consumer thread that polls for messages.
 
@@ -165,10 +178,24 @@ def start_consumer(
         relay_state: RelayState for checking if consumer should continue
         topics: List of topics to subscribe to
         handlers: Dict mapping topics to handler functions
+        workers: Number of threads handling messages - if more than one,
+            messages are handled concurrently across jobs (in order for
+            each job) by a RelayMessageDispatcher
+        priority_topics: Topics whose messages are handled before others
+            when workers > 1
+        max_pending: Messages buffered for the workers before polling
+            blocks when workers > 1
 
     Returns:
         Thread object
     """
+    dispatcher = None
+    if workers > 1:
+        dispatcher = RelayMessageDispatcher(
+            handlers, workers, priority_topics=priority_topics, max_pending=max_pending, name="relay-%s" % topics[0],
+        )
+        relay_state.dispatchers.append(dispatcher)
+
     def consume():
         log.info("Starting relay consumer for topics: %s", topics)
 
@@ -180,6 +207,10 @@ def start_consumer(
                     topic = message.get('topic')
                     payload = message.get('payload', {})
 
+                    if dispatcher is not None:
+                        dispatcher.dispatch(topic, payload)
+                        continue
+
                     handler = handlers.get(topic)
                     if handler:
                         try:
@@ -229,11 +260,11 @@ def __process_setup_message(manager, body):
         log.exception("Failed to process setup message for job_id %s", job_id)
 
 
-def __process_status_message(manager, body):
+def __process_status_message(status_requests, body):
     """Process a status request message.
 
     Args:
-        manager: Job manager instance
+        status_requests: StatusRequestCoalescer of the job manager
         body: Message payload containing job_id
     """
     job_id = __client_job_id_from_body(body)
@@ -243,7 +274,7 @@ def __process_status_message(manager, body):
 
     try:
         log.debug("Processing status request for job_id %s", job_id)
-        manager.trigger_state_change_callback(job_id)
+        status_requests.trigger_state_change_callback(job_id)
     except Exception:
         log.exception("Failed to process status message for job_id %s", job_id)
 
@@ -17,12 +17,17 @@ import logging
 import os
 import threading
 import uuid
+from collections import OrderedDict
 from time import time
 from typing import (
     Any,
     Callable,
     Dict,
+    IO,
+    List,
     Optional,
+    Tuple,
+    Union,
 )
 
 log = logging.getLogger(__name__)
@@ -31,6 +36,10 @@ DEFAULT_DRAIN_INTERVAL = 5.0
 ENTRY_SUFFIX = ".json"
 TMP_SUFFIX = ".tmp"
 SEQ_WIDTH = 20  # zero-padded so lexical sort == numeric sort
+SEGMENT_SUFFIX = ".log"
+DEFAULT_SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+DEFAULT_OUTBOX_BACKEND = "directory"
+DEFAULT_BATCH_SIZE = 1
 
 
 class StatusUpdateOutbox:
@@ -44,6 +53,11 @@ class StatusUpdateOutbox:
     is still responsible for collapsing legitimate duplicates and for
     refusing to regress past a terminal status — see the recorder under
     ``test/resilience/mock_galaxy/`` for the canonical Galaxy-side pattern.
+
+    If ``publish_batch_fn`` is given and ``batch_size`` is greater than 1,
+    entries are published ``batch_size`` at a time through it. It must return
+    the number of leading payloads that were confirmed, only those entries
+    are removed and the pass stops at the first unconfirmed one.
     """
 
     def __init__(
@@ -51,10 +65,14 @@ class StatusUpdateOutbox:
         store_directory: str,
         publish_fn: Callable[[Dict[str, Any]], Any],
         drain_interval: float = DEFAULT_DRAIN_INTERVAL,
+        publish_batch_fn: Optional[Callable[[List[Dict[str, Any]]], int]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ) -> None:
         self._store_dir = os.path.abspath(store_directory)
         os.makedirs(self._store_dir, exist_ok=True)
         self._publish_fn = publish_fn
+        self._publish_batch_fn = publish_batch_fn if batch_size > 1 else None
+        self._batch_size = batch_size
         self._drain_interval = drain_interval
         self._wakeup = threading.Event()
         self._stopping = threading.Event()
@@ -144,10 +162,13 @@ class StatusUpdateOutbox:
         """
         with self._lock:
             entries = self._list()
-        for entry in entries:
-            if self._stopping.is_set():
-                break
-            self._try_publish(entry)
+        if self._publish_batch_fn is not None:
+            self._publish_batches(entries)
+        else:
+            for entry in entries:
+                if self._stopping.is_set():
+                    break
+                self._try_publish(entry)
         with self._lock:
             return len(self._list())
 
@@ -172,19 +193,47 @@ class StatusUpdateOutbox:
         # _filename() with the monotonic seq prefix.
         return os.path.join(self._store_dir, message_id + ENTRY_SUFFIX)
 
-    def _try_publish(self, filename: str) -> None:
-        path = os.path.join(self._store_dir, filename)
+    def _read_entry(self, path: str) -> Optional[Dict[str, Any]]:
         try:
             with open(path) as fh:
-                record = json.load(fh)
+                return json.load(fh)
         except FileNotFoundError:
-            return
+            return None
         except (OSError, json.JSONDecodeError):
             log.exception("Corrupt outbox entry %s, removing", path)
             try:
                 os.unlink(path)
             except OSError:
                 pass
+            return None
+
+    def _publish_batches(self, filenames: List[str]) -> None:
+        assert self._publish_batch_fn is not None
+        for start in range(0, len(filenames), self._batch_size):
+            if self._stopping.is_set():
+                break
+            paths = []
+            payloads = []
+            for filename in filenames[start:start + self._batch_size]:
+                path = os.path.join(self._store_dir, filename)
+                record = self._read_entry(path)
+                if record is not None:
+                    paths.append(path)
+                    payloads.append(record["payload"])
+            published = _publish_batch(self._publish_batch_fn, payloads)
+            for path in paths[:published]:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    log.exception("Failed to remove outbox entry after successful publish: %s", path)
+            if published < len(payloads):
+                log.warning("Outbox batch publish confirmed %d of %d messages; will retry on next drain pass", published, len(payloads))
+                break
+
+    def _try_publish(self, filename: str) -> None:
+        path = os.path.join(self._store_dir, filename)
+        record = self._read_entry(path)
+        if record is None:
             return
         # publish_fn is a user-supplied callback (kombu publish, HTTP POST,
         # etc.) — its failure modes are not enumerable from here, so we
@@ -222,15 +271,384 @@ class StatusUpdateOutbox:
         log.info("Status update outbox drain thread exiting (dir=%s)", self._store_dir)
 
 
+class SegmentLogOutbox:
+    """At-least-once persistent outbox backed by an append-only segment log.
+
+    Same semantics and FIFO ordering as :class:`StatusUpdateOutbox`, but
+    rather than one file per message, each enqueued payload is appended as a
+    JSON line to the current ``<n>.log`` segment and each successful publish
+    appends an acknowledgement record. Only the segment and byte offset of
+    each pending message are held in memory - payloads are read back from
+    the log as they are published - segments are fsync'ed once per drain
+    pass rather than per message and rolled over after ``segment_max_bytes``.
+    Segments are deleted oldest first once every message in them has been
+    acknowledged. ``.json`` entries left by a StatusUpdateOutbox in the same
+    directory are imported on startup. ``publish_batch_fn`` and
+    ``batch_size`` behave as for StatusUpdateOutbox.
+    """
+
+    def __init__(
+        self,
+        store_directory: str,
+        publish_fn: Callable[[Dict[str, Any]], Any],
+        drain_interval: float = DEFAULT_DRAIN_INTERVAL,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        publish_batch_fn: Optional[Callable[[List[Dict[str, Any]]], int]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self._store_dir = os.path.abspath(store_directory)
+        os.makedirs(self._store_dir, exist_ok=True)
+        self._publish_fn = publish_fn
+        self._publish_batch_fn = publish_batch_fn if batch_size > 1 else None
+        self._batch_size = batch_size
+        self._drain_interval = drain_interval
+        self._segment_max_bytes = segment_max_bytes
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        # Guards the pending index and the segment files.
+        self._lock = threading.Lock()
+        # Serializes drain passes (background thread vs. stop()).
+        self._drain_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # seq -> (segment number, byte offset of its record), in enqueue order.
+        self._pending: "OrderedDict[int, Tuple[int, int]]" = OrderedDict()
+        # segment number -> number of unacknowledged messages in it.
+        self._segment_pending: Dict[int, int] = {}
+        self._segment: Optional[IO[bytes]] = None
+        self._segment_number = 0
+        self._dirty = False
+        self._next_seq = 0
+        self._load()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        thread_name = "status-outbox-%s" % os.path.basename(self._store_dir.rstrip(os.sep))
+        self._thread = threading.Thread(target=self._run, name=thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout if timeout is not None else 1.0)
+        was_stopping = self._stopping.is_set()
+        self._stopping.clear()
+        try:
+            self.drain_once()
+        except OSError:
+            log.exception("Final drain on outbox stop failed")
+        if was_stopping:
+            self._stopping.set()
+        with self._lock:
+            try:
+                self._sync()
+            except OSError:
+                log.exception("Failed to sync outbox segment on stop")
+
+    def enqueue(self, payload: Dict[str, Any]) -> None:
+        """Append payload to the log and trigger an immediate drain pass.
+
+        Never raises. If the publish fails, the payload remains in the log and
+        the drain loop will keep retrying.
+        """
+        with self._lock:
+            record = {"id": uuid.uuid4().hex, "seq": self._next_seq, "payload": payload, "ts": time()}
+            try:
+                self._append(record)
+                persisted = True
+            except (OSError, TypeError, ValueError):
+                log.exception("Failed to persist status update to outbox %s", self._store_dir)
+                persisted = False
+            else:
+                self._next_seq += 1
+        if not persisted:
+            try:
+                self._publish_fn(payload)
+            except Exception:
+                log.exception("Direct publish failed for unwriteable outbox payload")
+            return
+        self._wakeup.set()
+
+    def drain_once(self) -> int:
+        """Attempt to publish all currently pending messages once.
+
+        Returns the number of messages still pending after the pass.
+        """
+        with self._drain_lock:
+            with self._lock:
+                # Make everything about to be published durable first, so an
+                # acknowledgement is never on disk without its message.
+                self._sync()
+                entries = list(self._pending.items())
+            with _SegmentReader(self._segment_path) as reader:
+                if self._publish_batch_fn is not None:
+                    self._publish_batches(reader, entries)
+                else:
+                    self._publish_singly(reader, entries)
+            with self._lock:
+                self._sync()
+                self._delete_acknowledged_segments()
+                return len(self._pending)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _publish_singly(self, reader: "_SegmentReader", entries: List[Tuple[int, Tuple[int, int]]]) -> None:
+        for seq, location in entries:
+            if self._stopping.is_set():
+                break
+            try:
+                payload = self._read_payload(reader, seq, location)
+            except OSError as exc:
+                log.warning("Failed to read outbox message %s back from its segment; will retry on next drain pass: %s", seq, exc)
+                continue
+            if payload is None:
+                continue
+            try:
+                self._publish_fn(payload)
+            except Exception as exc:
+                log.warning(
+                    "Outbox publish failed for message %s; will retry on next drain pass: %s",
+                    seq, exc,
+                )
+                continue
+            with self._lock:
+                self._acknowledge(seq)
+
+    def _publish_batches(self, reader: "_SegmentReader", entries: List[Tuple[int, Tuple[int, int]]]) -> None:
+        assert self._publish_batch_fn is not None
+        for start in range(0, len(entries), self._batch_size):
+            if self._stopping.is_set():
+                break
+            batch = []
+            unreadable = False
+            for seq, location in entries[start:start + self._batch_size]:
+                try:
+                    payload = self._read_payload(reader, seq, location)
+                except OSError as exc:
+                    # Publish what precedes it, so messages stay in order.
+                    log.warning("Failed to read outbox message %s back from its segment; will retry on next drain pass: %s", seq, exc)
+                    unreadable = True
+                    break
+                if payload is not None:
+                    batch.append((seq, payload))
+            published = _publish_batch(self._publish_batch_fn, [payload for _, payload in batch]) if batch else 0
+            with self._lock:
+                for seq, _ in batch[:published]:
+                    self._acknowledge(seq)
+            if published < len(batch):
+                log.warning("Outbox batch publish confirmed %d of %d messages; will retry on next drain pass", published, len(batch))
+                break
+            if unreadable:
+                break
+
+    def _read_payload(self, reader: "_SegmentReader", seq: int, location: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+        # OSErrors (e.g. running out of file descriptors) may be transient, so
+        # they are left to the caller and the message is retried.
+        try:
+            return reader.read(*location)["payload"]
+        except (ValueError, KeyError, TypeError):
+            # A record that doesn't decode will never become publishable -
+            # drop it rather than retry.
+            log.exception("Failed to decode outbox message %s read back from its segment, dropping it", seq)
+            with self._lock:
+                self._acknowledge(seq)
+            return None
+
+    def _load(self) -> None:
+        segment_numbers = self._segment_numbers()
+        acknowledged = set()
+        for segment_number in segment_numbers:
+            path = self._segment_path(segment_number)
+            with open(path, "rb") as fh:
+                while True:
+                    offset = fh.tell()
+                    line = fh.readline()
+                    if not line:
+                        break
+                    try:
+                        record = json.loads(line)
+                        seq = int(record["seq"])
+                    except (ValueError, KeyError, TypeError):
+                        # Most likely a record truncated by a crash mid-write.
+                        log.warning("Skipping unreadable outbox record in %s: %r", path, line)
+                        continue
+                    self._next_seq = max(self._next_seq, seq + 1)
+                    if record.get("ack"):
+                        acknowledged.add(seq)
+                    elif "payload" in record:
+                        self._pending[seq] = (segment_number, offset)
+        for seq in acknowledged:
+            self._pending.pop(seq, None)
+        self._pending = OrderedDict(sorted(self._pending.items()))
+        for segment_number in segment_numbers:
+            self._segment_pending[segment_number] = 0
+        for segment_number, _ in self._pending.values():
+            self._segment_pending[segment_number] += 1
+        self._segment_number = segment_numbers[-1] + 1 if segment_numbers else 0
+        self._open_segment()
+        self._import_entry_files()
+        self._delete_acknowledged_segments()
+
+    def _import_entry_files(self) -> None:
+        names = sorted(f for f in os.listdir(self._store_dir) if f.endswith(ENTRY_SUFFIX))
+        imported = []
+        for name in names:
+            path = os.path.join(self._store_dir, name)
+            try:
+                with open(path) as fh:
+                    payload = json.load(fh)["payload"]
+            except (OSError, ValueError, KeyError, TypeError):
+                log.exception("Corrupt outbox entry %s, removing", path)
+            else:
+                self._append({"id": uuid.uuid4().hex, "seq": self._next_seq, "payload": payload, "ts": time()})
+                self._next_seq += 1
+            imported.append(path)
+        if imported:
+            self._sync()
+            log.info("Imported %d outbox entries into segment log %s", len(imported), self._store_dir)
+        for path in imported:
+            try:
+                os.unlink(path)
+            except OSError:
+                log.exception("Failed to remove imported outbox entry %s", path)
+
+    def _segment_numbers(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self._store_dir):
+            if name.endswith(SEGMENT_SUFFIX):
+                try:
+                    numbers.append(int(name[:-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(numbers)
+
+    def _segment_path(self, segment_number: int) -> str:
+        return os.path.join(self._store_dir, f"{segment_number:0{SEQ_WIDTH}d}{SEGMENT_SUFFIX}")
+
+    def _open_segment(self) -> None:
+        # Caller must hold self._lock (or be the constructor).
+        if self._segment is not None:
+            self._sync()
+            self._segment.close()
+        self._segment = open(self._segment_path(self._segment_number), "ab")
+        self._segment_pending.setdefault(self._segment_number, 0)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        # Caller must hold self._lock (or be the constructor).
+        assert self._segment is not None
+        if self._segment.tell() >= self._segment_max_bytes:
+            self._segment_number += 1
+            self._open_segment()
+        offset = self._segment.tell()
+        self._segment.write((json.dumps(record) + "\n").encode("utf-8"))
+        self._segment.flush()
+        self._dirty = True
+        if "payload" in record:
+            self._pending[record["seq"]] = (self._segment_number, offset)
+            self._segment_pending[self._segment_number] += 1
+
+    def _acknowledge(self, seq: int) -> None:
+        # Caller must hold self._lock.
+        segment_number, _ = self._pending.pop(seq)
+        self._segment_pending[segment_number] -= 1
+        try:
+            self._append({"seq": seq, "ack": True})
+        except OSError:
+            # Message is delivered at least once more after a restart.
+            log.exception("Failed to record outbox acknowledgement for message %s", seq)
+
+    def _sync(self) -> None:
+        # Caller must hold self._lock.
+        if self._segment is not None and self._dirty:
+            os.fsync(self._segment.fileno())
+            self._dirty = False
+
+    def _delete_acknowledged_segments(self) -> None:
+        # Caller must hold self._lock. Only the oldest segments are deleted,
+        # so acknowledgements are never dropped while their messages remain.
+        for segment_number in sorted(self._segment_pending):
+            if segment_number == self._segment_number or self._segment_pending[segment_number]:
+                break
+            try:
+                os.unlink(self._segment_path(segment_number))
+            except OSError:
+                log.exception("Failed to remove acknowledged outbox segment %s", segment_number)
+                break
+            del self._segment_pending[segment_number]
+
+    def _run(self) -> None:
+        log.info("Status update outbox drain thread starting (dir=%s)", self._store_dir)
+        try:
+            remaining = self.drain_once()
+            if remaining:
+                log.info("Outbox %s has %d pending messages to retry", self._store_dir, remaining)
+        except OSError:
+            log.exception("Initial outbox drain failed")
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=self._drain_interval)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            try:
+                self.drain_once()
+            except OSError:
+                log.exception("Outbox drain pass failed")
+        log.info("Status update outbox drain thread exiting (dir=%s)", self._store_dir)
+
+
+class _SegmentReader:
+    """Read records back from segments by byte offset, keeping each segment
+    open for the duration of a drain pass.
+    """
+
+    def __init__(self, segment_path: Callable[[int], str]) -> None:
+        self._segment_path = segment_path
+        self._files: Dict[int, IO[bytes]] = {}
+
+    def read(self, segment_number: int, offset: int) -> Dict[str, Any]:
+        if segment_number not in self._files:
+            self._files[segment_number] = open(self._segment_path(segment_number), "rb")
+        fh = self._files[segment_number]
+        fh.seek(offset)
+        return json.loads(fh.readline())
+
+    def __enter__(self) -> "_SegmentReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        for fh in self._files.values():
+            fh.close()
+        self._files.clear()
+
+
+def _publish_batch(publish_batch_fn: Callable[[List[Dict[str, Any]]], int], payloads: List[Dict[str, Any]]) -> int:
+    # As with publish_fn, failure modes of the callback are not enumerable.
+    try:
+        return max(0, min(int(publish_batch_fn(payloads)), len(payloads)))
+    except Exception as exc:
+        log.warning("Outbox batch publish failed; will retry on next drain pass: %s", exc)
+        return 0
+
+
 def build_status_outbox(
     manager: Any,
     conf: Dict[str, Any],
     publish_fn: Callable[[Dict[str, Any]], Any],
     suffix: str = "status-outbox",
-) -> Optional["StatusUpdateOutbox"]:
-    """Construct a StatusUpdateOutbox for the given manager, or None if persistence
+    publish_batch_fn: Optional[Callable[[List[Dict[str, Any]]], int]] = None,
+) -> Optional[Union["StatusUpdateOutbox", "SegmentLogOutbox"]]:
+    """Construct a status update outbox for the given manager, or None if persistence
     is disabled.
 
+    ``status_outbox_backend: segment`` selects a :class:`SegmentLogOutbox`,
+    the default (``directory``) a :class:`StatusUpdateOutbox`. If
+    ``publish_batch_fn`` is given, ``status_outbox_batch_size`` entries are
+    published per call to it.
+
     The outbox is rooted at ``<persistence_directory>/<manager_name>-<suffix>/``.
     If the manager has no persistence_directory configured (i.e. the operator
     explicitly opted out), returns ``None`` and the caller should fall back to
@@ -247,6 +665,18 @@ def build_status_outbox(
         return None
     drain_interval = float(conf.get("status_outbox_drain_interval", DEFAULT_DRAIN_INTERVAL))
     store_dir = os.path.join(persistence_directory, "%s-%s" % (manager.name, suffix))
-    outbox = StatusUpdateOutbox(store_dir, publish_fn, drain_interval=drain_interval)
+    backend = conf.get("status_outbox_backend", DEFAULT_OUTBOX_BACKEND)
+    batch_kwds: Dict[str, Any] = {}
+    if publish_batch_fn is not None:
+        batch_kwds["publish_batch_fn"] = publish_batch_fn
+        batch_kwds["batch_size"] = int(conf.get("status_outbox_batch_size", DEFAULT_BATCH_SIZE))
+    outbox: Union[StatusUpdateOutbox, SegmentLogOutbox]
+    if backend == "segment":
+        segment_max_bytes = int(conf.get("status_outbox_segment_max_bytes", DEFAULT_SEGMENT_MAX_BYTES))
+        outbox = SegmentLogOutbox(store_dir, publish_fn, drain_interval=drain_interval, segment_max_bytes=segment_max_bytes, **batch_kwds)
+    elif backend == "directory":
+        outbox = StatusUpdateOutbox(store_dir, publish_fn, drain_interval=drain_interval, **batch_kwds)
+    else:
+        raise Exception("Unknown status_outbox_backend [%s]" % backend)
     outbox.start()
     return outbox
@@ -0,0 +1,133 @@
+"""Concurrent handling of control messages received from pulsar-relay.
+
+A RelayMessageDispatcher runs message handlers on a pool of worker threads so
+one slow handler (e.g. setting up a large job) doesn't hold up the messages of
+other jobs. Messages for the same job are handled one at a time in the order
+they were received, and jobs with a pending message from a priority topic
+(e.g. kill requests) are handled before other jobs waiting for a worker.
+
+The relay cursor has already moved past queued messages, so stopping the
+dispatcher waits for all of them to be handled unless given a timeout.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 1000
+
+
+class RelayMessageDispatcher:
+    """ Dispatch ``(topic, payload)`` messages to ``handlers`` on ``workers``
+    threads, serialized per ``job_id``.
+    """
+
+    def __init__(self, handlers, workers, priority_topics=(), max_pending=DEFAULT_MAX_PENDING, name="relay"):
+        self.handlers = handlers
+        self.priority_topics = set(priority_topics)
+        self.max_pending = max_pending
+        self._condition = threading.Condition()
+        # job_id -> deque of (topic, payload) not yet handled.
+        self._pending = {}
+        self._pending_count = 0
+        # Jobs waiting for a worker, those with priority messages first.
+        self._ready_priority = deque()
+        self._ready = deque()
+        # Jobs a worker is currently handling a message of.
+        self._running = set()
+        self._active = True
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(name="%s-dispatch-%d" % (name, i), target=self._work)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def dispatch(self, topic, payload):
+        """ Queue a message, blocking while ``max_pending`` messages are queued.
+        """
+        job_id = payload.get('job_id')
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending_count < self.max_pending or not self._active)
+            if not self._active:
+                log.warning("Dropping message for job_id %s from topic %s, dispatcher stopped", job_id, topic)
+                return
+            self._pending.setdefault(job_id, deque()).append((topic, payload))
+            self._pending_count += 1
+            if job_id not in self._running:
+                self._make_ready(job_id)
+            self._condition.notify_all()
+
+    def stop(self, timeout=None):
+        """ Stop accepting messages, let workers finish those already queued
+        and wait up to ``timeout`` seconds (in total) for them. Messages still
+        queued after that are dropped.
+        """
+        with self._condition:
+            self._active = False
+            self._condition.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        with self._condition:
+            if self._pending_count:
+                log.warning("Dropping %d relay messages not handled before shutdown", self._pending_count)
+                for messages in self._pending.values():
+                    messages.clear()
+                self._pending_count = 0
+                self._ready_priority.clear()
+                self._ready.clear()
+                self._condition.notify_all()
+        for thread in self._threads:
+            if thread.is_alive():
+                log.warning("Failed to join relay dispatch thread [%s].", thread)
+
+    def _make_ready(self, job_id):
+        # Caller must hold self._condition and job_id must not be running.
+        priority = any(topic in self.priority_topics for topic, _ in self._pending[job_id])
+        if priority:
+            if job_id in self._ready:
+                self._ready.remove(job_id)
+            if job_id not in self._ready_priority:
+                self._ready_priority.append(job_id)
+        elif job_id not in self._ready and job_id not in self._ready_priority:
+            self._ready.append(job_id)
+
+    def _next(self):
+        # Caller must hold self._condition.
+        job_id = self._ready_priority.popleft() if self._ready_priority else self._ready.popleft()
+        self._running.add(job_id)
+        topic, payload = self._pending[job_id].popleft()
+        self._pending_count -= 1
+        self._condition.notify_all()
+        return job_id, topic, payload
+
+    def _work(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._ready_priority or self._ready or not self._active)
+                if not (self._ready_priority or self._ready):
+                    return
+                job_id, topic, payload = self._next()
+            try:
+                self._handle(topic, payload)
+            finally:
+                with self._condition:
+                    self._running.discard(job_id)
+                    if self._pending[job_id]:
+                        self._make_ready(job_id)
+                    else:
+                        del self._pending[job_id]
+                    self._condition.notify_all()
+
+    def _handle(self, topic, payload):
+        handler = self.handlers.get(topic)
+        if handler is None:
+            log.warning("No handler found for topic '%s'", topic)
+            return
+        try:
+            handler(payload)
+        except Exception:
+            log.exception("Failed to process message for job_id %s from topic %s", payload.get('job_id', 'unknown'), topic)
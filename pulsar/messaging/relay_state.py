@@ -25,10 +25,15 @@ class RelayState:
         self.active: bool = True
         self.threads: List[threading.Thread] = []
         self.outboxes: list = []
+        self.dispatchers: list = []
 
     def deactivate(self) -> None:
         """Mark the relay state as inactive, signaling consumers to stop."""
         self.active = False
+        # The relay cursor has moved past queued messages, so handle all of
+        # them - this may enqueue status updates, so before stopping outboxes.
+        for dispatcher in self.dispatchers:
+            dispatcher.stop()
         for outbox in self.outboxes:
             try:
                 outbox.stop(timeout=2.0)
@@ -0,0 +1,89 @@
+"""Coalescing of status requests received over a message queue or relay.
+
+Galaxy asks for the status of every job it polls, so many identical status
+requests can arrive for the same job in quick succession. Each one makes the
+manager check the job and publish a status update, which for a finished job
+means reading its standard output and error and walking its directories.
+
+A StatusRequestCoalescer ignores status requests for a job that arrive within
+``status_coalesce_window`` seconds of the last one processed for it
+(the resulting update is already on its way) and reuses the payload last built
+for a finished job while its status is unchanged - keeping the payloads of the
+``status_payload_cache_size`` most recently published finished jobs.
+"""
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from pulsar import manager_endpoint_util
+from pulsar.managers import status
+
+log = logging.getLogger(__name__)
+
+DEFAULT_COALESCE_WINDOW = 0.0
+DEFAULT_PAYLOAD_CACHE_SIZE = 32
+
+
+class StatusRequestCoalescer:
+    """ Stand in for ``manager`` when handling status requests and building
+    status update payloads.
+    """
+
+    @staticmethod
+    def from_conf(manager, conf):
+        return StatusRequestCoalescer(
+            manager,
+            window=float(conf.get("status_coalesce_window", DEFAULT_COALESCE_WINDOW)),
+            payload_cache_size=int(conf.get("status_payload_cache_size", DEFAULT_PAYLOAD_CACHE_SIZE)),
+        )
+
+    def __init__(self, manager, window=DEFAULT_COALESCE_WINDOW, payload_cache_size=DEFAULT_PAYLOAD_CACHE_SIZE):
+        self.manager = manager
+        self.window = window
+        self.payload_cache_size = payload_cache_size
+        self._lock = threading.Lock()
+        # job_id -> time the last processed status request arrived, oldest first.
+        self._requested = OrderedDict()
+        # job_id -> (status, payload) for finished jobs, least recently used first.
+        self._payloads = OrderedDict()
+
+    def trigger_state_change_callback(self, job_id):
+        """ Have the manager publish the status of ``job_id`` unless it was
+        requested less than ``window`` seconds ago.
+        """
+        if self.window > 0:
+            now = time.monotonic()
+            with self._lock:
+                while self._requested and next(iter(self._requested.values())) <= now - self.window:
+                    self._requested.popitem(last=False)
+                if job_id in self._requested:
+                    log.debug("Ignoring status request for job_id %s, already requested within %s seconds", job_id, self.window)
+                    return
+                self._requested[job_id] = now
+        self.manager.trigger_state_change_callback(job_id)
+
+    def full_status(self, job_status, job_id):
+        """ Return the status update payload for ``job_id`` - reusing the last
+        one built if the job is finished and its status has not changed.
+        """
+        if self.payload_cache_size <= 0:
+            return manager_endpoint_util.full_status(self.manager, job_status, job_id)
+        if not status.is_job_done(job_status):
+            with self._lock:
+                self._payloads.pop(job_id, None)
+            return manager_endpoint_util.full_status(self.manager, job_status, job_id)
+        with self._lock:
+            cached = self._payloads.get(job_id)
+            if cached is not None and cached[0] == job_status:
+                self._payloads.move_to_end(job_id)
+                # Publishing may add acknowledgement keys to the payload.
+                return copy.copy(cached[1])
+        payload = manager_endpoint_util.full_status(self.manager, job_status, job_id)
+        with self._lock:
+            self._payloads[job_id] = (job_status, copy.copy(payload))
+            self._payloads.move_to_end(job_id)
+            while len(self._payloads) > self.payload_cache_size:
+                self._payloads.popitem(last=False)
+        return payload
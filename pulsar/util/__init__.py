@@ -2,7 +2,10 @@
 """
 from tempfile import NamedTemporaryFile
 
-BUFFER_SIZE = 4096
+from pulsar.client.util import (
+    BUFFER_SIZE,
+    copy_stream,
+)
 
 
 def copy_to_path(object, path):
@@ -15,11 +18,7 @@ def copy_to_path(object, path):
 
 def _copy_and_close(object, output):
     try:
-        while True:
-            buffer = object.read(BUFFER_SIZE)
-            if not buffer:
-                break
-            output.write(buffer)
+        copy_stream(object, output, BUFFER_SIZE)
     finally:
         output.close()
 
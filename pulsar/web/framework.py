@@ -2,9 +2,11 @@
 Tiny framework used to power Pulsar application, nothing in here is specific to running
 or staging jobs. Mostly deals with routing web traffic and parsing parameters.
 """
+import hashlib
 import inspect
+import os
 import re
-from os.path import exists
+from collections import namedtuple
 
 from webob import (
     exc,
@@ -12,7 +14,21 @@ from webob import (
     Response,
 )
 
-from pulsar.client.util import json_dumps
+from pulsar.client.util import (
+    BUFFER_SIZE,
+    json_dumps,
+)
+
+# Read size used when serving files.
+FILE_RESPONSE_BLOCK_SIZE = BUFFER_SIZE
+
+# Result of a 'file' controller serving only bytes start (inclusive) to stop
+# (exclusive) of the file at path - followed by the hex SHA-256 digest of
+# those bytes if checksum is set.
+FileRange = namedtuple("FileRange", ["path", "start", "stop", "checksum"], defaults=(False,))
+FILE_RANGE_CHECKSUM_LENGTH = 64
+# Result of a 'file' controller streaming the blocks of bytes app_iter yields.
+FileStream = namedtuple("FileStream", ["app_iter"])
 
 
 class RoutingApp:
@@ -30,7 +46,7 @@ class RoutingApp:
         req = Request(environ)
         req.app = self
         for route, method, controller, args in self.routes:
-            if method and not req.method == method:
+            if method and not req.method == method and not self.__head_of_file_route(req, method, controller):
                 continue
             match = route.match(req.path_info)
             if match:
@@ -40,6 +56,10 @@ class RoutingApp:
                 return controller(environ, start_response, **request_args)
         return exc.HTTPNotFound()(environ, start_response)
 
+    def __head_of_file_route(self, req, method, controller):
+        # Allow clients to check the size of a file before (resuming) downloading it.
+        return req.method == "HEAD" and method == "GET" and getattr(controller, "response_type", None) == "file"
+
     def __template_to_regex(self, template):
         var_regex = re.compile(r'''
             \{          # The exact character "{"
@@ -127,9 +147,13 @@ class Controller:
             result = e
         return result
 
-    def __build_response(self, result):
-        if self.response_type == 'file':
-            resp = file_response(result)
+    def __build_response(self, result, environ):
+        if self.response_type == 'file' and isinstance(result, FileRange):
+            resp = file_range_response(result)
+        elif self.response_type == 'file' and isinstance(result, FileStream):
+            resp = Response(app_iter=result.app_iter)
+        elif self.response_type == 'file':
+            resp = file_response(result, environ)
         else:
             resp = Response(body=self.body(result))
         return resp
@@ -143,7 +167,7 @@ class Controller:
                 return access_response
 
             result = self.__execute_request(func, args, req, environ)
-            resp = self.__build_response(result)
+            resp = self.__build_response(result, environ)
 
             return resp(environ, start_response)
 
@@ -166,25 +190,107 @@ class Controller:
         pass
 
 
-def file_response(path):
-    resp = Response()
-    if exists(path):
-        resp.app_iter = FileIterator(path)
-    else:
+def file_response(path, environ=None):
+    """ Build a response serving the file at ``path``.
+
+    The response is conditional - honoring ``Range`` (with a ``206`` partial
+    response), ``If-Range``, ``If-None-Match`` and ``If-Modified-Since``
+    request headers - and complete downloads are handed to the server's
+    ``wsgi.file_wrapper`` if it has one (letting e.g. gunicorn use sendfile).
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        stat = None
+    if stat is None or not os.path.isfile(path):
         raise exc.HTTPNotFound("No file found with path %s." % path)
+    input = open(path, 'rb')
+    file_wrapper = (environ or {}).get('wsgi.file_wrapper')
+    if file_wrapper and 'HTTP_RANGE' not in environ:
+        app_iter = file_wrapper(input, FILE_RESPONSE_BLOCK_SIZE)
+    else:
+        app_iter = FileIterator(input)
+    resp = Response(
+        app_iter=app_iter,
+        content_length=stat.st_size,
+        last_modified=stat.st_mtime,
+        accept_ranges='bytes',
+        conditional_response=True,
+    )
+    resp.etag = "%x-%x" % (stat.st_mtime_ns, stat.st_size)
     return resp
 
 
+def file_range_response(file_range):
+    """ Build a response serving the bytes of a file described by a FileRange.
+    """
+    file_range = _clamp_file_range(file_range)
+    content_length = file_range.stop - file_range.start
+    if file_range.checksum:
+        content_length += FILE_RANGE_CHECKSUM_LENGTH
+    return Response(app_iter=iter_file_range(file_range), content_length=content_length)
+
+
+def iter_file_range(file_range):
+    """ Iterate over the bytes of a file described by a FileRange in blocks.
+    """
+    file_range = _clamp_file_range(file_range)
+    blocks = FileIterator(open(file_range.path, 'rb')).app_iter_range(file_range.start, file_range.stop)
+    if file_range.checksum:
+        blocks = _with_checksum(blocks)
+    return blocks
+
+
+def _clamp_file_range(file_range):
+    if not os.path.isfile(file_range.path):
+        raise exc.HTTPNotFound("No file found with path %s." % file_range.path)
+    stop = min(file_range.stop, os.path.getsize(file_range.path))
+    return file_range._replace(start=min(file_range.start, stop), stop=stop)
+
+
+def _with_checksum(blocks):
+    digest = hashlib.sha256()
+    for block in blocks:
+        digest.update(block)
+        yield block
+    yield digest.hexdigest().encode("ascii")
+
+
 class FileIterator:
+    """ Iterate over a file (or a byte range of it) in large blocks.
+    """
 
-    def __init__(self, path):
-        self.input = open(path, 'rb')
+    def __init__(self, input, block_size=FILE_RESPONSE_BLOCK_SIZE):
+        if isinstance(input, str):
+            input = open(input, 'rb')
+        self.input = input
+        self.block_size = block_size
+        self.remaining = None
+
+    def app_iter_range(self, start, stop):
+        """ Restrict iteration to bytes ``start`` (inclusive) to ``stop``
+        (exclusive) - used by webob to serve ``Range`` requests.
+        """
+        if start:
+            self.input.seek(start)
+        if stop is not None:
+            self.remaining = stop - (start or 0)
+        return self
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        buffer = self.input.read(1024)
+        size = self.block_size
+        if self.remaining is not None:
+            size = min(size, self.remaining)
+        buffer = self.input.read(size) if size > 0 else b""
         if buffer == b"":
+            self.close()
             raise StopIteration
+        if self.remaining is not None:
+            self.remaining -= len(buffer)
         return buffer
+
+    def close(self):
+        self.input.close()
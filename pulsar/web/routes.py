@@ -6,6 +6,16 @@ from webob import exc
 
 from pulsar import __version__ as pulsar_version
 from pulsar.client.action_mapper import path_type
+from pulsar.client.chunked_transfer import (
+    chunk_checksums,
+    ChunkChecksumError,
+    write_chunk,
+)
+from pulsar.client.directory_archive import (
+    extract_archive,
+    iter_archive,
+    UnsafeArchiveError,
+)
 from pulsar.client.job_directory import verify_is_in_directory
 from pulsar.manager_endpoint_util import (
     setup_job,
@@ -17,7 +27,11 @@ from pulsar.util import (
     copy_to_path,
     copy_to_temp,
 )
-from pulsar.web.framework import Controller
+from pulsar.web.framework import (
+    Controller,
+    FileRange,
+    FileStream,
+)
 
 log = logging.getLogger(__name__)
 
@@ -101,6 +115,27 @@ def upload_file(manager, type, file_cache, job_id, name, body, cache_token=None)
     return _handle_upload(file_cache, path, body, cache_token=cache_token)
 
 
+@PulsarController(path="/jobs/{job_id}/files/chunks", method="PUT", response_type='json')
+def upload_file_chunk(manager, type, job_id, name, offset, size, checksum, body):
+    # Part of a file uploaded in parallel chunks, see pulsar.client.chunked_transfer.
+    path = manager.job_directory(job_id).calculate_path(name, type)
+    try:
+        return write_chunk(path, body, int(offset), int(size), checksum)
+    except ChunkChecksumError as e:
+        raise exc.HTTPBadRequest(str(e))
+
+
+@PulsarController(path="/jobs/{job_id}/files/archive", method="POST", response_type='json')
+def upload_archive(manager, type, job_id, body, compression=''):
+    # Files of a directory sent as one tar stream, see pulsar.client.directory_archive.
+    job_directory = manager.job_directory(job_id)
+    try:
+        paths = extract_archive(body, compression, lambda name: job_directory.calculate_path(name, type))
+    except UnsafeArchiveError as e:
+        raise exc.HTTPBadRequest(str(e))
+    return {"paths": paths}
+
+
 @PulsarController(path="/jobs/{job_id}/files/path", method="GET", response_type='json')
 def path(manager, type, job_id, name):
     if type in [path_type.OUTPUT, path_type.OUTPUT_WORKDIR, path_type.OUTPUT_METADATA]:
@@ -115,6 +150,34 @@ def download_output(manager, job_id, name, type=path_type.OUTPUT):
     return _output_path(manager, job_id, name, type)
 
 
+@PulsarController(path="/jobs/{job_id}/files/chunks", method="GET", response_type='file')
+def download_output_chunk(manager, job_id, name, offset, length, type=path_type.OUTPUT, checksum='false'):
+    # With checksum set, the chunk's SHA-256 digest is sent after it.
+    start = int(offset)
+    return FileRange(_output_path(manager, job_id, name, type), start, start + int(length), checksum == 'true')
+
+
+@PulsarController(path="/jobs/{job_id}/files/archive/download", method="POST", response_type='file')
+def download_output_archive(manager, job_id, body, type=path_type.OUTPUT, compression=''):
+    # Names of the files to archive are posted as a JSON list to keep them out of the URL.
+    names = loads(body.read().decode("utf-8"))
+    files = [(_output_path(manager, job_id, name, type), name) for name in names]
+    for path, _ in files:
+        if not os.path.isfile(path):
+            raise exc.HTTPNotFound("No file found with path %s." % path)
+    return FileStream(iter_archive(files, compression))
+
+
+@PulsarController(path="/jobs/{job_id}/files/checksums", method="GET", response_type='json')
+def file_checksums(manager, job_id, name, chunk_size, chunks='', type=path_type.OUTPUT):
+    # Size of a file transferred in chunks and checksums of the (comma separated) chunk indices requested.
+    if type in [path_type.OUTPUT, path_type.OUTPUT_WORKDIR, path_type.OUTPUT_METADATA]:
+        path = _output_path(manager, job_id, name, type)
+    else:
+        path = manager.job_directory(job_id).calculate_path(name, type)
+    return chunk_checksums(path, int(chunk_size), [int(index) for index in chunks.split(",") if index])
+
+
 def output_path(manager, job_id, name, type=path_type.OUTPUT):
     # output_type should be one of...
     #   work_dir, direct
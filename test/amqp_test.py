@@ -2,6 +2,8 @@
 
 import time
 import threading
+from types import SimpleNamespace
+from unittest import mock
 
 import pytest
 
@@ -150,6 +152,17 @@ def test_factory_respects_amqp_durable_string_true():
     assert queue.durable is True
 
 
+@skip_unless_module("kombu")
+def test_factory_respects_amqp_persistent_connection():
+    from pulsar.client import amqp_exchange_factory
+    exchange = amqp_exchange_factory.get_exchange(TEST_CONNECTION, "factory_per_message", {})
+    assert exchange.publish_metrics()["connects"] is None
+    exchange = amqp_exchange_factory.get_exchange(
+        TEST_CONNECTION, "factory_persistent", {"amqp_persistent_connection": "true"},
+    )
+    assert exchange.publish_metrics()["connects"] == 0
+
+
 def test_publish_kwds_no_retry_by_default():
     """Without an explicit opt-in we leave kombu's defaults alone, so existing
     deployments don't get surprise retry behavior; the persistent outbox is
@@ -189,4 +202,166 @@ def test_publish_kwds_explicit_retry_policy_wins_over_defaults():
     assert publish_kwds["retry_policy"]["interval_max"] == DEFAULT_PUBLISH_RETRY_POLICY["interval_max"]
 
 
+@skip_unless_module("kombu")
+@pytest.mark.timeout(15)
+def test_publish_batch():
+    exchange = amqp_exchange.PulsarExchange(TEST_CONNECTION, "manager_batch_test")
+    thread = TestThread("batch_test", exchange)
+    thread.start()
+    time.sleep(0.5)
+    assert exchange.publish_batch("batch_test", ["cow1", "cow2"]) == 2
+    thread.wait_for_message("cow1")
+
+
+@skip_unless_module("kombu")
+@pytest.mark.timeout(15)
+def test_persistent_connection_reuses_connection():
+    exchange = amqp_exchange.PulsarExchange(TEST_CONNECTION, "manager_persistent_test", persistent_connection=True)
+    thread = TestThread("persistent_test", exchange)
+    thread.start()
+    time.sleep(0.5)
+    try:
+        exchange.publish("persistent_test", "cow1")
+        exchange.publish("persistent_test", "cow2")
+        thread.wait_for_message("cow1")
+        metrics = exchange.publish_metrics()
+        assert metrics["connects"] == 1
+        assert metrics["latency"]["count"] == 2
+    finally:
+        exchange.close()
+
+
+@skip_unless_module("kombu")
+def test_persistent_publisher_reconnects_once_on_recoverable_error():
+    exchange = amqp_exchange.PulsarExchange(TEST_CONNECTION, "manager_reconnect_test")
+    publisher = amqp_exchange._PersistentPublisher(exchange)
+    producers = []
+
+    def publish(producer):
+        producers.append(producer)
+        if len(producers) == 1:
+            raise ConnectionResetError()
+
+    publisher.publish(publish)
+    assert publisher.connects == 2
+    assert producers[0] is not producers[1]
+    with pytest.raises(ConnectionResetError):
+        publisher.publish(lambda producer: (_ for _ in ()).throw(ConnectionResetError()))
+    publisher.close()
+
+
+@skip_unless_module("kombu")
+def test_persistent_publish_retry_requests_one_acknowledgement():
+    publish_uuid_store = {}
+    exchange = amqp_exchange.PulsarExchange(
+        TEST_CONNECTION, "manager_retry_ack_test", persistent_connection=True, publish_uuid_store=publish_uuid_store,
+    )
+    publisher = exchange._PulsarExchange__publisher
+    get_producer = publisher._get_producer
+    attempts = []
+
+    def failing_once_get_producer():
+        producer = get_producer()
+        attempts.append(producer)
+        if len(attempts) == 1:
+            producer = mock.Mock()
+            producer.publish.side_effect = ConnectionResetError()
+        return producer
+
+    publisher._get_producer = failing_once_get_producer
+    try:
+        exchange.publish("retry_ack_test", {"cow": 1})
+    finally:
+        exchange.close()
+    assert len(attempts) == 2
+    assert publisher.connects == 2
+    # The retried publish carries the UUID of the first attempt.
+    assert len(publish_uuid_store) == 1
+    ack_uuid, payload = next(iter(publish_uuid_store.items()))
+    assert payload["acknowledge_uuid"] == ack_uuid
+
+
+def test_publish_latency_histogram():
+    histogram = amqp_exchange.PublishLatencyHistogram(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.01, 0.05, 3.0):
+        histogram.observe(seconds)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(3.065)
+    assert snapshot["buckets"] == {"0.01": 2, "0.1": 1, "inf": 1}
+
+
+@skip_unless_module("kombu")
+@pytest.mark.timeout(15)
+def test_consume_many_dispatches_by_queue():
+    exchange1 = amqp_exchange.PulsarExchange(TEST_CONNECTION, "manager_many1_test")
+    exchange2 = amqp_exchange.PulsarExchange(TEST_CONNECTION, "manager_many2_test")
+    received = {}
+    done = threading.Event()
+
+    def callback_for(key):
+        def callback(body, message):
+            received[key] = body
+            message.ack()
+            if len(received) == 3:
+                done.set()
+        return callback
+
+    subscriptions = [
+        (exchange1, "setup", callback_for("setup1")),
+        (exchange1, "kill", callback_for("kill1")),
+        (exchange2, "setup", callback_for("setup2")),
+    ]
+    thread = threading.Thread(
+        target=exchange1.consume_many,
+        args=(subscriptions,),
+        kwargs={"check": CheckUntil(done), "prefetch_counts": {"setup": 1}},
+    )
+    thread.daemon = True
+    thread.start()
+    time.sleep(0.5)
+    exchange1.publish("setup", "cow1")
+    exchange1.publish("kill", "cow2")
+    exchange2.publish("setup", "cow3")
+    assert done.wait(10)
+    thread.join(5)
+    assert received == {"setup1": "cow1", "kill1": "cow2", "setup2": "cow3"}
+
+
+class CheckUntil:
+
+    def __init__(self, event):
+        self.event = event
+
+    def __bool__(self):
+        return not self.event.is_set()
+
+
+def test_parse_consumer_prefetch_counts():
+    from pulsar.messaging.bind_amqp import parse_consumer_prefetch_counts
+    conf = {"amqp_consumer_prefetch_setup": "4", "amqp_consumer_prefetch_status": 10, "amqp_consumer_timeout": 0.2}
+    assert parse_consumer_prefetch_counts(conf) == {"setup": 4, "status": 10}
+
+
+def test_shared_consumer_connects_once_per_broker_url():
+    from pulsar.messaging import bind_amqp
+    exchange1 = SimpleNamespace(url="amqp://broker1//")
+    exchange2 = SimpleNamespace(url="amqp://broker1//")
+    exchange3 = SimpleNamespace(url="amqp://broker2/vhost")
+    queue_state = SimpleNamespace(threads=[], subscriptions=[
+        (exchange1, "setup", None),
+        (exchange2, "setup", None),
+        (exchange3, "setup", None),
+        (exchange3, "kill", None),
+    ])
+    with mock.patch.object(bind_amqp, "start_multi_queue_consumer") as start_multi_queue_consumer:
+        bind_amqp.start_shared_consumer(queue_state, {})
+    consumed = [(args[0], args[1]) for args, _ in start_multi_queue_consumer.call_args_list]
+    assert consumed == [
+        (exchange1, queue_state.subscriptions[:2]),
+        (exchange3, queue_state.subscriptions[2:]),
+    ]
+    assert len(queue_state.threads) == 2
+
+
 __all__ = ["test_amqp"]
@@ -0,0 +1,80 @@
+"""Tests for the acknowledgement UUID stores in ``pulsar.client.util``."""
+import os
+import time
+
+import pytest
+
+from pulsar.client import amqp_exchange_factory
+from pulsar.client.util import (
+    IndexedMessageQueueUUIDStore,
+    MessageQueueUUIDStore,
+)
+
+
+def test_indexed_store_is_dict_like(tmp_path):
+    store = IndexedMessageQueueUUIDStore(str(tmp_path), subdirs=["amqp_ack-test", "publish"])
+    store["u1"] = {"job_id": "1"}
+    assert "u1" in store
+    assert store["u1"] == {"job_id": "1"}
+    assert list(store.keys()) == ["u1"]
+    before = store.get_time("u1")
+    store.set_time("u1")
+    assert store.get_time("u1") >= before
+    del store["u1"]
+    assert "u1" not in store
+    with pytest.raises(KeyError):
+        del store["u1"]
+    with pytest.raises(KeyError):
+        store["u1"]
+    with pytest.raises(KeyError):
+        store.set_time("u1")
+
+
+def test_indexed_store_due_only_returns_old_uuids(tmp_path):
+    store = IndexedMessageQueueUUIDStore(str(tmp_path))
+    store["old1"] = 1
+    store["old2"] = 2
+    cutoff = time.time()
+    time.sleep(0.01)
+    store["new"] = 3
+    assert store.due(cutoff) == ["old1", "old2"]
+    # Still due until republished.
+    assert store.due(cutoff) == ["old1", "old2"]
+    store.set_time("old1")
+    assert store.due(cutoff) == ["old2"]
+
+
+def test_indexed_store_expire(tmp_path):
+    store = IndexedMessageQueueUUIDStore(str(tmp_path))
+    store["old"] = time.time()
+    cutoff = time.time()
+    time.sleep(0.01)
+    store["new"] = time.time()
+    assert store.expire(cutoff) == 1
+    assert list(store.keys()) == ["new"]
+
+
+def test_indexed_store_persists_and_imports_directory_store(tmp_path):
+    subdirs = ["amqp_ack-test", "consume"]
+    legacy = MessageQueueUUIDStore(str(tmp_path), subdirs=subdirs)
+    legacy["legacy"] = 1.0
+
+    store = IndexedMessageQueueUUIDStore(str(tmp_path), subdirs=subdirs)
+    store["u1"] = 2.0
+    store.close()
+    assert not os.path.exists(os.path.join(str(tmp_path), *subdirs))
+
+    store = IndexedMessageQueueUUIDStore(str(tmp_path), subdirs=subdirs)
+    assert sorted(store.keys()) == ["legacy", "u1"]
+    assert store["legacy"] == 1.0
+    store.close()
+
+
+def test_factory_selects_uuid_store(tmp_path):
+    params = {"persistence_directory": str(tmp_path), "amqp_ack_uuid_store": "sqlite", "amqp_ack_consumed_uuid_ttl": "60"}
+    ack_kwds = amqp_exchange_factory.parse_ack_kwds(params, "test")
+    assert isinstance(ack_kwds["publish_uuid_store"], IndexedMessageQueueUUIDStore)
+    assert isinstance(ack_kwds["consume_uuid_store"], IndexedMessageQueueUUIDStore)
+    assert ack_kwds["consumed_uuid_ttl"] == 60.0
+    ack_kwds = amqp_exchange_factory.parse_ack_kwds({"persistence_directory": str(tmp_path)}, "test")
+    assert isinstance(ack_kwds["publish_uuid_store"], MessageQueueUUIDStore)
@@ -0,0 +1,146 @@
+"""Tests for pulsar.client.chunked_transfer."""
+import io
+import json
+import os
+
+import pytest
+
+from pulsar.client.chunked_transfer import (
+    chunk_checksum,
+    ChunkChecksumError,
+    ChunkedTransfer,
+    write_chunk,
+)
+from pulsar.client.client import JobClient
+from pulsar.client.server_interface import HttpPulsarInterface
+from pulsar.client.transport.standard import UrllibTransport
+from .test_utils import test_pulsar_server
+
+
+class _FailingInterface:
+    """ Forward to ``interface``, failing ``chunk_command`` requests for the
+    chunk at ``fail_offset``.
+    """
+
+    def __init__(self, interface, fail_offset=None, chunk_command="download_output_chunk"):
+        self.interface = interface
+        self.fail_offset = fail_offset
+        self.chunk_command = chunk_command
+        self.chunk_offsets = []
+
+    def execute(self, command, args=None, data=None, input_path=None, output_path=None):
+        if command == self.chunk_command:
+            self.chunk_offsets.append(args["offset"])
+            if args["offset"] == self.fail_offset:
+                raise Exception("Simulated transfer failure")
+        return self.interface.execute(command, args, data, input_path, output_path)
+
+
+def test_chunked_upload_and_download(tmp_path):
+    contents = os.urandom(10 * 1000 + 7)
+    with test_pulsar_server() as server:
+        destination_params = {
+            "url": server.application_url,
+            "chunked_transfer_threshold": 1024,
+            "chunked_transfer_chunk_size": 1000,
+            "chunked_transfer_parallelism": 3,
+            "chunked_transfer_manifest_directory": str(tmp_path / "manifests"),
+        }
+        interface = HttpPulsarInterface(destination_params, UrllibTransport())
+        setup_config = json.loads(interface.execute("setup", {"job_id": "1"}).decode("utf-8"))
+        client = JobClient(destination_params, "1", interface)
+
+        input_path = str(tmp_path / "input")
+        with open(input_path, "wb") as f:
+            f.write(contents)
+        staged_path = client.put_file(input_path, "input")["path"]
+        with open(staged_path, "rb") as f:
+            assert f.read() == contents
+        assert os.listdir(str(tmp_path / "manifests")) == []
+
+        with open(os.path.join(setup_config["outputs_directory"], "output"), "wb") as f:
+            f.write(contents[::-1])
+        output_path = str(tmp_path / "output")
+        client.fetch_output(output_path, "output", str(tmp_path), "transfer", "output")
+        with open(output_path, "rb") as f:
+            assert f.read() == contents[::-1]
+        assert os.listdir(str(tmp_path / "manifests")) == []
+
+        # Files smaller than the threshold are transferred in one request.
+        with open(os.path.join(setup_config["outputs_directory"], "small"), "wb") as f:
+            f.write(b"small")
+        small_path = str(tmp_path / "small")
+        client.fetch_output(small_path, "small", str(tmp_path), "transfer", "output")
+        with open(small_path, "rb") as f:
+            assert f.read() == b"small"
+
+
+def test_interrupted_download_resumes(tmp_path):
+    contents = os.urandom(5 * 100)
+    with test_pulsar_server() as server:
+        interface = HttpPulsarInterface({"url": server.application_url}, UrllibTransport())
+        setup_config = json.loads(interface.execute("setup", {"job_id": "2"}).decode("utf-8"))
+        with open(os.path.join(setup_config["outputs_directory"], "output"), "wb") as f:
+            f.write(contents)
+        args = {"job_id": "2", "name": "output", "type": "output"}
+        output_path = str(tmp_path / "output")
+
+        failing = _FailingInterface(interface, fail_offset=300)
+        manifest_directory = str(tmp_path / "manifests")
+        transfer = ChunkedTransfer(failing, threshold=0, chunk_size=100, parallelism=1, max_attempts=2, manifest_directory=manifest_directory)
+        with pytest.raises(Exception):
+            transfer.download(args, output_path)
+        assert failing.chunk_offsets == [0, 100, 200, 300, 300]
+        # The manifest is kept with the client's, not next to the output.
+        assert len(os.listdir(manifest_directory)) == 1
+        assert sorted(os.listdir(str(tmp_path))) == ["manifests", "output"]
+
+        resumed = _FailingInterface(interface)
+        assert ChunkedTransfer(resumed, threshold=0, chunk_size=100, parallelism=2, manifest_directory=manifest_directory).download(args, output_path)
+        assert sorted(resumed.chunk_offsets) == [300, 400]
+        with open(output_path, "rb") as f:
+            assert f.read() == contents
+
+
+def test_interrupted_upload_resumes(tmp_path):
+    contents = os.urandom(5 * 100)
+    input_path = str(tmp_path / "input")
+    with open(input_path, "wb") as f:
+        f.write(contents)
+    manifest_directory = str(tmp_path / "manifests")
+    with test_pulsar_server() as server:
+        interface = HttpPulsarInterface({"url": server.application_url}, UrllibTransport())
+        args = {"job_id": "3", "name": "input", "type": "input"}
+
+        def upload(fail_offset=None):
+            failing = _FailingInterface(interface, fail_offset=fail_offset, chunk_command="upload_file_chunk")
+            transfer = ChunkedTransfer(failing, threshold=0, chunk_size=100, parallelism=1, max_attempts=1, manifest_directory=manifest_directory)
+            return transfer.upload(input_path, args)["path"], failing.chunk_offsets
+
+        interface.execute("setup", {"job_id": "3"})
+        with pytest.raises(Exception):
+            upload(fail_offset=300)
+        path, offsets = upload()
+        assert offsets == [300, 400]
+        with open(path, "rb") as f:
+            assert f.read() == contents
+
+        # A job cleaned and set up again after a failed upload gets every chunk.
+        with pytest.raises(Exception):
+            upload(fail_offset=300)
+        interface.execute("clean", {"job_id": "3"})
+        interface.execute("setup", {"job_id": "3"})
+        path, offsets = upload()
+        assert offsets == [0, 100, 200, 300, 400]
+        with open(path, "rb") as f:
+            assert f.read() == contents
+
+
+def test_write_chunk_verifies_checksum(tmp_path):
+    path = str(tmp_path / "target")
+    write_chunk(path, io.BytesIO(b"World!"), 6, 12, chunk_checksum(b"World!"))
+    with pytest.raises(ChunkChecksumError):
+        write_chunk(path, io.BytesIO(b"Hello "), 0, 12, chunk_checksum(b"Hello!"))
+    write_chunk(path, io.BytesIO(b"Hello "), 0, 12, chunk_checksum(b"Hello "))
+    with open(path, "rb") as f:
+        assert f.read() == b"Hello World!"
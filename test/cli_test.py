@@ -1,7 +1,15 @@
+from shutil import rmtree
+
+from galaxy.util.bunch import Bunch
+
 from pulsar.managers import status
-from pulsar.managers.queued_cli import _CLI_STATE_TO_STATUS
+from pulsar.managers.queued_cli import (
+    _CLI_STATE_TO_STATUS,
+    CliQueueManager,
+)
 from pulsar.managers.util.cli import factory
 from pulsar.managers.util.cli.job import job_states
+from .test_utils import minimal_app_for_managers
 
 
 def test_torque_cli():
@@ -104,6 +112,55 @@ def test_cli_state_to_pulsar_status():
     assert _CLI_STATE_TO_STATUS[job_states.ERROR] == status.FAILED
 
 
+def test_cli_manager_status_sweep():
+    app = minimal_app_for_managers()
+    try:
+        _check_cli_manager_status_sweep(CliQueueManager("test", app, job_plugin="Slurm"))
+    finally:
+        rmtree(app.staging_directory)
+
+
+def _check_cli_manager_status_sweep(manager):
+    shell = _RecordingShell("JOBID ST\n24 PD\n25 R\n")
+    manager.cli_interface = _FakeCliInterface(shell, manager.cli_interface.get_job_interface({"plugin": "Slurm"}))
+    for job_id, external_id in [("1", "24"), ("2", "25"), ("3", "26")]:
+        manager._external_ids[job_id] = external_id
+
+    with manager.status_sweep(["1", "2", "3"]):
+        assert manager.get_status("1") == status.QUEUED
+        assert manager.get_status("2") == status.RUNNING
+        assert len(shell.commands) == 1
+        # Jobs absent from the bulk query fall back to a per-job query.
+        shell.stdout = "slurm_load_jobs error: Invalid job id specified"
+        assert manager.get_status("3") == status.COMPLETE
+        assert shell.commands[-1].endswith("-j 26")
+
+    shell.stdout = "JOBID ST\n24 R\n"
+    assert manager.get_status("1") == status.RUNNING
+    assert len(shell.commands) == 3
+
+
+class _RecordingShell:
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.commands = []
+
+    def execute(self, cmd):
+        self.commands.append(cmd)
+        return Bunch(stdout=self.stdout, stderr="", returncode=0)
+
+
+class _FakeCliInterface:
+
+    def __init__(self, shell, job_interface):
+        self.shell = shell
+        self.job_interface = job_interface
+
+    def get_plugins(self, shell_params, job_params):
+        return self.shell, self.job_interface
+
+
 def __build_job_interface(job_params):
     cli_interface = factory.build_cli_interface()
     _, job = cli_interface.get_plugins({}, job_params)
@@ -1,8 +1,11 @@
 import os
+import threading
 from os import environ
 
 from pulsar.client.manager import (
     ClientManager,
+    RelayClientManager,
+    _latest_status_updates,
     _per_handler_cursor_path,
 )
 
@@ -87,3 +90,99 @@ def test_per_handler_cursor_path_omits_default_manager_name():
     assert _per_handler_cursor_path(
         "/var/lib/galaxy/relay_cursor.json", "handler0",
     ) == "/var/lib/galaxy/relay_cursor-handler0.json"
+
+
+def test_latest_status_updates_keeps_newest_per_job():
+    payloads = [
+        {"job_id": "1", "status": "running"},
+        {"job_id": "2", "status": "running"},
+        {"status": "unknown"},
+        {"job_id": "1", "status": "complete"},
+    ]
+    assert _latest_status_updates(payloads) == [
+        {"job_id": "2", "status": "running"},
+        {"status": "unknown"},
+        {"job_id": "1", "status": "complete"},
+    ]
+
+
+def test_relay_status_updates_delivered_in_batches():
+    client_manager = RelayClientManager(
+        relay_url="http://localhost:1", relay_username="u", relay_password="p", relay_status_batch_size=10,
+    )
+    polled = [
+        [{"payload": {"job_id": "1", "status": "running"}}, {"payload": {"job_id": "2", "status": "running"}}],
+        [{"payload": {"job_id": "1", "status": "complete"}}],
+    ]
+    batches = []
+    delivered = threading.Event()
+    # Hold the callback until everything was polled, so it is delivered together.
+    all_polled = threading.Event()
+
+    def long_poll(topics, timeout):
+        if polled:
+            return polled.pop(0)
+        all_polled.set()
+        client_manager.shutdown_event.wait(1)
+        return []
+
+    def callback(payloads):
+        all_polled.wait(5)
+        batches.append(payloads)
+        delivered.set()
+
+    client_manager.relay_transport.long_poll = long_poll
+    try:
+        client_manager.ensure_has_status_update_batch_callback(callback)
+        assert delivered.wait(5)
+    finally:
+        client_manager.shutdown(ensure_cleanup=True)
+    received = [payload for batch in batches for payload in batch]
+    assert received[-1] == {"job_id": "1", "status": "complete"}
+    assert client_manager.status_cache["1"] == {"job_id": "1", "status": "complete"}
+
+
+def test_relay_status_updates_buffered_at_shutdown_are_delivered():
+    client_manager = RelayClientManager(
+        relay_url="http://localhost:1", relay_username="u", relay_password="p", relay_status_batch_size=2,
+    )
+    polled = [[{"payload": {"job_id": str(i), "status": "running"}} for i in range(6)]]
+    started = threading.Event()
+    release = threading.Event()
+    received = []
+
+    def long_poll(topics, timeout):
+        if polled:
+            return polled.pop(0)
+        client_manager.shutdown_event.wait(1)
+        return []
+
+    def callback(payloads):
+        started.set()
+        release.wait(5)
+        received.extend(payload["job_id"] for payload in payloads)
+
+    client_manager.relay_transport.long_poll = long_poll
+    client_manager.ensure_has_status_update_batch_callback(callback)
+    assert started.wait(5)
+    # Shut down with updates still buffered, they're delivered anyway.
+    threading.Timer(.1, release.set).start()
+    client_manager.shutdown(ensure_cleanup=True)
+    assert received == [str(i) for i in range(6)]
+
+
+def test_relay_status_batch_failure_falls_back_to_single_updates():
+    client_manager = RelayClientManager(relay_url="http://localhost:1", relay_username="u", relay_password="p")
+    received = []
+
+    def callback(payloads):
+        if len(payloads) > 1:
+            raise Exception("Batch failed")
+        if payloads[0]["job_id"] == "2":
+            raise Exception("Bad update")
+        received.append(payloads[0]["job_id"])
+
+    messages = [{"payload": {"job_id": job_id, "status": "running"}} for job_id in ["1", "2", "3"]]
+    client_manager.batch_callback_wrapper(callback, messages)
+    assert received == ["1", "3"]
+    client_manager.shutdown()
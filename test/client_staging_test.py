@@ -1,5 +1,7 @@
 from collections import deque
 import os
+import threading
+import time
 from types import SimpleNamespace
 
 import pytest
@@ -9,6 +11,7 @@ from .test_utils import TempDirectoryTestCase
 from pulsar.client.test.test_common import write_config
 from pulsar.client import submit_job, ClientJobDescription
 from pulsar.client import ClientOutputs
+from pulsar.client.staging import PulsarOutputs
 from pulsar.client.staging.down import ResultsCollector
 from galaxy.tool_util.deps.dependencies import DependenciesDescription
 from galaxy.tool_util.deps.requirements import ToolRequirement
@@ -85,6 +88,43 @@ class TestStager(TempDirectoryTestCase):
         assert uploaded_file1[1] == "input"
         assert uploaded_file1[0] == extra_file
 
+    def test_input_extra_files_archive(self):
+        self.client_job_description.rewrite_paths = True
+        self.client.archive_compression = "gz"
+        self.job_config["system_properties"]["separator"] = "/"
+        extra_files = []
+        for name in ["cow.txt", "moo/cow.txt"]:
+            extra_file = os.path.join(self.input1_files_path, *name.split("/"))
+            os.makedirs(os.path.dirname(extra_file), exist_ok=True)
+            open(extra_file, "w").write("Hello World!")
+            extra_files.append(extra_file)
+        self.client_job_description.command_line = "test.exe %s %s" % tuple(extra_files)
+        self.client.expect_command_line(
+            "test.exe /pulsar/staging/1/inputs/dataset_1_files/cow.txt /pulsar/staging/1/inputs/dataset_1_files/moo/cow.txt"
+        )
+        self._submit()
+        # Both extra files uploaded in one request.
+        assert self.client.put_archives == [
+            ([(extra_files[0], "dataset_1_files/cow.txt"), (extra_files[1], "dataset_1_files/moo/cow.txt")], "input")
+        ]
+        assert not any(put_file[0] in extra_files for put_file in self.client.put_files)
+
+    def test_input_extra_files_archive_failure_falls_back_to_files(self):
+        self.client_job_description.rewrite_paths = True
+        self.client.archive_compression = "gz"
+        self.client.archive_error = Exception("404 Not Found")
+        self.job_config["system_properties"]["separator"] = "/"
+        extra_files = []
+        for name in ["cow.txt", "moo.txt"]:
+            extra_file = os.path.join(self.input1_files_path, name)
+            open(extra_file, "w").write("Hello World!")
+            extra_files.append(extra_file)
+        self.client_job_description.command_line = "test.exe %s %s" % tuple(extra_files)
+        self._submit()
+        assert len(self.client.put_archives) == 1
+        # Both extra files uploaded one at a time instead.
+        assert sorted(put_file[0] for put_file in self.client.put_files) == extra_files
+
     def test_unstructured_rewrite(self):
         self.client_job_description.rewrite_paths = True
         self.client.set_action_map_config(dict(paths=[
@@ -168,6 +208,9 @@ class MockClient:
             '/pulsar/staging/1/inputs/dataset_2.dat',
         ])
         self.put_files = []
+        self.archive_compression = None
+        self.archive_error = None
+        self.put_archives = []
 
     def set_action_map_config(self, config, by_path=True):
         if by_path:
@@ -199,6 +242,12 @@ class MockClient:
         self.put_files.append((path, type, name, contents))
         return {"path": self.put_paths.popleft()}
 
+    def put_archive(self, files, type):
+        self.put_archives.append((sorted(files), type))
+        if self.archive_error is not None:
+            raise self.archive_error
+        return {name: "/pulsar/staging/1/inputs/%s" % name for _, name in files}
+
 
 def _results_collector_with_failing_collect(exc):
     """Build a minimal ResultsCollector whose output collection raises ``exc``."""
@@ -231,3 +280,34 @@ def test_collect_output_reraises_non_403_for_fatal_output_type():
     action = SimpleNamespace(url="http://galaxy.test/api/jobs/1/files?path=/x&file_type=output")
     with pytest.raises(requests.HTTPError):
         rc._collect_output("output", action, "out1")
+
+
+def test_collect_outputs_concurrently():
+    """Outputs are collected on a pool, failures still tracked per output."""
+    collected = []
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def collect_output(results_collector, output_type, action, name):
+        with lock:
+            running.append(name)
+            max_running.append(len(running))
+        time.sleep(.05)
+        with lock:
+            running.remove(name)
+            collected.append(action.path)
+        if action.path == "/galaxy/out3":
+            raise Exception("failed to collect out3")
+        return True
+
+    output_files = ["/galaxy/out%d" % i for i in range(8)]
+    client_outputs = ClientOutputs(working_directory="/galaxy/work", output_files=output_files)
+    pulsar_outputs = PulsarOutputs([], [os.path.basename(f) for f in output_files], [], [])
+    action_mapper = SimpleNamespace(action=lambda source, output_type: SimpleNamespace(path=source["path"]))
+    output_collector = SimpleNamespace(collect_output=collect_output)
+    rc = ResultsCollector(output_collector, action_mapper, client_outputs, pulsar_outputs, max_workers=4)
+    failures = rc.collect()
+    assert sorted(collected) == sorted(output_files)
+    assert max(max_running) == 4
+    assert [str(e) for e in failures] == ["failed to collect out3"]
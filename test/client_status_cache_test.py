@@ -0,0 +1,85 @@
+"""Tests for pulsar.client.status_cache."""
+import os
+from unittest import mock
+
+import pytest
+
+from pulsar.client.status_cache import StatusCache
+
+
+def test_keeps_latest_status_per_job():
+    cache = StatusCache()
+    cache["1"] = {"job_id": "1", "status": "running"}
+    cache["1"] = {"job_id": "1", "status": "complete", "stdout": "hello"}
+    assert len(cache) == 1
+    assert cache["1"]["status"] == "complete"
+    assert cache.get("2") is None
+    assert cache.pop("1")["stdout"] == "hello"
+    assert cache.size_bytes == 0
+    with pytest.raises(KeyError):
+        del cache["1"]
+
+
+def test_evicts_least_recently_used_jobs():
+    cache = StatusCache(max_entries=2)
+    cache["1"] = {"job_id": "1"}
+    cache["2"] = {"job_id": "2"}
+    cache["1"]
+    cache["3"] = {"job_id": "3"}
+    assert sorted(cache) == ["1", "3"]
+
+
+def test_evicts_to_stay_within_byte_budget():
+    cache = StatusCache(max_bytes=300)
+    for job_id in ["1", "2", "3"]:
+        cache[job_id] = {"job_id": job_id, "stdout": "x" * 100}
+    assert sorted(cache) == ["2", "3"]
+    assert cache.size_bytes <= 300
+
+
+def test_expires_old_statuses():
+    cache = StatusCache(ttl=10)
+    with mock.patch("pulsar.client.status_cache.time.time", side_effect=[100.0, 105.0, 120.0]):
+        cache["1"] = {"job_id": "1"}
+        assert cache.get("1") == {"job_id": "1"}
+        assert cache.get("1") is None
+    assert "1" not in cache
+
+
+def test_spills_evicted_statuses_to_disk(tmp_path):
+    cache = StatusCache.from_kwds({"status_cache_max_entries": "1", "status_cache_spill_directory": str(tmp_path)})
+    cache["1"] = {"job_id": "1", "status": "complete"}
+    cache["2"] = {"job_id": "2", "status": "running"}
+    assert len(os.listdir(str(tmp_path))) == 1
+    assert sorted(cache) == ["1", "2"]
+    assert cache["1"] == {"job_id": "1", "status": "complete"}
+    del cache["1"]
+    assert "1" not in cache
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_keeps_final_statuses_without_spill_directory():
+    cache = StatusCache(max_entries=1)
+    cache["1"] = {"job_id": "1", "status": "complete"}
+    cache["2"] = {"job_id": "2", "status": "running"}
+    cache["3"] = {"job_id": "3", "status": "running"}
+    assert sorted(cache) == ["1", "3"]
+    # Only cleaning the job removes it.
+    del cache["1"]
+    cache["4"] = {"job_id": "4", "status": "running"}
+    assert sorted(cache) == ["4"]
+
+
+def test_spilled_statuses_survive_restart(tmp_path):
+    cache = StatusCache(max_entries=1, spill_directory=str(tmp_path))
+    cache["1"] = {"job_id": "1", "status": "complete"}
+    cache["2"] = {"job_id": "2", "status": "complete"}
+    with open(os.path.join(str(tmp_path), "corrupt.json"), "w") as fh:
+        fh.write("{")
+
+    cache = StatusCache(max_entries=1, spill_directory=str(tmp_path))
+    assert list(cache) == ["1"]
+    assert cache["1"] == {"job_id": "1", "status": "complete"}
+    assert len(os.listdir(str(tmp_path))) == 1
+    del cache["1"]
+    assert os.listdir(str(tmp_path)) == []
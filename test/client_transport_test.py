@@ -13,8 +13,10 @@ from pulsar.client.transport.standard import UrllibTransport
 from pulsar.client.transport.curl import PycurlTransport
 from pulsar.client.transport.curl import post_file
 from pulsar.client.transport.curl import get_file
+from pulsar.client.transport.requests import connection_stats
 from pulsar.client.transport.requests import get_file as requests_get_file
 from pulsar.client.transport.requests import post_file as requests_post_file
+from pulsar.client.transport.requests import RequestsTransport
 from pulsar.client.transport.transient import is_transient_http_error
 from pulsar.client.transport.tus import find_tus_endpoint
 from pulsar.client.transport import get_transport
@@ -30,6 +32,14 @@ def test_urllib_transports():
     _test_transport(UrllibTransport())
 
 
+def test_requests_transport():
+    transport = RequestsTransport(pool_size=1)
+    _test_transport(transport)
+    # Requests of a thread reuse its session's connections.
+    requests_made, connections = connection_stats(transport.sessions.session())
+    assert requests_made > connections
+
+
 @skip_unless_module("pycurl")
 def test_pycurl_transport():
     _test_transport(PycurlTransport())
@@ -82,21 +92,46 @@ def test_curl_put_get():
             assert open(output).read() == "helloworld"
 
 
+@skip_unless_module("pycurl")
+def test_curl_pool_reuses_connections():
+    import pycurl
+
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain"), ("Content-Length", "7")])
+        return [b"Test123"]
+
+    with server_for_test_app(TestApp(app)) as server:
+        request_url = server.application_url
+        transport = PycurlTransport(pool_size=1, pool_idle_timeout="60")
+        handles = []
+        for _ in range(2):
+            with transport.pool.handle(request_url) as c:
+                c.setopt(c.WRITEFUNCTION, lambda data: None)
+                c.perform()
+                handles.append((c, c.getinfo(pycurl.NUM_CONNECTS)))
+        assert handles[0][0] is handles[1][0]
+        # Only the first request had to open a connection.
+        assert [connects for _, connects in handles] == [1, 0]
+        assert transport.execute(request_url) == b"Test123"
+        transport.pool.close()
+
+
 def test_urllib_status_code():
-    """The urllib transport must surface the HTTP status code on the raised
-    PulsarClientTransportError so retry classifiers can read it."""
+    """The urllib and requests transports must surface the HTTP status code on
+    the raised PulsarClientTransportError so retry classifiers can read it."""
     with files_server() as (server, directory):
         server_url = server.application_url
         absent_path = os.path.join(directory, f"test_for_GET_absent_{str(uuid4())}")
         request_url = "{}?path={}".format(server_url, absent_path)
-        try:
-            UrllibTransport().execute(request_url, data=None)
-        except PulsarClientTransportError as exc:
-            assert isinstance(exc.transport_code, int) and exc.transport_code >= 400, (
-                f"transport_code should hold the HTTP status, got {exc.transport_code!r}"
-            )
-        else:
-            raise AssertionError("urllib transport did not raise on missing file")
+        for transport in [UrllibTransport(), RequestsTransport()]:
+            try:
+                transport.execute(request_url, data=None)
+            except PulsarClientTransportError as exc:
+                assert isinstance(exc.transport_code, int) and exc.transport_code >= 400, (
+                    f"transport_code should hold the HTTP status, got {exc.transport_code!r}"
+                )
+            else:
+                raise AssertionError("%s did not raise on missing file" % type(transport).__name__)
 
 
 def test_curl_status_code():
@@ -298,6 +333,7 @@ def test_get_transport():
     assert type(get_transport(None, FakeOsModule("0"))) == UrllibTransport
     assert type(get_transport('urllib', FakeOsModule("TRUE"))) == UrllibTransport
     assert type(get_transport('curl', FakeOsModule("TRUE"))) == PycurlTransport
+    assert type(get_transport('requests', FakeOsModule("TRUE"))) == RequestsTransport
 
 
 class FakeOsModule:
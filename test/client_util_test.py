@@ -0,0 +1,32 @@
+"""Tests for the stream copying helpers in ``pulsar.client.util``."""
+import io
+import os
+
+from pulsar.client.util import (
+    copy_stream,
+    copy_to_path,
+)
+
+
+class _ReadOnly:
+
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def read(self, size):
+        return self.data.read(size)
+
+
+def test_copy_stream_uses_readinto_and_read():
+    data = os.urandom(10 * 1024 + 7)
+    for input in [io.BytesIO(data), _ReadOnly(data)]:
+        output = io.BytesIO()
+        assert copy_stream(input, output, buffer_size=1024) == len(data)
+        assert output.getvalue() == data
+
+
+def test_copy_to_path(tmp_path):
+    path = str(tmp_path / "out")
+    copy_to_path(io.BytesIO(b"Hello World!"), path)
+    with open(path, "rb") as f:
+        assert f.read() == b"Hello World!"
@@ -0,0 +1,129 @@
+"""Tests for pulsar.client.directory_archive."""
+import io
+import json
+import os
+import tarfile
+
+import pytest
+
+from pulsar.client.client import JobClient
+from pulsar.client.directory_archive import (
+    extract_archive,
+    iter_archive,
+    UnsafeArchiveError,
+    write_archive,
+)
+from pulsar.client.server_interface import HttpPulsarInterface
+from pulsar.client.transport.standard import UrllibTransport
+from .test_utils import test_pulsar_server
+
+
+def _write_files(directory, contents):
+    files = []
+    for name, data in contents.items():
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        files.append((path, name))
+    return files
+
+
+@pytest.mark.parametrize("compression", ["", "gz"])
+def test_archive_round_trip(tmp_path, compression):
+    contents = {
+        "a.txt": b"Hello World!",
+        "sub/b.dat": os.urandom(10000),
+        "sub/deeper/empty": b"",
+    }
+    files = _write_files(str(tmp_path / "in"), contents)
+    archive = io.BytesIO(b"".join(iter_archive(files, compression)))
+
+    # Archives are readable with the standard library too.
+    with tarfile.open(fileobj=io.BytesIO(archive.getvalue()), mode="r:%s" % compression) as tar:
+        assert sorted(tar.getnames()) == sorted(contents)
+
+    out = str(tmp_path / "out")
+
+    def destination_for(name):
+        if name == "a.txt":
+            return None
+        path = os.path.join(out, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    extracted = extract_archive(archive, compression, destination_for)
+    assert sorted(extracted) == ["sub/b.dat", "sub/deeper/empty"]
+    for name, path in extracted.items():
+        with open(path, "rb") as f:
+            assert f.read() == contents[name]
+    assert not os.path.exists(os.path.join(out, "a.txt"))
+
+
+@pytest.mark.parametrize("name", ["../escape", "/etc/escape", "sub/../../escape", "C:\\escape"])
+def test_unsafe_member_names_rejected(tmp_path, name):
+    archive = _archive_with_member(tarfile.TarInfo(name), b"boo")
+    with pytest.raises(UnsafeArchiveError):
+        extract_archive(archive, "", lambda name: str(tmp_path / "out"))
+    assert not os.path.exists(str(tmp_path / "out"))
+
+    files = _write_files(str(tmp_path), {"safe": b"boo"})
+    with pytest.raises(UnsafeArchiveError):
+        write_archive([(files[0][0], name)], io.BytesIO())
+
+
+def test_links_rejected(tmp_path):
+    member = tarfile.TarInfo("link")
+    member.type = tarfile.SYMTYPE
+    member.linkname = "/etc/passwd"
+    archive = _archive_with_member(member)
+    with pytest.raises(UnsafeArchiveError):
+        extract_archive(archive, "", lambda name: str(tmp_path / name))
+
+
+def test_directory_archive_transfers(tmp_path):
+    with test_pulsar_server() as server:
+        destination_params = {"url": server.application_url, "directory_transfer_mode": "tar.gz"}
+        interface = HttpPulsarInterface(destination_params, UrllibTransport())
+        setup_config = json.loads(interface.execute("setup", {"job_id": "1"}).decode("utf-8"))
+        client = JobClient(destination_params, "1", interface)
+
+        contents = {"dataset_1_files/a.txt": b"a", "dataset_1_files/sub/b.txt": b"b"}
+        files = _write_files(str(tmp_path / "inputs"), contents)
+        paths = client.put_archive(files, "input")
+        assert sorted(paths) == sorted(contents)
+        for name, path in paths.items():
+            assert path == os.path.join(setup_config["inputs_directory"], *name.split("/"))
+            with open(path, "rb") as f:
+                assert f.read() == contents[name]
+
+        working_directory = setup_config["working_directory"]
+        os.makedirs(os.path.join(working_directory, "sub"))
+        for name in ["x.txt", "sub/y.txt"]:
+            with open(os.path.join(working_directory, *name.split("/")), "wb") as f:
+                f.write(name.encode("utf-8"))
+        local_working = str(tmp_path / "working")
+        to_fetch = [(os.path.join(local_working, *name.split("/")), name) for name in ["x.txt", "sub/y.txt"]]
+        fetched = client.fetch_output_archive(to_fetch, "output_workdir")
+        assert sorted(name for name, _ in fetched) == ["sub/y.txt", "x.txt"]
+        for path, name in to_fetch:
+            with open(path, "rb") as f:
+                assert f.read() == name.encode("utf-8")
+
+        # Only outputs are fetched as archives.
+        assert client.fetch_output_archive(to_fetch, "input") == []
+
+
+def test_directory_archive_disabled_by_default(tmp_path):
+    client = JobClient({"url": "http://localhost:8913/"}, "1", None)
+    assert client.put_archive([], "input") is None
+    assert client.fetch_output_archive([], "output") == []
+
+
+def _archive_with_member(member, data=b""):
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        member.size = len(data) if member.isfile() else 0
+        tar.addfile(member, io.BytesIO(data) if member.isfile() else None)
+    archive.seek(0)
+    return archive
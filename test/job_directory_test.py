@@ -1,5 +1,9 @@
 from .test_utils import TempDirectoryTestCase
-from pulsar.managers.base import JobDirectory
+from pulsar.managers.base import (
+    ConsolidatedMetadataStore,
+    JOB_FILE_METADATA,
+    JobDirectory,
+)
 import os
 
 TEST_JOB_ID = "1234"
@@ -25,3 +29,66 @@ class JobDirectoryTestCase(TempDirectoryTestCase):
 
     def prep(self):
         self.job_directory.setup()
+
+
+class ConsolidatedMetadataTestCase(TempDirectoryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.metadata_store = ConsolidatedMetadataStore()
+        self.job_directory = self._job_directory()
+        self.job_directory.setup()
+
+    def _job_directory(self):
+        return JobDirectory(self.temp_directory, TEST_JOB_ID, metadata_store=self.metadata_store)
+
+    def test_metadata(self):
+        assert not self.job_directory.has_metadata("MooCow")
+        self.job_directory.store_metadata("MooCow", True)
+        self.job_directory.store_metadata("pid", "42")
+        assert self.job_directory.has_metadata("MooCow")
+        assert self._job_directory().load_metadata("pid") == "42"
+        assert not self.job_directory.contains_file("MooCow")
+        assert self.job_directory.contains_file(JOB_FILE_METADATA)
+        self.job_directory.remove_metadata("pid")
+        assert not self.job_directory.has_metadata("pid")
+        assert self.job_directory.load_metadata("pid", "default") == "default"
+
+    def test_reads_changes_from_other_writers(self):
+        self.job_directory.store_metadata("final_status", "running")
+        other_directory = JobDirectory(self.temp_directory, TEST_JOB_ID, metadata_store=ConsolidatedMetadataStore())
+        other_directory.store_metadata("final_status", "complete")
+        assert self.job_directory.load_metadata("final_status") == "complete"
+
+    def test_legacy_metadata(self):
+        legacy_directory = JobDirectory(self.temp_directory, TEST_JOB_ID)
+        legacy_directory.store_metadata("launch_config", {"command_line": "echo"})
+        legacy_directory.store_metadata("preprocessed", True)
+        legacy_directory.write_file("postprocessed", "")
+        assert self.job_directory.has_metadata("preprocessed")
+        assert self.job_directory.load_metadata("launch_config") == {"command_line": "echo"}
+
+        self.job_directory.store_metadata("final_status", "complete")
+        assert self.job_directory.contains_file(JOB_FILE_METADATA)
+        legacy_directory.remove_file("launch_config")
+        assert self.job_directory.load_metadata("launch_config") == {"command_line": "echo"}
+        assert self.job_directory.has_metadata("postprocessed")
+        assert self.job_directory.load_metadata("final_status") == "complete"
+
+    def test_delete(self):
+        self.job_directory.store_metadata("MooCow", True)
+        self.job_directory.delete()
+        self.job_directory.setup()
+        assert not self.job_directory.has_metadata("MooCow")
+
+    def test_cache_is_bounded(self):
+        self.metadata_store.cache_size = 2
+        job_directories = []
+        for job_id in ["1", "2", "3"]:
+            job_directory = JobDirectory(self.temp_directory, job_id, metadata_store=self.metadata_store)
+            job_directory.setup()
+            job_directory.store_metadata("final_status", "complete")
+            job_directories.append(job_directory)
+        job_directories[1].load_metadata("final_status")
+        job_directories[0].load_metadata("final_status")
+        assert list(self.metadata_store._cache) == [job_directories[i]._job_file(JOB_FILE_METADATA) for i in [1, 0]]
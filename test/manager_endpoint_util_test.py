@@ -123,3 +123,53 @@ def test_missing_job_id_does_not_short_circuit():
     except Exception:
         pass
     assert mgr.preprocess_and_launch_calls + mgr.handle_failure_calls >= 1
+
+
+class _FinishedJobManager:
+
+    def __init__(self, job_directory):
+        self._jd = job_directory
+        self.stdout_reads = 0
+
+    def job_directory(self, job_id):
+        return self._jd
+
+    def return_code(self, job_id):
+        return 0
+
+    def stdout_contents(self, job_id):
+        self.stdout_reads += 1
+        return b"out"
+
+    def stderr_contents(self, job_id):
+        return b""
+
+    def job_stdout_contents(self, job_id):
+        return b""
+
+    def job_stderr_contents(self, job_id):
+        return b""
+
+    def system_properties(self):
+        return {}
+
+
+def test_final_status_payload_built_once(tmp_path):
+    from pulsar.managers import status
+    from pulsar.managers.base import (
+        JOB_FILE_FINAL_STATUS_PAYLOAD,
+        JobDirectory,
+    )
+
+    job_directory = JobDirectory(str(tmp_path), "j1")
+    job_directory.setup()
+    manager = _FinishedJobManager(job_directory)
+    first = manager_endpoint_util.full_status(manager, status.COMPLETE, "j1")
+    assert first["stdout"] == "out"
+    assert job_directory.contains_file(JOB_FILE_FINAL_STATUS_PAYLOAD)
+    assert manager_endpoint_util.full_status(manager, status.COMPLETE, "j1") == first
+    assert manager.stdout_reads == 1
+    # A different final status is rebuilt, running jobs never use the payload.
+    assert manager_endpoint_util.full_status(manager, status.FAILED, "j1")["status"] == status.FAILED
+    assert manager.stdout_reads == 2
+    assert manager_endpoint_util.full_status(manager, status.RUNNING, "j1") == {"complete": "false", "status": status.RUNNING, "job_id": "j1"}
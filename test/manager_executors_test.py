@@ -0,0 +1,78 @@
+import threading
+import time
+
+from pulsar.managers.executors import (
+    ManagerExecutors,
+    POOL_POSTPROCESS,
+    POOL_PREPROCESS,
+    POOL_PREPROCESS_STAGING,
+)
+
+
+def test_pool_sizes_from_manager_options():
+    executors = ManagerExecutors.from_manager_options("test", preprocess_pool_size="3")
+    assert executors.pool_sizes[POOL_PREPROCESS] == 3
+    assert executors.pool_sizes[POOL_POSTPROCESS] == 10
+
+
+def test_queue_depth_and_drain():
+    executors = ManagerExecutors("test", {POOL_PREPROCESS: 2, POOL_POSTPROCESS: 1})
+    release = threading.Event()
+    finished = []
+
+    def task(i):
+        release.wait()
+        finished.append(i)
+
+    for i in range(5):
+        executors.submit(POOL_PREPROCESS, task, i)
+    time.sleep(.1)
+    metrics = executors.metrics()
+    assert metrics[POOL_PREPROCESS] == {"size": 2, "queue_depth": 3, "running": 2}
+    assert metrics[POOL_POSTPROCESS] == {"size": 1, "queue_depth": 0, "running": 0}
+
+    release.set()
+    executors.shutdown()
+    assert sorted(finished) == [0, 1, 2, 3, 4]
+    assert executors.metrics()[POOL_PREPROCESS]["queue_depth"] == 0
+
+    exception = None
+    try:
+        executors.submit(POOL_PREPROCESS, task, 5)
+    except Exception as e:
+        exception = e
+    assert exception is not None
+
+
+def test_shutdown_timeout():
+    executors = ManagerExecutors("test", {POOL_PREPROCESS: 1})
+    release = threading.Event()
+    executors.submit(POOL_PREPROCESS, release.wait)
+    before = time.time()
+    executors.shutdown(.1)
+    assert time.time() - before < 1
+    release.set()
+
+
+def test_tasks_submit_while_draining():
+    executors = ManagerExecutors("test", {POOL_PREPROCESS: 1, POOL_PREPROCESS_STAGING: 2})
+    started = threading.Event()
+    release = threading.Event()
+    staged = []
+
+    def preprocess():
+        started.set()
+        release.wait()
+        # Runs after shutdown began, the staging actions must still be accepted.
+        futures = [executors.executor(POOL_PREPROCESS_STAGING).submit(staged.append, i) for i in range(3)]
+        return [future.result() for future in futures]
+
+    future = executors.submit(POOL_PREPROCESS, preprocess)
+    queued = executors.submit(POOL_PREPROCESS, preprocess)
+    started.wait()
+    timer = threading.Timer(.1, release.set)
+    timer.start()
+    executors.shutdown()
+    assert future.result() == [None] * 3
+    assert queued.result() == [None] * 3
+    assert sorted(staged) == [0, 0, 1, 1, 2, 2]
@@ -0,0 +1,159 @@
+"""Tests for the per-job poll schedule of ``ManagerMonitor``."""
+import contextlib
+import datetime
+import threading
+import time
+
+from pulsar.managers import status
+from pulsar.managers.stateful import (
+    _JobPollSchedule,
+    ManagerMonitor,
+)
+
+
+class _FakeActiveJobs:
+
+    def __init__(self, active=()):
+        self.active = set(active)
+
+    def active_job_ids(self, active_status=None):
+        return list(self.active)
+
+
+class _FakeStatefulManager:
+    name = "test"
+
+    def __init__(self, statuses, min_polling_interval=0.01, max_polling_interval=0.08, resync_interval=60.0):
+        self.statuses = statuses
+        self.active_jobs = _FakeActiveJobs(statuses.keys())
+        self.min_polling_interval = datetime.timedelta(0, min_polling_interval)
+        self.max_polling_interval = datetime.timedelta(0, max_polling_interval)
+        self.polling_backoff = 2.0
+        self.monitor_resync_interval = resync_interval
+        self.checks = {}
+        self.lock = threading.Lock()
+
+    def get_status(self, job_id):
+        with self.lock:
+            self.checks[job_id] = self.checks.get(job_id, 0) + 1
+        return self.statuses[job_id]
+
+    def status_sweep(self, job_ids):
+        return contextlib.nullcontext()
+
+
+class _Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _tick(monitor, clock, seconds):
+    """Step the monitor once per (fake) second."""
+    for _ in range(seconds):
+        monitor._monitor_active_jobs()
+        clock.now += 1
+
+
+def test_interval_backs_off_and_resets_on_state_change():
+    monitor = ManagerMonitor(_FakeStatefulManager({}))
+    try:
+        schedule = _JobPollSchedule(0.01)
+        assert monitor._next_interval(schedule, status.QUEUED) == 0.01
+        schedule.status = status.QUEUED
+        assert monitor._next_interval(schedule, status.QUEUED) == 0.02
+        schedule.interval = 0.07
+        assert monitor._next_interval(schedule, status.QUEUED) == 0.08
+        assert monitor._next_interval(schedule, status.RUNNING) == 0.01
+    finally:
+        monitor.shutdown(1)
+
+
+def test_only_queued_jobs_back_off():
+    monitor = ManagerMonitor(_FakeStatefulManager({}))
+    try:
+        for job_status in [status.RUNNING, status.PREPROCESSING, status.POSTPROCESSING]:
+            schedule = _JobPollSchedule(0.04)
+            schedule.status = job_status
+            assert monitor._next_interval(schedule, job_status) == 0.01
+    finally:
+        monitor.shutdown(1)
+
+
+def test_failed_check_keeps_interval():
+    monitor = ManagerMonitor(_FakeStatefulManager({}))
+    try:
+        schedule = _JobPollSchedule(0.04)
+        schedule.status = status.QUEUED
+        assert monitor._next_interval(schedule, None) == 0.04
+    finally:
+        monitor.shutdown(1)
+
+
+def test_queued_jobs_polled_less_than_running():
+    manager = _FakeStatefulManager({"queued": status.QUEUED, "running": status.RUNNING}, 1, 8)
+    clock = _Clock()
+    monitor = ManagerMonitor(manager, clock=clock, start=False)
+    _tick(monitor, clock, 50)
+    # Running stays at the minimum interval, queued backs off 1, 2, 4, 8, 8...
+    assert manager.checks == {"running": 50, "queued": 9}
+    metrics = monitor.metrics()
+    assert metrics["queue_depth"] == 2
+    assert metrics["checks"] == 59
+
+
+def test_interval_resets_when_queued_job_starts_running():
+    manager = _FakeStatefulManager({"j1": status.QUEUED}, 1, 8)
+    clock = _Clock()
+    monitor = ManagerMonitor(manager, clock=clock, start=False)
+    _tick(monitor, clock, 16)
+    assert manager.checks["j1"] == 5
+    manager.statuses["j1"] = status.RUNNING
+    # Noticed at the next backed off check (t=23), then checked every second.
+    _tick(monitor, clock, 12)
+    assert manager.checks["j1"] == 10
+
+
+def test_schedule_and_unschedule():
+    manager = _FakeStatefulManager({}, 1, 8, resync_interval=60.0)
+    clock = _Clock()
+    monitor = ManagerMonitor(manager, clock=clock, start=False)
+    _tick(monitor, clock, 1)
+    manager.statuses["new"] = status.RUNNING
+    manager.active_jobs.active.add("new")
+    monitor.schedule_job("new")
+    _tick(monitor, clock, 1)
+    assert manager.checks["new"] == 1
+    monitor.unschedule_job("new")
+    _tick(monitor, clock, 20)
+    assert manager.checks["new"] == 1
+    assert monitor.metrics()["queue_depth"] == 0
+
+
+def test_resync_drops_inactive_jobs():
+    manager = _FakeStatefulManager({"j1": status.RUNNING}, 1, 8, resync_interval=5)
+    clock = _Clock()
+    monitor = ManagerMonitor(manager, clock=clock, start=False)
+    _tick(monitor, clock, 1)
+    assert monitor.metrics()["queue_depth"] == 1
+    manager.active_jobs.active.clear()
+    _tick(monitor, clock, 4)
+    assert monitor.metrics()["queue_depth"] == 1
+    _tick(monitor, clock, 1)
+    assert monitor.metrics()["queue_depth"] == 0
+
+
+def test_monitor_thread_polls_jobs():
+    manager = _FakeStatefulManager({"j1": status.RUNNING})
+    monitor = ManagerMonitor(manager)
+    try:
+        deadline = time.monotonic() + 5
+        while not manager.checks.get("j1") and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        monitor.shutdown(1)
+    assert manager.checks["j1"] > 0
+    assert not monitor.thread.is_alive()
@@ -0,0 +1,64 @@
+import threading
+
+from pulsar.managers.executors import (
+    ManagerExecutors,
+    POOL_POSTPROCESS,
+    POOL_PREPROCESS,
+)
+from pulsar.managers.scheduling import (
+    declared_input_size,
+    GIB,
+    StagingScheduler,
+)
+
+
+def test_declared_input_size():
+    launch_config = {"remote_staging": {"setup": [{"name": "a", "size": 10}, {"name": "b"}, {"name": "c", "size": "5"}]}}
+    assert declared_input_size(launch_config) == 15
+    assert declared_input_size({"remote_staging": None}) == 0
+
+
+def test_postprocessing_and_small_jobs_first():
+    scheduler, executors, release, order = _blocked_scheduler(max_concurrency=1)
+    scheduler.submit(POOL_PREPROCESS, "large", _recorder(order, "large"), input_size=500 * GIB)
+    scheduler.submit(POOL_PREPROCESS, "small", _recorder(order, "small"), input_size=GIB)
+    scheduler.submit(POOL_POSTPROCESS, "post", _recorder(order, "post"))
+    assert scheduler.metrics()[POOL_PREPROCESS] == {"pending": 2, "running": 1}
+    release.set()
+    scheduler.shutdown()
+    executors.shutdown()
+    assert order == ["blocker", "post", "small", "large"]
+
+
+def test_weighted_fair_share():
+    scheduler, executors, release, order = _blocked_scheduler(pool_size=2, submitter_weights={"heavy": 2})
+    # heavy0 runs alongside the blocker right away, afterwards light tasks
+    # go first since heavy still has the blocker running.
+    for i in range(3):
+        scheduler.submit(POOL_PREPROCESS, "heavy%d" % i, _recorder(order, "heavy%d" % i), submitter="heavy")
+    for i in range(2):
+        scheduler.submit(POOL_PREPROCESS, "light%d" % i, _recorder(order, "light%d" % i), submitter="light")
+    release.set()
+    scheduler.shutdown()
+    executors.shutdown()
+    assert order.index("light0") < order.index("heavy2")
+
+
+def _blocked_scheduler(pool_size=1, **kwds):
+    executors = ManagerExecutors("test", {POOL_PREPROCESS: pool_size, POOL_POSTPROCESS: pool_size})
+    scheduler = StagingScheduler(executors, age_weight=0, **kwds)
+    release = threading.Event()
+    order = []
+
+    def blocker():
+        release.wait()
+        order.append("blocker")
+
+    scheduler.submit(POOL_PREPROCESS, "blocker", blocker, submitter="heavy")
+    return scheduler, executors, release, order
+
+
+def _recorder(order, name):
+    def record():
+        order.append(name)
+    return record
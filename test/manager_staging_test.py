@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from os.path import join
+import threading
+import time
+
+from pulsar.managers.staging import preprocess
+from .test_utils import temp_directory
+
+from galaxy.util.bunch import Bunch
+
+
+def test_preprocess_serial():
+    with _job_directory() as job_directory:
+        preprocess(job_directory, _setup_actions(3), _RecordingActionExecutor(), lambda: False)
+        for i in range(3):
+            assert open(job_directory.calculate_path("input%d" % i, "input")).read() == "contents%d" % i
+
+
+def test_preprocess_parallel_respects_per_job_limit():
+    with _job_directory() as job_directory, ThreadPoolExecutor(max_workers=8) as executor:
+        action_executor = _RecordingActionExecutor(delay=.05)
+        preprocess(job_directory, _setup_actions(10), action_executor, lambda: False, executor=executor, max_concurrency=3)
+        for i in range(10):
+            assert open(job_directory.calculate_path("input%d" % i, "input")).read() == "contents%d" % i
+        assert action_executor.max_running == 3
+
+
+def test_preprocess_parallel_raises_first_failure():
+    with _job_directory() as job_directory, ThreadPoolExecutor(max_workers=2) as executor:
+        action_executor = _RecordingActionExecutor(fail_on="input1")
+        exception = None
+        try:
+            preprocess(job_directory, _setup_actions(10), action_executor, lambda: False, executor=executor, max_concurrency=2)
+        except Exception as e:
+            exception = e
+        assert str(exception) == "failed input1"
+        assert len(action_executor.executed) < 10
+
+
+def test_preprocess_parallel_cancellation():
+    with _job_directory() as job_directory, ThreadPoolExecutor(max_workers=2) as executor:
+        action_executor = _RecordingActionExecutor()
+        was_cancelled = lambda: len(action_executor.executed) >= 2  # noqa: E731
+        preprocess(job_directory, _setup_actions(10), action_executor, was_cancelled, executor=executor, max_concurrency=2)
+        assert len(action_executor.executed) < 10
+
+
+class _RecordingActionExecutor:
+
+    def __init__(self, delay=0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.executed = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def execute(self, action, description):
+        with self._lock:
+            self.executed.append(description)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delay)
+            if self.fail_on and ("'%s'" % self.fail_on) in description:
+                raise Exception("failed %s" % self.fail_on)
+            return action()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def _setup_actions(count):
+    return [
+        {"name": "input%d" % i, "type": "input", "action": {"action_type": "message", "contents": "contents%d" % i}}
+        for i in range(count)
+    ]
+
+
+@contextmanager
+def _job_directory():
+    with temp_directory() as directory:
+        yield Bunch(calculate_path=lambda name, input_type: join(directory, name))
@@ -1,5 +1,6 @@
 from pulsar.managers.unqueued import Manager
 
+import time
 from os.path import join
 
 from .test_utils import BaseManagerTestCase, get_failing_user_auth_manager
@@ -65,3 +66,24 @@ class ManagerTest(BaseManagerTestCase):
 
     def test_kill(self):
         self._test_cancelling(self.manager)
+
+    def test_jobs_beyond_pool_sizes_are_reaped(self):
+        self._set_manager(preprocess_pool_size=1, postprocess_pool_size=1)
+        job_ids = []
+        for i in range(3):
+            job_id = self.manager.setup_job(str(200 + i), "tool1", "1.0.0")
+            job_ids.append(job_id)
+        # The first job runs for a long time, the others finish immediately
+        # and must be reaped even though it is still being waited on.
+        self.manager.launch(job_ids[0], self._python_to_command("import time; time.sleep(1000)"))
+        for job_id in job_ids[1:]:
+            self.manager.launch(job_id, self._python_to_command("print(1)"))
+        time_end = time.time() + 10
+        while any(self.manager.get_status(job_id) != "complete" for job_id in job_ids[1:]):
+            assert time.time() < time_end, "Short jobs not reaped"
+            time.sleep(.05)
+        self.manager.kill(job_ids[0])
+        self._assert_status_becomes_cancelled(job_ids[0], self.manager)
+        before = time.time()
+        self.manager.shutdown()
+        assert time.time() - before < 1
@@ -6,13 +6,19 @@ on disk, the drain thread must retry until publish succeeds, and surviving
 on-disk entries must be replayed when a fresh outbox is constructed against
 the same directory (the restart case).
 """
+import errno
 import os
 import threading
 import time
+from unittest import mock
 
 import pytest
 
-from pulsar.messaging.outbox import StatusUpdateOutbox
+from pulsar.messaging.outbox import (
+    _SegmentReader,
+    SegmentLogOutbox,
+    StatusUpdateOutbox,
+)
 
 
 class _Recorder:
@@ -205,3 +211,180 @@ def test_drain_is_fifo_across_restart(tmp_path):
     o2.enqueue({"job_id": "j1", "status": "complete"})
     o2.drain_once()
     assert [p["status"] for p in seen] == ["preprocessing", "running", "complete"]
+
+
+def test_segment_outbox_publishes_and_deletes_acknowledged_segments(tmp_path):
+    recorder = _Recorder()
+    outbox = SegmentLogOutbox(str(tmp_path), recorder, drain_interval=3600, segment_max_bytes=200)
+    try:
+        for i in range(10):
+            outbox.enqueue({"job_id": "j%d" % i, "status": "complete"})
+        assert outbox.pending_count() == 10
+        assert len(os.listdir(str(tmp_path))) > 1
+        assert outbox.drain_once() == 0
+        assert [p["job_id"] for p in recorder.calls] == ["j%d" % i for i in range(10)]
+        # Only the segment currently appended to remains.
+        assert len(os.listdir(str(tmp_path))) == 1
+    finally:
+        outbox.stop()
+
+
+def test_segment_outbox_is_fifo_across_restart(tmp_path):
+    def publish_all_but_preprocessing(payload):
+        if payload["status"] == "preprocessing":
+            raise RuntimeError("simulated broker down")
+
+    o1 = SegmentLogOutbox(str(tmp_path), publish_all_but_preprocessing, drain_interval=3600)
+    for s in ["preprocessing", "running", "complete"]:
+        o1.enqueue({"job_id": "j1", "status": s})
+    assert o1.drain_once() == 1
+    o1.stop()
+
+    seen = []
+    o2 = SegmentLogOutbox(str(tmp_path), seen.append, drain_interval=3600)
+    assert o2.pending_count() == 1
+    o2.enqueue({"job_id": "j2", "status": "complete"})
+    o2.drain_once()
+    assert [(p["job_id"], p["status"]) for p in seen] == [("j1", "preprocessing"), ("j2", "complete")]
+    o2.stop()
+
+
+def test_segment_outbox_skips_truncated_records(tmp_path):
+    o1 = SegmentLogOutbox(str(tmp_path), _Recorder(fail_until_attempt=10**6), drain_interval=3600)
+    o1.enqueue({"job_id": "j1", "status": "complete"})
+    o1.stop()
+    segment = [f for f in os.listdir(str(tmp_path)) if f.endswith(".log")][0]
+    with open(os.path.join(str(tmp_path), segment), "a") as fh:
+        fh.write('{"seq": 1, "payl')
+
+    seen = []
+    o2 = SegmentLogOutbox(str(tmp_path), seen.append, drain_interval=3600)
+    assert o2.drain_once() == 0
+    assert seen == [{"job_id": "j1", "status": "complete"}]
+    o2.stop()
+
+
+def test_segment_outbox_reads_pending_payloads_back_from_log(tmp_path):
+    o1 = SegmentLogOutbox(str(tmp_path), _Recorder(fail_until_attempt=10**6), drain_interval=3600, segment_max_bytes=200)
+    for i in range(5):
+        o1.enqueue({"job_id": "j%d" % i, "status": "complete", "stdout": "é" * i})
+    o1.stop()
+
+    seen = []
+    o2 = SegmentLogOutbox(str(tmp_path), seen.append, drain_interval=3600, segment_max_bytes=200)
+    # Only where each message is in the log is held in memory.
+    assert all(isinstance(segment, int) and isinstance(offset, int) for segment, offset in o2._pending.values())
+    o2.enqueue({"job_id": "j5", "status": "complete"})
+    assert o2.drain_once() == 0
+    assert [p["job_id"] for p in seen] == ["j%d" % i for i in range(6)]
+    assert seen[4]["stdout"] == "é" * 4
+    o2.stop()
+
+
+@pytest.mark.parametrize("batch_size", [1, 10])
+def test_segment_outbox_keeps_messages_it_fails_to_read_back(tmp_path, batch_size):
+    single = _Recorder()
+    batches = _BatchRecorder()
+    outbox = SegmentLogOutbox(str(tmp_path), single, drain_interval=3600, publish_batch_fn=batches, batch_size=batch_size)
+    try:
+        for i in range(3):
+            outbox.enqueue({"job_id": "j%d" % i, "status": "complete"})
+        read = _SegmentReader.read
+        failures = [OSError(errno.EMFILE, "Too many open files")]
+
+        def read_failing_once(reader, segment_number, offset):
+            if offset and failures:
+                raise failures.pop()
+            return read(reader, segment_number, offset)
+
+        with mock.patch.object(_SegmentReader, "read", read_failing_once):
+            assert outbox.drain_once() > 0
+            assert outbox.drain_once() == 0
+        published = single.calls + [payload for batch in batches.batches for payload in batch]
+        # Batches stop at the unreadable message to stay in order.
+        expected = ["j0", "j2", "j1"] if batch_size == 1 else ["j0", "j1", "j2"]
+        assert [p["job_id"] for p in published] == expected
+    finally:
+        outbox.stop()
+
+
+def test_segment_outbox_drops_messages_that_do_not_decode(tmp_path):
+    seen = []
+    outbox = SegmentLogOutbox(str(tmp_path), seen.append, drain_interval=3600)
+    try:
+        outbox.enqueue({"job_id": "j1", "status": "complete"})
+        with mock.patch.object(_SegmentReader, "read", side_effect=ValueError("corrupt")):
+            assert outbox.drain_once() == 0
+        assert seen == []
+    finally:
+        outbox.stop()
+
+
+def test_segment_outbox_imports_directory_entries(tmp_path):
+    o1 = StatusUpdateOutbox(str(tmp_path), _Recorder(fail_until_attempt=10**6), drain_interval=3600)
+    for s in ["running", "complete"]:
+        o1.enqueue({"job_id": "j1", "status": s})
+
+    seen = []
+    o2 = SegmentLogOutbox(str(tmp_path), seen.append, drain_interval=3600)
+    assert not any(f.endswith(".json") for f in os.listdir(str(tmp_path)))
+    o2.drain_once()
+    assert [p["status"] for p in seen] == ["running", "complete"]
+    o2.stop()
+
+
+def test_build_status_outbox_segment_backend(tmp_path):
+    from pulsar.messaging.outbox import build_status_outbox
+
+    class _StubManager:
+        name = "test"
+        persistence_directory = str(tmp_path)
+
+    outbox = build_status_outbox(_StubManager(), {"status_outbox_backend": "segment"}, publish_fn=lambda payload: None)
+    try:
+        assert isinstance(outbox, SegmentLogOutbox)
+    finally:
+        outbox.stop()
+
+
+class _BatchRecorder:
+    def __init__(self, confirm_limit=None):
+        self.batches = []
+        self.confirm_limit = confirm_limit
+
+    def __call__(self, payloads):
+        self.batches.append(list(payloads))
+        if self.confirm_limit is None:
+            return len(payloads)
+        confirmed = min(self.confirm_limit, len(payloads))
+        self.confirm_limit -= confirmed
+        return confirmed
+
+
+@pytest.mark.parametrize("outbox_class", [StatusUpdateOutbox, SegmentLogOutbox])
+def test_batch_publish_removes_only_confirmed_entries(tmp_path, outbox_class):
+    single = _Recorder()
+    batches = _BatchRecorder(confirm_limit=3)
+    outbox = outbox_class(str(tmp_path), single, drain_interval=3600, publish_batch_fn=batches, batch_size=2)
+    try:
+        for i in range(5):
+            outbox.enqueue({"job_id": "j%d" % i, "status": "complete"})
+        # Batches of 2: [j0, j1] confirmed, [j2, j3] only j2 confirmed, pass stops.
+        assert outbox.drain_once() == 2
+        assert [[p["job_id"] for p in batch] for batch in batches.batches] == [["j0", "j1"], ["j2", "j3"]]
+        batches.confirm_limit = None
+        assert outbox.drain_once() == 0
+        assert [p["job_id"] for p in batches.batches[-1]] == ["j3", "j4"]
+        assert single.call_count == 0
+    finally:
+        outbox.stop()
+
+
+def test_batch_publish_failure_keeps_entries(tmp_path):
+    def fail(payloads):
+        raise RuntimeError("simulated broker down")
+
+    outbox = StatusUpdateOutbox(str(tmp_path), _Recorder(), drain_interval=3600, publish_batch_fn=fail, batch_size=10)
+    for i in range(3):
+        outbox.enqueue({"job_id": "j%d" % i, "status": "complete"})
+    assert outbox.drain_once() == 3
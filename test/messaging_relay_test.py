@@ -1,8 +1,12 @@
+import threading
+import time
+
 from pulsar.messaging.bind_relay import (
     DEFAULT_RELAY_LONG_POLL_TIMEOUT,
     _relay_long_poll_timeout,
     start_consumer,
 )
+from pulsar.messaging.relay_dispatch import RelayMessageDispatcher
 from pulsar.messaging.relay_state import RelayState
 
 
@@ -40,3 +44,113 @@ def test_start_consumer_uses_configured_long_poll_timeout():
 
     assert not thread.is_alive()
     assert transport.calls == [(["job_setup"], 1.5)]
+
+
+def test_dispatcher_serializes_messages_per_job():
+    release = threading.Event()
+    handled = []
+    lock = threading.Lock()
+
+    def handler(payload):
+        if payload["job_id"] == "slow":
+            release.wait(5)
+        with lock:
+            handled.append((payload["job_id"], payload["n"]))
+
+    dispatcher = RelayMessageDispatcher({"setup": handler}, workers=2)
+    dispatcher.dispatch("setup", {"job_id": "slow", "n": 1})
+    dispatcher.dispatch("setup", {"job_id": "slow", "n": 2})
+    dispatcher.dispatch("setup", {"job_id": "fast", "n": 1})
+    dispatcher.dispatch("setup", {"job_id": "fast", "n": 2})
+    # The fast job is not held up by the slow one, nor is the slow job's
+    # second message handled before its first completes.
+    assert _wait_for(lambda: len(handled) == 2)
+    assert handled == [("fast", 1), ("fast", 2)]
+    release.set()
+    dispatcher.stop(timeout=5)
+    assert handled[2:] == [("slow", 1), ("slow", 2)]
+
+
+def test_dispatcher_handles_priority_topics_first():
+    release = threading.Event()
+    handled = []
+
+    def handler(payload):
+        if payload["job_id"].startswith("blocker"):
+            release.wait(5)
+        handled.append(payload["job_id"])
+
+    dispatcher = RelayMessageDispatcher({"setup": handler, "kill": handler}, workers=2, priority_topics=["kill"])
+    # Occupy both workers so the following messages queue up.
+    dispatcher.dispatch("setup", {"job_id": "blocker"})
+    dispatcher.dispatch("setup", {"job_id": "blocker2"})
+    dispatcher.dispatch("setup", {"job_id": "a"})
+    dispatcher.dispatch("kill", {"job_id": "b"})
+    release.set()
+    dispatcher.stop(timeout=5)
+    assert handled.index("b") < handled.index("a")
+
+
+def test_dispatcher_stop_drains_queued_messages():
+    handled = []
+
+    def handler(payload):
+        time.sleep(.01)
+        handled.append(payload["job_id"])
+
+    dispatcher = RelayMessageDispatcher({"setup": handler}, workers=2)
+    for i in range(20):
+        dispatcher.dispatch("setup", {"job_id": str(i)})
+    dispatcher.stop()
+    assert sorted(handled, key=int) == [str(i) for i in range(20)]
+
+
+def test_dispatcher_stop_timeout_logs_dropped_messages(caplog):
+    release = threading.Event()
+    started = []
+    handled = []
+
+    def handler(payload):
+        started.append(payload["job_id"])
+        release.wait(5)
+        handled.append(payload["job_id"])
+
+    dispatcher = RelayMessageDispatcher({"setup": handler}, workers=4)
+    for i in range(10):
+        dispatcher.dispatch("setup", {"job_id": str(i)})
+    assert _wait_for(lambda: len(started) == 4)
+    before = time.time()
+    dispatcher.stop(timeout=.2)
+    # One deadline for all workers rather than a timeout per worker.
+    assert time.time() - before < 1
+    assert "Dropping 6 relay messages" in caplog.text
+    release.set()
+    assert _wait_for(lambda: len(handled) == 4)
+    time.sleep(.1)
+    assert len(started) == 4
+
+
+def test_start_consumer_dispatches_to_workers():
+    relay_state = RelayState()
+    handled = threading.Event()
+
+    class _Transport:
+        def long_poll(self, topics, timeout):
+            relay_state.active = False
+            return [{"topic": "job_setup", "payload": {"job_id": "1"}}]
+
+    thread = start_consumer(
+        _Transport(), relay_state, ["job_setup"], {"job_setup": lambda payload: handled.set()}, workers=2,
+    )
+    thread.join(timeout=1)
+    assert handled.wait(5)
+    relay_state.deactivate()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
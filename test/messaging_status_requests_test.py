@@ -0,0 +1,62 @@
+"""Tests for pulsar.messaging.status_requests."""
+from unittest import mock
+
+from pulsar.managers import status
+from pulsar.messaging.status_requests import StatusRequestCoalescer
+
+
+class _TriggerRecorder:
+
+    def __init__(self):
+        self.triggered = []
+
+    def trigger_state_change_callback(self, job_id):
+        self.triggered.append(job_id)
+
+
+def test_duplicate_status_requests_within_window_are_ignored():
+    manager = _TriggerRecorder()
+    coalescer = StatusRequestCoalescer(manager, window=60)
+    for job_id in ["1", "1", "2", "1"]:
+        coalescer.trigger_state_change_callback(job_id)
+    assert manager.triggered == ["1", "2"]
+
+
+def test_status_requests_processed_again_after_window():
+    manager = _TriggerRecorder()
+    coalescer = StatusRequestCoalescer(manager, window=5)
+    with mock.patch("pulsar.messaging.status_requests.time.monotonic", side_effect=[100.0, 102.0, 106.0]):
+        for _ in range(3):
+            coalescer.trigger_state_change_callback("1")
+    assert manager.triggered == ["1", "1"]
+
+
+def test_no_coalescing_by_default():
+    manager = _TriggerRecorder()
+    coalescer = StatusRequestCoalescer.from_conf(manager, {})
+    coalescer.trigger_state_change_callback("1")
+    coalescer.trigger_state_change_callback("1")
+    assert manager.triggered == ["1", "1"]
+
+
+@mock.patch("pulsar.messaging.status_requests.manager_endpoint_util.full_status")
+def test_finished_job_payload_reused_until_status_changes(full_status):
+    full_status.side_effect = lambda manager, job_status, job_id: {"job_id": job_id, "status": job_status}
+    coalescer = StatusRequestCoalescer(object(), payload_cache_size=1)
+
+    payload = coalescer.full_status(status.COMPLETE, "1")
+    # Modifications by the publisher don't leak into the cached payload.
+    payload["acknowledge_uuid"] = "abc"
+    assert coalescer.full_status(status.COMPLETE, "1") == {"job_id": "1", "status": status.COMPLETE}
+    assert full_status.call_count == 1
+
+    # Running payloads are always rebuilt and drop the cached entry.
+    coalescer.full_status(status.RUNNING, "1")
+    coalescer.full_status(status.RUNNING, "1")
+    coalescer.full_status(status.COMPLETE, "1")
+    assert full_status.call_count == 4
+
+    # Least recently used payloads are evicted.
+    coalescer.full_status(status.FAILED, "2")
+    coalescer.full_status(status.COMPLETE, "1")
+    assert full_status.call_count == 6
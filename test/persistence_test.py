@@ -1,9 +1,16 @@
 from contextlib import contextmanager
+from os import listdir, makedirs
 from os.path import exists, join
 import time
 
+from pulsar.managers import status
+from pulsar.managers.job_state_db import JobStateDatabase
 from pulsar.managers.queued import QueueManager
-from pulsar.managers.stateful import StatefulManagerProxy
+from pulsar.managers.stateful import (
+    ACTIVE_STATUS_PREPROCESSING,
+    JournaledActiveJobs,
+    StatefulManagerProxy,
+)
 from pulsar.tools.authorization import get_authorizer
 from .test_utils import (
     temp_directory,
@@ -80,6 +87,157 @@ def test_preprocessing_job_recovery_dirty():
         assert exists(touch_file)
 
 
+def test_launched_job_recovery_journal():
+    """Tests persistence and recovery of launched jobs with the journal backend."""
+    with _app() as app:
+        staging_directory = app.staging_directory
+        queue1 = StatefulManagerProxy(QueueManager('test', app, num_concurrent_jobs=0), active_jobs_backend="journal")
+        job_id = queue1.setup_job(TEST_JOB_ID, 'tool1', '1.0.0')
+        touch_file = join(staging_directory, TEST_COMMAND_TOUCH_FILE)
+        queue1.preprocess_and_launch(job_id, {"command_line": 'touch %s' % touch_file})
+        time.sleep(.4)
+        assert not exists(touch_file)
+        queue1.shutdown()
+        _setup_manager_that_executes(app, active_jobs_backend="journal")
+        assert exists(touch_file)
+
+
+def test_launched_job_recovery_consolidated_metadata():
+    """Tests jobs launched with per-key metadata files recover with the consolidated backend."""
+    with _app() as app:
+        staging_directory = app.staging_directory
+        queue1 = StatefulManagerProxy(QueueManager('test', app, num_concurrent_jobs=0))
+        job_id = queue1.setup_job(TEST_JOB_ID, 'tool1', '1.0.0')
+        touch_file = join(staging_directory, TEST_COMMAND_TOUCH_FILE)
+        queue1.preprocess_and_launch(job_id, {"command_line": 'touch %s' % touch_file})
+        time.sleep(.4)
+        queue1.shutdown()
+        queue2 = StatefulManagerProxy(QueueManager('test', app, num_concurrent_jobs=1, metadata_backend="consolidated"))
+        try:
+            queue2.recover_active_jobs()
+            time.sleep(1)
+            assert exists(touch_file)
+            job_directory = queue2.job_directory(job_id)
+            assert job_directory.contains_file("job_metadata.json")
+            assert job_directory.load_metadata("preprocessed")
+            assert job_directory.load_metadata("tool_id") == "tool1"
+        finally:
+            queue2.shutdown()
+
+
+def test_journal_replay_and_compaction():
+    with _app() as app:
+        active_jobs = JournaledActiveJobs("test", app.persistence_directory, compact_threshold=2)
+        active_jobs.activate_job("1")
+        active_jobs.activate_job("2")
+        active_jobs.activate_job("3", active_status=ACTIVE_STATUS_PREPROCESSING)
+        active_jobs.deactivate_job("1")
+        active_jobs.close()
+
+        active_jobs = JournaledActiveJobs("test", app.persistence_directory)
+        assert active_jobs.active_job_ids() == ["2"]
+        assert active_jobs.active_job_ids(active_status=ACTIVE_STATUS_PREPROCESSING) == ["3"]
+        # Reloading compacts the journal down to the active jobs.
+        with open(active_jobs.journal_path) as f:
+            assert len(f.readlines()) == 2
+        active_jobs.close()
+
+
+def test_journal_skips_truncated_records():
+    with _app() as app:
+        active_jobs = JournaledActiveJobs("test", app.persistence_directory)
+        active_jobs.activate_job("1")
+        active_jobs.close()
+        with open(active_jobs.journal_path, "a") as f:
+            f.write('{"op": "activ')
+        active_jobs = JournaledActiveJobs("test", app.persistence_directory)
+        assert active_jobs.active_job_ids() == ["1"]
+        active_jobs.close()
+
+
+def test_journal_imports_active_job_directories():
+    with _app() as app:
+        launched_directory = join(app.persistence_directory, "test-active-jobs")
+        preprocessing_directory = join(app.persistence_directory, "test-preprocessing-jobs")
+        makedirs(launched_directory)
+        makedirs(preprocessing_directory)
+        open(join(launched_directory, "1"), "w").close()
+        open(join(preprocessing_directory, "2"), "w").close()
+
+        active_jobs = JournaledActiveJobs("test", app.persistence_directory)
+        assert active_jobs.active_job_ids() == ["1"]
+        assert active_jobs.active_job_ids(active_status=ACTIVE_STATUS_PREPROCESSING) == ["2"]
+        active_jobs.close()
+        assert listdir(launched_directory) == []
+        assert listdir(preprocessing_directory) == []
+
+
+def test_launched_job_recovery_job_state_database():
+    """Tests job states are recorded and launched jobs recovered from the job state database."""
+    with _app() as app:
+        staging_directory = app.staging_directory
+        manager_options = {"job_state_database": True, "active_jobs_backend": "database"}
+        queue1 = StatefulManagerProxy(QueueManager('test', app, num_concurrent_jobs=0, **manager_options), **manager_options)
+        job_id = queue1.setup_job(TEST_JOB_ID, 'tool1', '1.0.0')
+        touch_file = join(staging_directory, TEST_COMMAND_TOUCH_FILE)
+        queue1.preprocess_and_launch(job_id, {"command_line": 'touch %s' % touch_file})
+        assert queue1.get_status(job_id) == status.QUEUED
+        time.sleep(.4)
+        queue1.shutdown()
+
+        queue2 = StatefulManagerProxy(QueueManager('test', app, num_concurrent_jobs=1, **manager_options), **manager_options)
+        try:
+            assert queue2.active_jobs.active_job_ids() == [job_id]
+            queue2.recover_active_jobs()
+            time.sleep(1)
+            assert exists(touch_file)
+            assert queue2.get_status(job_id) == status.POSTPROCESSING
+            assert queue2.job_state_db.job_ids(status.POSTPROCESSING) == [job_id]
+            assert queue2.job_state_db.status_counts() == {status.POSTPROCESSING: 1}
+            job = queue2.job_state_db.job(job_id)
+            assert job["return_code"] == 0
+            assert [s for (s, _) in queue2.job_state_db.transitions(job_id)] == [status.QUEUED, status.POSTPROCESSING]
+            assert queue2.active_jobs.active_job_ids() == []
+            queue2.clean(job_id)
+            assert queue2.job_state_db.job(job_id) is None
+            assert queue2.job_state_db.transitions(job_id) == []
+        finally:
+            queue2.shutdown()
+
+
+def test_job_state_database():
+    with _app() as app:
+        assert JobStateDatabase.from_manager_options("test", app.persistence_directory) is None
+        db = JobStateDatabase.from_manager_options("test", app.persistence_directory, job_state_database="true")
+        db.record_status("1", status.QUEUED)
+        db.record_status("1", status.QUEUED)
+        db.record_status("1", status.RUNNING)
+        db.record_status("2", status.RUNNING)
+        db.record_external_id("1", "ext1")
+        db.record_return_code("1", 3)
+        assert len(db.transitions("1")) == 2
+        assert db.job_ids(status.RUNNING) == ["1", "2"]
+        assert db.job_ids(status.RUNNING, updated_before=0) == []
+        assert db.job("1")["external_id"] == "ext1"
+        assert db.job("1")["return_code"] == 3
+        assert db.job("3") is None
+
+        # An external id registered before the first status is kept.
+        db.record_external_id("4", "ext4")
+        db.record_status("4", status.QUEUED)
+        assert db.job("4")["external_id"] == "ext4"
+        assert [s for (s, _) in db.transitions("4")] == [status.QUEUED]
+        db.delete_job("4")
+        assert db.job("4") is None
+        assert db.status("4") is None
+        db.close()
+
+        db = JobStateDatabase(db.path)
+        assert db.status("2") == status.RUNNING
+        assert db.status_counts() == {status.RUNNING: 2}
+        db.close()
+
+
 def _setup_manager_that_preprocesses(app):
     # Setup a manager that will preprocess the job but won't execute it.
 
@@ -106,8 +264,8 @@ def _setup_job_with_unexecuted_preprocessing_directive(app):
     queue1.shutdown()
 
 
-def _setup_manager_that_executes(app):
-    queue2 = StatefulManagerProxy(QueueManager('test', app, num_concurrent_jobs=1))
+def _setup_manager_that_executes(app, **manager_options):
+    queue2 = StatefulManagerProxy(QueueManager('test', app, num_concurrent_jobs=1), **manager_options)
     try:
         queue2.recover_active_jobs()
         time.sleep(1)
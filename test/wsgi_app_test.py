@@ -75,3 +75,30 @@ def test_standard_requests():
         healthz_response = app.get("/healthz")
         healthz_data = json.loads(healthz_response.body.decode("utf-8"))
         assert healthz_data["version"] == pulsar_version
+
+
+def test_file_download_ranges():
+    from .test_utils import test_pulsar_app
+
+    with test_pulsar_app() as app:
+        setup_config = json.loads(app.post("/jobs?job_id=12346").body.decode("utf-8"))
+        with open(os.path.join(setup_config["outputs_directory"], "test_output"), "w") as f:
+            f.write("Hello World!")
+        url = "/jobs/12346/files?name=test_output&type=output"
+
+        head_response = app.head(url)
+        assert head_response.headers["Content-Length"] == "12"
+        assert head_response.headers["Accept-Ranges"] == "bytes"
+
+        range_response = app.get(url, headers={"Range": "bytes=6-"}, status=206)
+        assert range_response.body == b"World!"
+        assert range_response.headers["Content-Range"] == "bytes 6-11/12"
+
+        etag = range_response.headers["ETag"]
+        app.get(url, headers={"If-None-Match": etag}, status=304)
+        # A stale If-Range validator gets the whole file.
+        stale_response = app.get(url, headers={"Range": "bytes=6-", "If-Range": '"stale"'}, status=200)
+        assert stale_response.body == b"Hello World!"
+
+        wrapped_response = app.get(url, extra_environ={"wsgi.file_wrapper": lambda f, block_size: iter([f.read()])})
+        assert wrapped_response.body == b"Hello World!"
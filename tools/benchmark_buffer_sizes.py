@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# Measure file copy throughput of pulsar.client.util.copy_stream (used by
+# copy_to_path and the client transports) for a range of block sizes, to help
+# choose PULSAR_BUFFER_SIZE.
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_DIRECTORY = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, PROJECT_DIRECTORY)
+
+from pulsar.client.util import copy_stream  # noqa: E402
+
+DEFAULT_BLOCK_SIZES = "4K,64K,256K,1M,4M,16M"
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(size):
+    size = size.strip().upper()
+    if size[-1] in UNITS:
+        return int(size[:-1]) * UNITS[size[-1]]
+    return int(size)
+
+
+def benchmark(path, block_size, repeat):
+    best = None
+    for _ in range(repeat):
+        with open(path, "rb") as input, open(os.devnull, "wb") as output:
+            start = time.perf_counter()
+            copy_stream(input, output, block_size)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure copy_stream throughput per block size.")
+    parser.add_argument("--size", default="512M", help="size of the test file (default 512M)")
+    parser.add_argument("--block-sizes", default=DEFAULT_BLOCK_SIZES, help="comma separated block sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="copies per block size, the fastest is reported")
+    args = parser.parse_args(argv)
+
+    size = parse_size(args.size)
+    with tempfile.NamedTemporaryFile() as f:
+        chunk = os.urandom(1024 * 1024)
+        written = 0
+        while written < size:
+            written += f.write(chunk[:size - written])
+        f.flush()
+        print("%12s %12s" % ("block size", "MiB/s"))
+        for block_size in args.block_sizes.split(","):
+            elapsed = benchmark(f.name, parse_size(block_size), args.repeat)
+            print("%12s %12.1f" % (block_size, size / elapsed / UNITS["M"]))
+
+
+if __name__ == "__main__":
+    main()